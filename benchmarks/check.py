@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""Regression checks for the worker, the extraction scripts and the Lua caches.
+
+    check.py [--project DIR] [--check worker] ...
+
+Every check runs against a copy of the project (default: the example project
+of this repository), so files can be edited without touching the original.
+Checks of the Lua side run the files in checks/ with `nvim --headless -l`
+and are skipped when Neovim is not installed. A failed check is reported and
+the run exits with 1.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(benchmarks_dir)
+scripts_dir = os.path.join(root_dir, "scripts")
+checks_dir = os.path.join(benchmarks_dir, "checks")
+sys.path.insert(0, scripts_dir)
+
+from django_utils import find_settings_module  # noqa: E402
+
+# Seconds to wait for the worker to answer or exit
+WORKER_TIMEOUT = 60
+
+# The format group or converter DRF's format_suffix_patterns() adds to a twin route
+FORMAT_GROUP = re.compile(r"\(\?P<format>|<\w+:format>")
+
+# Settings and URLconf written into the project copy: the project's own URLs plus one
+# route per kind of format-suffix twin
+FORMAT_SUFFIX_SETTINGS = """from {settings} import *  # noqa: F403
+
+ROOT_URLCONF = "check_format_suffix_urls"
+"""
+FORMAT_SUFFIX_URLCONF = """from django.urls import include, path, re_path
+from rest_framework.urlpatterns import format_suffix_patterns
+from rest_framework.views import APIView
+
+from {settings} import ROOT_URLCONF
+
+
+class FormatView(APIView):
+    def get(self, request, format=None):
+        pass
+
+
+urlpatterns = [path("", include(ROOT_URLCONF))]
+# "\\.(?P<format>[a-z0-9]+)/?$" and "<drf_format_suffix:format>"
+urlpatterns += format_suffix_patterns(
+    [
+        re_path(r"^check/regex/$", FormatView.as_view()),
+        path("check/path/", FormatView.as_view()),
+    ]
+)
+# "\\.(?P<format>(json|html))/?$" and "<drf_format_suffix_json_html:format>"
+urlpatterns += format_suffix_patterns(
+    [
+        re_path(r"^check/allowed-regex/$", FormatView.as_view()),
+        path("check/allowed-path/", FormatView.as_view()),
+    ],
+    allowed=["json", "html"],
+)
+"""
+
+
+class CheckFailed(Exception):
+    pass
+
+
+class CheckSkipped(Exception):
+    pass
+
+
+def expect(condition, message):
+    if not condition:
+        raise CheckFailed(message)
+
+
+def copy_project(source, destination):
+    ignore = shutil.ignore_patterns(".git", "__pycache__", ".venv", "venv", "node_modules")
+    shutil.copytree(source, destination, ignore=ignore)
+    return destination
+
+
+def touch(path):
+    """Move a file's mtime one second ahead, as an editor saving it would."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def read_data(path):
+    with open(path) as f:
+        return json.load(f)["data"]
+
+
+def first_project_file(entries, project):
+    """Return the first "file" of script output entries that lies in the project."""
+    root = os.path.join(os.path.realpath(project), "")
+    for entry in entries:
+        path = entry.get("file")
+        if path and os.path.realpath(path).startswith(root):
+            return path
+    raise CheckFailed("no entry with a file in the project")
+
+
+def get_settings_module(project):
+    with contextlib.chdir(project):
+        return os.environ.get("DJANGO_SETTINGS_MODULE") or find_settings_module()
+
+
+def run_script(args, project, script, *script_args, env=None):
+    """Run an extraction script in a fresh process; return its stdout."""
+    result = subprocess.run(
+        [args.python, os.path.join(scripts_dir, script), *script_args],
+        cwd=project,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    expect(result.returncode == 0, f"{script} exited with {result.returncode}:\n{result.stderr}")
+    return result.stdout
+
+
+def run_lua(args, project, work_dir, check_file, *check_args):
+    """Run a Lua check with this repository on the runtimepath and its own cache dir."""
+    nvim = shutil.which(args.nvim)
+    if not nvim:
+        raise CheckSkipped(f"{args.nvim} not found")
+
+    env = dict(os.environ, XDG_CACHE_HOME=os.path.join(work_dir, "cache"))
+    command = [nvim, "--headless", "--clean", "-l", os.path.join(checks_dir, check_file)]
+    result = subprocess.run(
+        command + [root_dir, project, *check_args],
+        cwd=project,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    output = (result.stderr + result.stdout).strip()
+    expect(result.returncode == 0, f"{check_file} exited with {result.returncode}: {output}")
+
+
+class Worker:
+    """scripts/worker.py driven over its stdin/stdout protocol."""
+
+    def __init__(self, python, project):
+        self.process = subprocess.Popen(
+            [python, os.path.join(scripts_dir, "worker.py")],
+            cwd=project,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        self.last_id = 0
+
+    def run(self, script, output, args=()):
+        self.last_id += 1
+        request = {"id": self.last_id, "script": script, "args": list(args), "output": output}
+        self.process.stdin.write(json.dumps(request) + "\n")
+        self.process.stdin.flush()
+
+        line = self.process.stdout.readline()
+        expect(line, f"worker exited without answering {script}")
+        return json.loads(line)
+
+    def has_exited(self):
+        try:
+            self.process.wait(timeout=WORKER_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            return False
+        return True
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            if not self.has_exited():
+                self.process.kill()
+
+
+def check_worker(args, project, work_dir):
+    """An edited view module is reloaded in place; an edited models module restarts the worker."""
+    output = os.path.join(work_dir, "worker.out")
+    worker = Worker(args.python, project)
+    try:
+        response = worker.run("get_models.py", output)
+        expect(response.get("code") == 0, f"get_models.py failed: {response}")
+        models_file = first_project_file(read_data(output), project)
+
+        response = worker.run("get_views.py", output)
+        expect(response.get("code") == 0, f"get_views.py failed: {response}")
+        views_file = first_project_file(read_data(output), project)
+
+        touch(views_file)
+        response = worker.run("get_views.py", output)
+        expect(
+            response.get("code") == 0 and not response.get("restart"),
+            f"edited {os.path.basename(views_file)} was not reloaded in place: {response}",
+        )
+
+        touch(models_file)
+        response = worker.run("get_models.py", output)
+        expect(
+            response.get("restart") is True,
+            f"edited {os.path.basename(models_file)} did not restart the worker: {response}",
+        )
+        expect(worker.has_exited(), "worker kept running after asking for a restart")
+    finally:
+        worker.close()
+
+
+def merge_stream(output):
+    """Rebuild the data of a --stream run from its records (see RecordStream)."""
+    data = None
+    for line in output.splitlines():
+        record = json.loads(line)
+        if "stream" in record:
+            data = record["data"]
+            table = record["items"]
+        elif "item" in record:
+            for name, entries in record.get("append", {}).items():
+                data[name].extend(entries)
+            items = data[table] if table else data
+            if "key" in record:
+                items[record["key"]] = record["item"]
+            else:
+                items.append(record["item"])
+    return data
+
+
+def check_stream(args, project, work_dir):
+    """Merging the NDJSON records of --stream gives the data of a normal run."""
+    full = json.loads(run_script(args, project, "get_completion_data.py"))["data"]
+    streamed = merge_stream(run_script(args, project, "get_completion_data.py", "--stream"))
+
+    expect(streamed is not None, "no stream header record")
+    for name in sorted(set(full) | set(streamed)):
+        expect(
+            full.get(name) == streamed.get(name),
+            f'streamed "{name}" differs from a normal run',
+        )
+
+
+def check_format_suffix(args, project, work_dir):
+    """No ".<format>" twin of a route is left in the views list."""
+    settings = get_settings_module(project)
+    for name, template in [
+        ("check_format_suffix_settings.py", FORMAT_SUFFIX_SETTINGS),
+        ("check_format_suffix_urls.py", FORMAT_SUFFIX_URLCONF),
+    ]:
+        with open(os.path.join(project, name), "w") as f:
+            f.write(template.format(settings=settings))
+
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE="check_format_suffix_settings")
+    endpoints = json.loads(run_script(args, project, "get_views.py", env=env))["data"]
+
+    patterns = {e["pattern"] for e in endpoints}
+    twins = sorted(p for p in patterns if FORMAT_GROUP.search(p))
+    expect(not twins, "format-suffix twins left: " + ", ".join(twins))
+
+    routes = ["^check/regex/$", "check/path/", "^check/allowed-regex/$", "check/allowed-path/"]
+    missing = [route for route in routes if route not in patterns]
+    expect(not missing, "format-suffix fixture routes missing: " + ", ".join(missing))
+
+
+def check_fingerprint(args, project, work_dir):
+    """A fingerprint is kept for files saved before a run started and dropped for later saves."""
+    run_lua(args, project, work_dir, "fingerprint.lua")
+
+
+def check_completion_items(args, project, work_dir):
+    """Completion lists answered from the builder's cache are fresh copies for each request."""
+    data_path = os.path.join(work_dir, "completions.json")
+    with open(data_path, "w") as f:
+        f.write(run_script(args, project, "get_completion_data.py"))
+    run_lua(args, project, work_dir, "completion_items.lua", data_path)
+
+
+CHECKS = {
+    "worker": check_worker,
+    "stream": check_stream,
+    "format_suffix": check_format_suffix,
+    "fingerprint": check_fingerprint,
+    "completion_items": check_completion_items,
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--project", default=root_dir, help="project directory (manage.py) to copy and check"
+    )
+    parser.add_argument(
+        "--check", dest="checks", action="append", choices=list(CHECKS), help="default: all"
+    )
+    parser.add_argument("--python", default=sys.executable, help="interpreter with Django")
+    parser.add_argument("--nvim", default="nvim", help="Neovim for the Lua checks")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    failed = []
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        project = copy_project(args.project, os.path.join(work_dir, "project"))
+
+        for name in args.checks or CHECKS:
+            try:
+                CHECKS[name](args, project, work_dir)
+            except CheckFailed as e:
+                print(f"FAIL {name}: {e}")
+                failed.append(name)
+            except CheckSkipped as e:
+                print(f"skip {name}: {e}")
+            else:
+                print(f"ok   {name}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
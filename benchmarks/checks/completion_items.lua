@@ -0,0 +1,32 @@
+-- Run by benchmarks/check.py: nvim --headless --clean -l completion_items.lua ROOT PROJECT DATA
+-- Fields blink.cmp writes onto the items of one request must not show up in the next one,
+-- which is answered from the builder's cache.
+local root, data_path = arg[1], arg[3]
+vim.opt.rtp:prepend(root)
+
+local ModelData = require("django.completions.core.model_data")
+local completion_builder = require("django.completions.core.completion_builder")
+
+local decoded = vim.json.decode(table.concat(vim.fn.readfile(data_path), "\n"))
+local data = require("django.fetcher.cache").unwrap(decoded)
+ModelData.set_instance(data)
+
+local model_key = vim.tbl_keys(data.models)[1]
+assert(model_key, "no models in the completion data")
+
+local first = completion_builder.build(model_key, "filter", "")
+assert(#first > 0, "no completion items for " .. model_key)
+for _, item in ipairs(first) do
+	item.score_offset = (item.score_offset or 0) + 10
+	item.source_id = "django"
+	item.cursor_column = 1
+end
+
+local second = completion_builder.build(model_key, "filter", "")
+assert(completion_builder.__cache.count == 1, "second request was not answered from the cache")
+assert(#second == #first, "cached list has a different length")
+for i, item in ipairs(second) do
+	assert(item ~= first[i], "the same item table was returned twice")
+	local leaked = item.score_offset or item.source_id or item.cursor_column
+	assert(leaked == nil, "fields of a previous request leaked into the cached item " .. item.label)
+end
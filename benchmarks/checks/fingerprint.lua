@@ -0,0 +1,36 @@
+-- Run by benchmarks/check.py: nvim --headless --clean -l fingerprint.lua ROOT PROJECT
+-- A source saved before a run started keeps the fingerprint, even within the same second;
+-- one saved after the start discards it.
+local root, project = arg[1], arg[2]
+vim.opt.rtp:prepend(root)
+
+local cache = require("django.fetcher.cache")
+local config = require("django.config")
+local fingerprint = require("django.fetcher.fingerprint")
+
+local CACHE_NAME = "check_fingerprint"
+local source = project .. "/manage.py"
+
+config.setup({ fingerprint = { enabled = true } })
+
+local function save(path)
+	local lines = vim.fn.readfile(path)
+	vim.fn.writefile(lines, path)
+end
+
+cache.write_temp(CACHE_NAME, { data = {}, meta = {} })
+cache.commit(CACHE_NAME)
+
+-- Saved, then a run starts right away
+save(source)
+local started_at = fingerprint.now()
+fingerprint.write(CACHE_NAME, { source }, started_at)
+assert(fingerprint.read(CACHE_NAME), "fingerprint discarded for a file saved before the run started")
+assert(fingerprint.is_fresh(CACHE_NAME), "cache not fresh right after its run")
+
+-- Saved while the run is going (past the file system's timestamp granularity)
+started_at = fingerprint.now()
+vim.uv.sleep(50)
+save(source)
+fingerprint.write(CACHE_NAME, { source }, started_at)
+assert(not fingerprint.read(CACHE_NAME), "fingerprint kept for a file saved after the run started")
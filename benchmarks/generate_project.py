@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""Generate a synthetic Django project for benchmarking the extraction scripts.
+
+    generate_project.py OUTPUT [--preset large] [--apps N] [--models M] [--fields K] ...
+
+The project has N apps with M models of K fields each. Models have foreign
+keys and many-to-many fields into earlier models (across apps), Choices
+fields, and an abstract base. Each app's URLconf is reached through a chain
+of nested include()s and serves function views, class-based views and,
+unless --no-drf is given, Django REST framework viewsets with @action
+methods registered on a router. The same options and seed always produce the same files.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+
+PRESETS = {
+    "small": {"apps": 5, "models": 10, "fields": 10},
+    "medium": {"apps": 20, "models": 25, "fields": 15},
+    "large": {"apps": 50, "models": 40, "fields": 20},
+}
+
+DEFAULTS = {
+    "choices": 3,
+    "relations": 3,
+    "url_depth": 3,
+    "views": 5,
+    "actions": 4,
+    "seed": 0,
+}
+
+PACKAGE = "benchproject"
+
+# Marks a directory this script may replace
+MARKER = ".generated-project"
+
+# Plain field declarations cycled through for the K fields of a model
+FIELD_TEMPLATES = [
+    "models.CharField(max_length={length})",
+    "models.IntegerField(default=0)",
+    "models.TextField(blank=True)",
+    "models.DateTimeField(auto_now_add=True)",
+    "models.BooleanField(default=False)",
+    "models.DecimalField(max_digits=10, decimal_places=2)",
+    "models.EmailField()",
+    "models.SlugField(unique=True)",
+    "models.PositiveIntegerField(null=True, blank=True)",
+    "models.JSONField(default=dict)",
+    "models.UUIDField(null=True)",
+    "models.DateField(null=True, blank=True)",
+    "models.FloatField(default=0.0)",
+    "models.URLField(blank=True)",
+]
+
+
+def app_name(index):
+    return f"app_{index:03d}"
+
+
+def model_name(app_index, model_index):
+    return f"Model{app_index:03d}x{model_index:03d}"
+
+
+def write_file(root, path, content):
+    full_path = os.path.join(root, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "w") as f:
+        f.write(content)
+
+
+def render_models(options, rng, app_index):
+    """Return models.py of an app: an abstract base, Choices classes and M models."""
+    lines = [
+        "from django.db import models",
+        "",
+        "",
+        "class TimeStamped(models.Model):",
+        "    created_at = models.DateTimeField(auto_now_add=True)",
+        "    updated_at = models.DateTimeField(auto_now=True)",
+        "",
+        "    class Meta:",
+        "        abstract = True",
+        "",
+    ]
+
+    for model_index in range(options.models):
+        name = model_name(app_index, model_index)
+        lines += ["", f"class {name}(TimeStamped):"]
+
+        for choice_index in range(options.choices):
+            values = rng.randint(3, 8)
+            lines.append(f"    class Status{choice_index}(models.TextChoices):")
+            for value in range(values):
+                lines.append(f'        VALUE_{value} = "v{value}", "Value {value}"')
+            lines.append("")
+
+        for field_index in range(options.fields):
+            template = FIELD_TEMPLATES[(model_index + field_index) % len(FIELD_TEMPLATES)]
+            field = template.format(length=rng.choice([20, 50, 100, 255]))
+            lines.append(f"    field_{field_index} = {field}")
+
+        for choice_index in range(options.choices):
+            lines.append(
+                f"    status_{choice_index} = models.CharField("
+                f"max_length=10, choices=Status{choice_index}.choices, "
+                f"default=Status{choice_index}.VALUE_0)"
+            )
+
+        # Relations point at earlier models, so the graph is deep but acyclic
+        targets = [
+            (a, m)
+            for a in range(app_index + 1)
+            for m in range(options.models if a < app_index else model_index)
+        ]
+        for relation_index in range(min(options.relations, len(targets))):
+            target_app, target_model = rng.choice(targets)
+            target = f'"{app_name(target_app)}.{model_name(target_app, target_model)}"'
+            related_name = f"{name.lower()}_rel{relation_index}"
+            if relation_index % 3 == 2:
+                lines.append(
+                    f"    links_{relation_index} = models.ManyToManyField("
+                    f'{target}, related_name="{related_name}", blank=True)'
+                )
+            else:
+                lines.append(
+                    f"    parent_{relation_index} = models.ForeignKey("
+                    f"{target}, on_delete=models.CASCADE, "
+                    f'related_name="{related_name}", null=True)'
+                )
+
+        lines += [
+            "",
+            "    def __str__(self):",
+            "        return str(self.pk)",
+            "",
+        ]
+
+    return "\n".join(lines)
+
+
+def render_views(options, app_index):
+    lines = [
+        "from django.http import HttpResponse",
+        "from django.views import View",
+        "from django.views.generic import DetailView, ListView",
+        "",
+        f"from .models import {model_name(app_index, 0)}",
+        "",
+    ]
+
+    for view_index in range(options.views):
+        lines += [
+            "",
+            f"def function_view_{view_index}(request):",
+            '    return HttpResponse("ok")',
+            "",
+            "",
+            f"class ClassView{view_index}(View):",
+            "    def get(self, request):",
+            '        return HttpResponse("ok")',
+            "",
+            "    def post(self, request):",
+            '        return HttpResponse("ok")',
+            "",
+        ]
+
+    lines += [
+        "",
+        "class ItemListView(ListView):",
+        f"    model = {model_name(app_index, 0)}",
+        "",
+        "",
+        "class ItemDetailView(DetailView):",
+        f"    model = {model_name(app_index, 0)}",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def render_viewsets(options, app_index):
+    lines = [
+        "from rest_framework import serializers, viewsets",
+        "from rest_framework.decorators import action",
+        "from rest_framework.response import Response",
+        "",
+        "from . import models",
+        "",
+    ]
+
+    for model_index in range(options.models):
+        name = model_name(app_index, model_index)
+        lines += [
+            "",
+            f"class {name}Serializer(serializers.ModelSerializer):",
+            "    class Meta:",
+            f"        model = models.{name}",
+            '        fields = "__all__"',
+            "",
+            "",
+            f"class {name}ViewSet(viewsets.ModelViewSet):",
+            f"    queryset = models.{name}.objects.all()",
+            f"    serializer_class = {name}Serializer",
+        ]
+        for action_index in range(options.actions):
+            detail = "True" if action_index % 2 else "False"
+            methods = '["post"]' if action_index % 3 == 2 else '["get"]'
+            lines += [
+                "",
+                f"    @action(detail={detail}, methods={methods})",
+                f"    def action_{action_index}(self, request, pk=None):",
+                "        return Response({})",
+            ]
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def render_app_urls(options, app_index, drf):
+    lines = [
+        "from django.urls import include, path",
+        "",
+        "from . import views",
+    ]
+    if drf:
+        lines += [
+            "from rest_framework.routers import DefaultRouter",
+            "",
+            "from . import viewsets",
+            "",
+            "router = DefaultRouter()",
+        ]
+        for model_index in range(options.models):
+            name = model_name(app_index, model_index)
+            lines.append(f'router.register("{name.lower()}", viewsets.{name}ViewSet)')
+
+    lines += ["", "view_patterns = ["]
+    for view_index in range(options.views):
+        lines += [
+            f'    path("function/{view_index}/", views.function_view_{view_index}, '
+            f'name="function-{view_index}"),',
+            f'    path("class/{view_index}/<int:pk>/", views.ClassView{view_index}.as_view(), '
+            f'name="class-{view_index}"),',
+        ]
+    lines += [
+        '    path("items/", views.ItemListView.as_view(), name="item-list"),',
+        '    path("items/<int:pk>/", views.ItemDetailView.as_view(), name="item-detail"),',
+        "]",
+    ]
+    if drf:
+        lines.append('view_patterns.append(path("api/", include(router.urls)))')
+
+    # Nest the patterns under url_depth levels of include()
+    lines += ["", "urlpatterns = view_patterns"]
+    for level in range(options.url_depth):
+        lines.append(
+            f'urlpatterns = [path("level{level}/", '
+            f'include((urlpatterns, "{app_name(app_index)}_level{level}")))]'
+        )
+    lines.append("")
+
+    return "\n".join(lines)
+
+
+def render_settings(options, drf):
+    apps = [f'    "{PACKAGE}.{app_name(index)}",' for index in range(options.apps)]
+    third_party = ['    "rest_framework",'] if drf else []
+    return "\n".join(
+        [
+            "from pathlib import Path",
+            "",
+            "BASE_DIR = Path(__file__).resolve().parent.parent",
+            "",
+            'SECRET_KEY = "benchmark"',
+            "DEBUG = True",
+            "ALLOWED_HOSTS = []",
+            "",
+            "INSTALLED_APPS = [",
+            '    "django.contrib.admin",',
+            '    "django.contrib.auth",',
+            '    "django.contrib.contenttypes",',
+            '    "django.contrib.sessions",',
+            '    "django.contrib.messages",',
+            '    "django.contrib.staticfiles",',
+            *third_party,
+            *apps,
+            "]",
+            "",
+            "MIDDLEWARE = [",
+            '    "django.contrib.sessions.middleware.SessionMiddleware",',
+            '    "django.contrib.auth.middleware.AuthenticationMiddleware",',
+            '    "django.contrib.messages.middleware.MessageMiddleware",',
+            "]",
+            f'ROOT_URLCONF = "{PACKAGE}.urls"',
+            "TEMPLATES = [",
+            "    {",
+            '        "BACKEND": "django.template.backends.django.DjangoTemplates",',
+            '        "APP_DIRS": True,',
+            '        "OPTIONS": {',
+            '            "context_processors": [',
+            '                "django.template.context_processors.request",',
+            '                "django.contrib.auth.context_processors.auth",',
+            '                "django.contrib.messages.context_processors.messages",',
+            "            ]",
+            "        },",
+            "    }",
+            "]",
+            "DATABASES = {",
+            '    "default": {',
+            '        "ENGINE": "django.db.backends.sqlite3",',
+            '        "NAME": BASE_DIR / "db.sqlite3",',
+            "    }",
+            "}",
+            'DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"',
+            "USE_TZ = True",
+            "",
+        ]
+    )
+
+
+def render_root_urls(options):
+    lines = [
+        "from django.contrib import admin",
+        "from django.urls import include, path",
+        "",
+        "urlpatterns = [",
+        '    path("admin/", admin.site.urls),',
+    ]
+    for index in range(options.apps):
+        name = app_name(index)
+        lines.append(f'    path("{name}/", include("{PACKAGE}.{name}.urls")),')
+    lines += ["]", ""]
+    return "\n".join(lines)
+
+
+MANAGE_PY = f"""#!/usr/bin/env python
+import os
+import sys
+
+if __name__ == "__main__":
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "{PACKAGE}.settings")
+    from django.core.management import execute_from_command_line
+
+    execute_from_command_line(sys.argv)
+"""
+
+
+def generate(output, options):
+    """Write the project to `output`, replacing a previously generated one."""
+    rng = random.Random(options.seed)
+    drf = options.drf
+
+    if os.path.exists(os.path.join(output, MARKER)):
+        shutil.rmtree(output)
+
+    write_file(output, MARKER, "")
+    write_file(output, "manage.py", MANAGE_PY)
+    write_file(output, f"{PACKAGE}/__init__.py", "")
+    write_file(output, f"{PACKAGE}/settings.py", render_settings(options, drf))
+    write_file(output, f"{PACKAGE}/urls.py", render_root_urls(options))
+
+    for index in range(options.apps):
+        name = app_name(index)
+        package = f"{PACKAGE}/{name}"
+        class_name = "".join(part.title() for part in name.split("_")) + "Config"
+        write_file(output, f"{package}/__init__.py", "")
+        write_file(
+            output,
+            f"{package}/apps.py",
+            "from django.apps import AppConfig\n\n\n"
+            f"class {class_name}(AppConfig):\n"
+            f'    name = "{PACKAGE}.{name}"\n'
+            f'    label = "{name}"\n',
+        )
+        write_file(output, f"{package}/models.py", render_models(options, rng, index))
+        write_file(output, f"{package}/views.py", render_views(options, index))
+        if drf:
+            write_file(output, f"{package}/viewsets.py", render_viewsets(options, index))
+        write_file(output, f"{package}/urls.py", render_app_urls(options, index, drf))
+
+    return output
+
+
+def add_arguments(parser):
+    """Add the project shape options (shared with run.py)."""
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--apps", type=int, help="number of apps")
+    parser.add_argument("--models", type=int, help="models per app")
+    parser.add_argument("--fields", type=int, help="plain fields per model")
+    parser.add_argument(
+        "--choices", type=int, default=DEFAULTS["choices"], help="Choices fields per model"
+    )
+    parser.add_argument(
+        "--relations",
+        type=int,
+        default=DEFAULTS["relations"],
+        help="ForeignKey/ManyToMany fields per model",
+    )
+    parser.add_argument(
+        "--url-depth",
+        type=int,
+        default=DEFAULTS["url_depth"],
+        help="nested include() levels above each app's views",
+    )
+    parser.add_argument(
+        "--views", type=int, default=DEFAULTS["views"], help="function and class views per app"
+    )
+    parser.add_argument(
+        "--actions", type=int, default=DEFAULTS["actions"], help="@action methods per viewset"
+    )
+    parser.add_argument(
+        "--no-drf",
+        dest="drf",
+        action="store_false",
+        help="skip Django REST framework viewsets (needed when it is not installed)",
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULTS["seed"])
+
+
+def resolve_options(options):
+    """Fill the sizes not given on the command line from the preset."""
+    for key, value in PRESETS[options.preset].items():
+        if getattr(options, key) is None:
+            setattr(options, key, value)
+    return options
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("output", help="directory to write the project to")
+    add_arguments(parser)
+    options = resolve_options(parser.parse_args())
+
+    if os.path.isdir(options.output) and os.listdir(options.output):
+        if not os.path.exists(os.path.join(options.output, MARKER)):
+            print(f"{options.output} is not empty and not a generated project", file=sys.stderr)
+            sys.exit(1)
+
+    generate(options.output, options)
+    print(
+        f"Generated {options.apps} apps x {options.models} models x "
+        f"{options.fields} fields in {options.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
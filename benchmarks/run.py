@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Benchmark the extraction scripts against a generated (or existing) Django project.
+
+    run.py --preset medium --repeat 5 --json results.json
+    run.py --preset medium --compare results.json
+
+Each script runs in a fresh process, like a refresh without the worker. For
+every script the median wall time, the peak RSS, the output size and the
+median time of each phase the script reports (see PhaseTimer in
+scripts/django_utils.py) are printed. With --compare, the run fails when the
+wall time or peak RSS of a script grew by more than --threshold percent.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+scripts_dir = os.path.join(os.path.dirname(benchmarks_dir), "scripts")
+sys.path.insert(0, benchmarks_dir)
+
+from generate_project import add_arguments, generate, resolve_options  # noqa: E402
+
+SCRIPTS = ["get_models.py", "get_views.py", "get_completion_data.py", "get_all_data.py"]
+
+# get_all_data.py writes one file per flag instead of printing
+COMBINED_FLAGS = ["--views", "--models", "--completions"]
+
+
+def run_once(python, script, project, work_dir):
+    """Run a script once; return (wall ms, peak RSS KiB or None, output bytes, phases)."""
+    output_path = os.path.join(work_dir, "stdout")
+    args = [python, os.path.join(scripts_dir, script)]
+    outputs = [output_path]
+    # Timings are read from the output written last, which covers every phase
+    timings_path = output_path
+
+    if script == "get_all_data.py":
+        for flag in COMBINED_FLAGS:
+            path = os.path.join(work_dir, flag.lstrip("-") + ".json")
+            args += [flag, path]
+            outputs.append(path)
+        timings_path = os.path.join(work_dir, "views.json")
+
+    stderr_path = os.path.join(work_dir, "stderr")
+    with open(output_path, "w") as stdout, open(stderr_path, "w") as stderr:
+        started = time.perf_counter()
+        process = subprocess.Popen(args, cwd=project, stdout=stdout, stderr=stderr)
+
+        peak_rss_kb = None
+        if hasattr(os, "wait4"):
+            # Resource usage of this child only (RUSAGE_CHILDREN would mix runs)
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            peak_rss_kb = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+        else:
+            process.wait()
+
+        wall_ms = (time.perf_counter() - started) * 1000
+
+    if process.returncode != 0:
+        with open(stderr_path) as f:
+            raise RuntimeError(f"{script} exited with {process.returncode}:\n{f.read()}")
+
+    output_bytes = sum(os.path.getsize(path) for path in outputs if os.path.exists(path))
+    return wall_ms, peak_rss_kb, output_bytes, read_phases(timings_path)
+
+
+def read_phases(path):
+    """Return {phase: ms} from the timings a script adds to its output meta."""
+    try:
+        with open(path) as f:
+            meta = json.load(f).get("meta", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+    timings = meta.get("timings") or {}
+    return {phase["name"]: phase["ms"] for phase in timings.get("phases", [])}
+
+
+def benchmark(python, script, project, repeat):
+    walls, rss, phases = [], [], {}
+    output_bytes = 0
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for _ in range(repeat):
+            wall_ms, peak_rss_kb, output_bytes, run_phases = run_once(
+                python, script, project, work_dir
+            )
+            walls.append(wall_ms)
+            if peak_rss_kb is not None:
+                rss.append(peak_rss_kb)
+            for name, ms in run_phases.items():
+                phases.setdefault(name, []).append(ms)
+
+    return {
+        "wall_ms": round(statistics.median(walls), 1),
+        "peak_rss_kb": max(rss) if rss else None,
+        "output_bytes": output_bytes,
+        "phases": {name: round(statistics.median(values), 1) for name, values in phases.items()},
+    }
+
+
+def format_change(current, previous):
+    if not previous or current is None:
+        return ""
+    return f" ({(current - previous) / previous * 100:+.1f}%)"
+
+
+def print_results(results, baseline=None):
+    baseline = baseline or {}
+    for script, result in results.items():
+        previous = baseline.get(script, {})
+        rss = result["peak_rss_kb"]
+        print(f"{script}")
+        print(
+            f"  wall {result['wall_ms']:.1f} ms"
+            + format_change(result["wall_ms"], previous.get("wall_ms"))
+        )
+        if rss is not None:
+            print(
+                f"  peak RSS {rss / 1024:.1f} MiB"
+                + format_change(rss, previous.get("peak_rss_kb"))
+            )
+        print(
+            f"  output {result['output_bytes'] / 1024:.1f} KiB"
+            + format_change(result["output_bytes"], previous.get("output_bytes"))
+        )
+        if result["phases"]:
+            phases = ", ".join(f"{name} {ms:.1f} ms" for name, ms in result["phases"].items())
+            print(f"  phases: {phases}")
+
+
+def find_regressions(results, baseline, threshold):
+    regressions = []
+    for script, result in results.items():
+        previous = baseline.get(script)
+        if not previous:
+            continue
+        for key in ("wall_ms", "peak_rss_kb"):
+            current, before = result.get(key), previous.get(key)
+            if current and before and (current - before) / before * 100 > threshold:
+                regressions.append(f"{script} {key}: {before} -> {current}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--project", help="existing project directory (manage.py) to run against")
+    parser.add_argument(
+        "--script", dest="scripts", action="append", choices=SCRIPTS, help="default: all"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per script")
+    parser.add_argument("--python", default=sys.executable, help="interpreter with Django")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="results file of an earlier run")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="allowed growth in percent"
+    )
+    add_arguments(parser)
+    return resolve_options(parser.parse_args(argv))
+
+
+def main():
+    args = parse_args()
+    scripts = args.scripts or SCRIPTS
+
+    with tempfile.TemporaryDirectory() as generated:
+        project = args.project
+        if not project:
+            project = generate(os.path.join(generated, "project"), args)
+            print(
+                f"Project: {args.apps} apps x {args.models} models x {args.fields} fields "
+                f"({args.preset} preset)"
+            )
+
+        results = {}
+        for script in scripts:
+            try:
+                results[script] = benchmark(args.python, script, project, args.repeat)
+            except RuntimeError as e:
+                print(e, file=sys.stderr)
+                sys.exit(1)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    print_results(results, baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"options": vars(args), "results": results}, f, indent=2)
+
+    if baseline:
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions over {:.0f}%:".format(args.threshold), file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
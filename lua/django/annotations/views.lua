@@ -128,7 +128,7 @@ function M.__collect_annotations(data, file_path, class_lines)
 		if M.__is_class_view_item(item, file_path, class_lines) then
 			local class_name = item.view_name
 			local class_line = class_lines[class_name]
-			local pattern = M.__normalize_pattern(item.pattern)
+			local pattern = item.normalized or M.__normalize_pattern(item.pattern)
 
 			if pattern then
 				class_patterns[class_name] = class_patterns[class_name] or {}
@@ -19,23 +19,53 @@ function M.system(cmd, opts)
 	return coroutine.yield()
 end
 
+--- Create a cancellation token
+--- `token.cancel()` marks it cancelled and cancels the LSP requests started with it
+--- @return table token { cancelled: boolean, cancel: fun() }
+function M.new_token()
+	local token = { cancelled = false, __cancels = {} }
+
+	function token.cancel()
+		if token.cancelled then
+			return
+		end
+		token.cancelled = true
+		for _, cancel in ipairs(token.__cancels) do
+			pcall(cancel)
+		end
+		token.__cancels = {}
+	end
+
+	return token
+end
+
 --- Execute vim.lsp.buf_request as a coroutine
+--- With a cancelled token no request is sent and an error is returned
 --- @param buf number Buffer number
 --- @param method string LSP method name
 --- @param params table LSP request params
+--- @param token table|nil Cancellation token (see M.new_token)
 --- @return any err, any result
-function M.lsp_request(buf, method, params)
+function M.lsp_request(buf, method, params, token)
 	local co = coroutine.running()
 	if not co then
 		error("M.lsp_request must be called within a coroutine")
 	end
 
-	vim.lsp.buf_request(buf, method, params, function(err, result)
+	if token and token.cancelled then
+		return { message = "cancelled" }, nil
+	end
+
+	local _, cancel = vim.lsp.buf_request(buf, method, params, function(err, result)
 		vim.schedule(function()
 			coroutine.resume(co, err, result)
 		end)
 	end)
 
+	if token and cancel then
+		table.insert(token.__cancels, cancel)
+	end
+
 	return coroutine.yield()
 end
 
@@ -54,6 +84,55 @@ function M.wait(ms)
 	coroutine.yield()
 end
 
+--- Run async functions concurrently and wait for all of them
+--- Each function runs in its own coroutine; at most `limit` are started at a time,
+--- in list order. A function that raises an error yields nil.
+--- Must be called within a coroutine
+--- @param fns function[] Functions to run (may use M.system, M.lsp_request, etc.)
+--- @param limit number|nil Maximum running at once (default: all)
+--- @return table results First return value of each function, by index
+function M.all(fns, limit)
+	local co = coroutine.running()
+	if not co then
+		error("M.all must be called within a coroutine")
+	end
+
+	local results = {}
+	local next_index, finished = 1, 0
+	local waiting = false
+
+	local function start_next()
+		local index = next_index
+		next_index = next_index + 1
+
+		coroutine.resume(coroutine.create(function()
+			local ok, result = pcall(fns[index])
+			results[index] = ok and result or nil
+			finished = finished + 1
+
+			if next_index <= #fns then
+				start_next()
+			elseif finished == #fns and waiting then
+				vim.schedule(function()
+					coroutine.resume(co)
+				end)
+			end
+		end))
+	end
+
+	for _ = 1, math.min(limit or #fns, #fns) do
+		start_next()
+	end
+
+	-- Functions that answered without yielding (e.g., from a cache) may all be done already
+	if finished < #fns then
+		waiting = true
+		coroutine.yield()
+	end
+
+	return results
+end
+
 --- Check if currently running inside a coroutine
 --- @return boolean
 function M.in_coroutine()
@@ -5,6 +5,9 @@ local completion_builder = require("django.completions.core.completion_builder")
 
 local Source = {}
 
+-- Cancellation token of the latest request in each buffer
+local tokens = {}
+
 -- Flag to ensure highlight is set only once
 local highlight_initialized = false
 
@@ -43,28 +46,59 @@ function Source:enabled()
 	return true
 end
 
+-- "__" starts a new path segment, which needs a new list (see get_completions)
+function Source:get_trigger_characters()
+	return { "_" }
+end
+
+--- Returns a cancel function; a newer request in the same buffer cancels this one too,
+--- so outdated requests stop before sending further hovers or building items
 function Source:get_completions(ctx, resolve)
+	local bufnr = ctx.bufnr
+	if tokens[bufnr] then
+		tokens[bufnr].cancel()
+	end
+	local token = async.new_token()
+	tokens[bufnr] = token
+
 	async.run(function()
-		local parsed = context_parser.parse(ctx.bufnr, ctx.cursor[1] - 1, ctx.cursor[2])
+		local parsed = context_parser.parse(bufnr, ctx.cursor[1] - 1, ctx.cursor[2], token)
+		if token.cancelled then
+			return
+		end
 
 		if not parsed then
 			resolve()
 			return
 		end
 
-		local items = completion_builder.build(parsed.model_name, parsed.method, parsed.prefix)
+		local items = completion_builder.build(parsed.model_name, parsed.method, parsed.prefix, parsed.app_label)
 
 		if #items == 0 then
 			resolve()
 			return
 		end
 
+		-- The list has every item of the current "__" segment, so blink.cmp filters it while
+		-- the segment is typed; "_" is a trigger character and asks again at the next boundary.
+		-- Deleting can cross back over a boundary, so backspace still asks again.
 		resolve({
 			items = items,
-			is_incomplete_forward = true,
+			is_incomplete_forward = false,
 			is_incomplete_backward = true,
 		})
 	end)
+
+	return token.cancel
+end
+
+--- Fill in the documentation of the selected item (see completion_builder.resolve_documentation)
+function Source:resolve(item, callback)
+	if item.documentation == nil then
+		item = vim.deepcopy(item)
+		item.documentation = completion_builder.resolve_documentation(item)
+	end
+	callback(item)
 end
 
 return Source
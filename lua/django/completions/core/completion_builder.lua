@@ -11,6 +11,12 @@ M.KIND_NAME = "Django"
 M.KIND_ICON = ""
 M.KIND_HL = "BlinkCmpKindDjango" -- Highlight group (set in init.lua with Django green #44b78b)
 
+-- Related model fields listed in a relation field's documentation
+M.MAX_RELATED_FIELDS = 25
+
+-- Item lists kept by M.build, least recently used are dropped first
+M.CACHE_SIZE = 64
+
 -- =============================================================================
 -- Relation type groups for different QuerySet methods
 -- =============================================================================
@@ -109,25 +115,32 @@ local function split_prefix(prefix)
 end
 
 ---@class ResolveResult
----@field model string|nil Current model name
+---@field model string|nil Current model key
 ---@field label_prefix string Prefix for labels
 ---@field field FieldInfo|nil Terminal field (for lookups)
 ---@field field_name string|nil Terminal field name
----@field field_model string|nil Model containing the terminal field
+---@field field_model string|nil Key of the model containing the terminal field
+
+--- Get the class name of a model key ("blog.Post" → "Post")
+---@param model_key string
+---@return string
+local function class_name(model_key)
+	return (model_key:match("[^.]*$"))
+end
 
 --- Follow path to find current model or terminal field
----@param model_name string Starting model
+---@param model_key string Starting model
 ---@param prefix string User input prefix
 ---@param model_data ModelData
 ---@return ResolveResult
-local function resolve_path(model_name, prefix, model_data)
+local function resolve_path(model_key, prefix, model_data)
 	local path, label_prefix = split_prefix(prefix)
 
 	if #path == 0 then
-		return { model = model_name, label_prefix = "" }
+		return { model = model_key, label_prefix = "" }
 	end
 
-	local current_model = model_name
+	local current_model = model_key
 	for i, segment in ipairs(path) do
 		local field = model_data:get_field(current_model, segment)
 		if not field then
@@ -136,7 +149,7 @@ local function resolve_path(model_name, prefix, model_data)
 
 		if field.related_model then
 			-- Follow relation
-			current_model = field.related_model
+			current_model = field.related_key
 		else
 			-- Terminal field (non-relation) - return for lookup completion
 			if i == #path then
@@ -159,21 +172,29 @@ end
 
 --- Build documentation for a field
 ---@param field FieldInfo
----@param model_name string
+---@param model_key string
 ---@param model_data ModelData|nil
 ---@return table
-local function build_documentation(field, model_name, model_data)
+local function build_documentation(field, model_key, model_data)
 	local lines = {}
 
 	-- For relation fields, show the related model's fields (compact format)
 	if field.related_model and model_data then
-		local related = model_data:get_model(field.related_model)
-		if related and related.fields then
+		local related_key = field.related_key
+		if related_key and model_data:has_model(related_key) then
 			table.insert(lines, "```python")
 			table.insert(lines, "class " .. field.related_model .. ":")
-			for field_name, field_info in pairs(related.fields) do
+			local listed, hidden = 0, 0
+			for field_name, field_info in model_data:iter_fields(related_key) do
 				-- Skip reverse relations and auto-generated _id fields
-				if not field_name:match("_id$") and not field_info.type:match("Rel$") then
+				if field_name:match("_id$") or field_info.type:match("Rel$") then
+					goto continue
+				end
+
+				if listed >= M.MAX_RELATED_FIELDS then
+					hidden = hidden + 1
+				else
+					listed = listed + 1
 					if field_info.related_model then
 						table.insert(
 							lines,
@@ -183,13 +204,18 @@ local function build_documentation(field, model_name, model_data)
 						table.insert(lines, "    " .. field_name .. ": " .. field_info.type)
 					end
 				end
+
+				::continue::
+			end
+			if hidden > 0 then
+				table.insert(lines, string.format("    # ... %d more", hidden))
 			end
 			table.insert(lines, "```")
 		end
 	else
 		-- For non-relation fields, show the field definition
 		table.insert(lines, "```python")
-		table.insert(lines, "class " .. model_name .. ":")
+		table.insert(lines, "class " .. class_name(model_key) .. ":")
 		table.insert(lines, "    " .. (field.definition or "# unknown"))
 		table.insert(lines, "```")
 
@@ -208,17 +234,17 @@ end
 --- Build documentation for a lookup
 ---@param field_name string
 ---@param field FieldInfo
----@param model_name string
+---@param model_key string
 ---@param lookup string
 ---@param model_data ModelData
 ---@return table
-local function build_lookup_documentation(field_name, field, model_name, lookup, model_data)
+local function build_lookup_documentation(field_name, field, model_key, lookup, model_data)
 	local meta = model_data:get_lookup_metadata(lookup)
 	local lines = {}
 
 	-- Show field definition in class format
 	table.insert(lines, "```python")
-	table.insert(lines, "class " .. model_name .. ":")
+	table.insert(lines, "class " .. class_name(model_key) .. ":")
 	table.insert(lines, "    " .. (field.definition or field_name .. " = " .. field.type .. "(...)"))
 	table.insert(lines, "```")
 
@@ -236,13 +262,13 @@ local function build_lookup_documentation(field_name, field, model_name, lookup,
 end
 
 --- Create a field completion item
+--- Documentation is built on demand from `data` (see M.resolve_documentation)
 ---@param name string
 ---@param field FieldInfo
 ---@param label_prefix string
----@param model_name string
----@param model_data ModelData
+---@param model_key string
 ---@return table
-local function make_field_item(name, field, label_prefix, model_name, model_data)
+local function make_field_item(name, field, label_prefix, model_key)
 	local detail = field.type
 	if field.related_model then
 		detail = field.type .. " → " .. field.related_model
@@ -253,7 +279,7 @@ local function make_field_item(name, field, label_prefix, model_name, model_data
 		kind_icon = M.KIND_ICON,
 		kind_hl = M.KIND_HL,
 		detail = detail,
-		documentation = build_documentation(field, model_name, model_data),
+		data = { model = model_key, field = name },
 	}
 end
 
@@ -261,18 +287,17 @@ end
 ---@param name string
 ---@param field FieldInfo
 ---@param lookup string
----@param label_prefix string
----@param model_name string
----@param model_data ModelData
+---@param label string
+---@param model_key string
 ---@return table
-local function make_lookup_item(name, field, lookup, label_prefix, model_name, model_data)
+local function make_lookup_item(name, field, lookup, label, model_key)
 	return {
-		label = label_prefix .. name .. "__" .. lookup,
+		label = label,
 		kind_name = M.KIND_NAME,
 		kind_icon = M.KIND_ICON,
 		kind_hl = M.KIND_HL,
 		detail = field.type,
-		documentation = build_lookup_documentation(name, field, model_name, lookup, model_data),
+		data = { model = model_key, field = name, lookup = lookup },
 	}
 end
 
@@ -292,11 +317,13 @@ end
 -- =============================================================================
 
 --- Build completion items for Django QuerySet methods
----@param model_name string Model name (e.g., "Post")
+--- Items only depend on the path before the last "__", so typing a field name reuses the same list
+---@param model_name string Model name (e.g., "Post") or key (e.g., "blog.Post")
 ---@param method string QuerySet method (e.g., "filter")
 ---@param prefix string User input prefix (e.g., "author__")
----@return table[] items Blink completion items
-function M.build(model_name, method, prefix)
+---@param app_label string|nil App of the model, for names shared by several apps
+---@return table[] items Blink completion items (fresh shallow copies of the cached items)
+function M.build(model_name, method, prefix, app_label)
 	local model_data = ModelData.get_instance()
 	if not model_data then
 		return {}
@@ -307,7 +334,127 @@ function M.build(model_name, method, prefix)
 		return {}
 	end
 
-	local resolved = resolve_path(model_name, prefix, model_data)
+	local model_key = model_data:resolve_model(model_name, app_label)
+	if not model_key then
+		return {}
+	end
+
+	local _, label_prefix = split_prefix(prefix)
+	local key = model_key .. "\0" .. method .. "\0" .. label_prefix
+
+	local items = M.__cache_get(model_data, key)
+	if not items then
+		items = M.__build_items(model_key, prefix, config, model_data)
+		-- Models missing while a first extraction streams may still arrive
+		if #items > 0 then
+			M.__cache_set(key, items)
+		end
+	end
+
+	-- blink.cmp writes per-request fields (score_offset, source_id, cursor_column) onto items
+	local copies = {}
+	for i, item in ipairs(items) do
+		copies[i] = vim.tbl_extend("force", {}, item)
+	end
+	return copies
+end
+
+--- Check if a QuerySet method gets completions
+---@param method string
+---@return boolean
+function M.is_supported_method(method)
+	return METHOD_CONFIG[method] ~= nil
+end
+
+--- Build the documentation of an item returned by M.build
+--- Called when the item is selected, so only the items looked at pay for it
+---@param item table Completion item
+---@return table|nil documentation
+function M.resolve_documentation(item)
+	local data = item.data
+	if type(data) ~= "table" or not data.model or not data.field or not ModelData.is_loaded() then
+		return nil
+	end
+
+	local model_data = ModelData.get_instance()
+	local field = model_data and model_data:get_field(data.model, data.field)
+	if not field then
+		return nil
+	end
+
+	if data.lookup then
+		return build_lookup_documentation(data.field, field, data.model, data.lookup, model_data)
+	end
+	return build_documentation(field, data.model, model_data)
+end
+
+-- =============================================================================
+-- Private helpers
+-- =============================================================================
+
+-- Built item lists by key, for the ModelData instance they were built from
+M.__cache = { model_data = nil, entries = {}, count = 0, tick = 0 }
+
+--- Clear cached item lists
+function M.__cache_clear()
+	M.__cache = { model_data = nil, entries = {}, count = 0, tick = 0 }
+end
+
+--- Get a cached item list
+--- The cache is dropped when ModelData swapped its instance (refresh, set_instance)
+---@param model_data ModelData
+---@param key string
+---@return table[]|nil
+function M.__cache_get(model_data, key)
+	local cache = M.__cache
+	if cache.model_data ~= model_data then
+		M.__cache_clear()
+		M.__cache.model_data = model_data
+		return nil
+	end
+
+	local entry = cache.entries[key]
+	if not entry then
+		return nil
+	end
+
+	cache.tick = cache.tick + 1
+	entry.tick = cache.tick
+	return entry.items
+end
+
+--- Cache an item list, evicting the least recently used one when full
+---@param key string
+---@param items table[]
+function M.__cache_set(key, items)
+	local cache = M.__cache
+
+	if not cache.entries[key] then
+		if cache.count >= M.CACHE_SIZE then
+			local oldest_key, oldest_tick = nil, math.huge
+			for entry_key, entry in pairs(cache.entries) do
+				if entry.tick < oldest_tick then
+					oldest_key, oldest_tick = entry_key, entry.tick
+				end
+			end
+			cache.entries[oldest_key] = nil
+			cache.count = cache.count - 1
+		end
+		cache.count = cache.count + 1
+	end
+
+	cache.tick = cache.tick + 1
+	cache.entries[key] = { items = items, tick = cache.tick }
+end
+
+--- Build the item list for a model, method and prefix
+---@param model_key string
+---@param prefix string
+---@param config table Method configuration
+---@param model_data ModelData
+---@return table[]
+function M.__build_items(model_key, prefix, config, model_data)
+	local resolved = resolve_path(model_key, prefix, model_data)
 
 	-- Terminal field case: show lookups only
 	if resolved.field then
@@ -322,10 +469,6 @@ function M.build(model_name, method, prefix)
 	return {}
 end
 
--- =============================================================================
--- Private helpers
--- =============================================================================
-
 --- Build lookup completion items for a terminal field
 ---@param resolved ResolveResult
 ---@param config table Method configuration
@@ -337,21 +480,17 @@ function M.__build_lookup_items(resolved, config, model_data)
 	end
 
 	local items = {}
-	for _, lookup in ipairs(model_data:get_lookups_for_type(resolved.field.type)) do
-		table.insert(items, {
-			label = resolved.label_prefix .. lookup,
-			kind_name = M.KIND_NAME,
-			kind_icon = M.KIND_ICON,
-			kind_hl = M.KIND_HL,
-			detail = resolved.field.type,
-			documentation = build_lookup_documentation(
+	for _, lookup in ipairs(model_data:get_lookups_for_type(resolved.field.type_id)) do
+		table.insert(
+			items,
+			make_lookup_item(
 				resolved.field_name,
 				resolved.field,
-				resolved.field_model,
 				lookup,
-				model_data
-			),
-		})
+				resolved.label_prefix .. lookup,
+				resolved.field_model
+			)
+		)
 	end
 	return items
 end
@@ -362,13 +501,12 @@ end
 ---@param model_data ModelData
 ---@return table[]
 function M.__build_field_items(resolved, config, model_data)
-	local model = model_data:get_model(resolved.model)
-	if not model or not model.fields then
+	if not model_data:has_model(resolved.model) then
 		return {}
 	end
 
 	local items = {}
-	for name, field in pairs(model.fields) do
+	for name, field in model_data:iter_fields(resolved.model) do
 		local is_relation = field.related_model ~= nil
 
 		-- Filter by relation type
@@ -384,15 +522,13 @@ function M.__build_field_items(resolved, config, model_data)
 		end
 
 		-- Add field item
-		table.insert(items, make_field_item(name, field, resolved.label_prefix, resolved.model, model_data))
+		table.insert(items, make_field_item(name, field, resolved.label_prefix, resolved.model))
 
 		-- Add lookup items (non-relation fields only)
 		if config.lookups and not is_relation then
-			for _, lookup in ipairs(model_data:get_lookups_for_type(field.type)) do
-				table.insert(
-					items,
-					make_lookup_item(name, field, lookup, resolved.label_prefix, resolved.model, model_data)
-				)
+			for _, lookup in ipairs(model_data:get_lookups_for_type(field.type_id)) do
+				local label = resolved.label_prefix .. name .. "__" .. lookup
+				table.insert(items, make_lookup_item(name, field, lookup, label, resolved.model))
 			end
 		end
 
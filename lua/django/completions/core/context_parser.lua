@@ -1,28 +1,78 @@
 local M = {}
 
 local async = require("django.async")
+local completion_builder = require("django.completions.core.completion_builder")
+local ModelData = require("django.completions.core.model_data")
+
+-- QuerySet methods that return a QuerySet of the same model, so a chain of them keeps the model
+local QUERYSET_METHODS = {
+	all = true,
+	alias = true,
+	annotate = true,
+	defer = true,
+	difference = true,
+	distinct = true,
+	exclude = true,
+	extra = true,
+	filter = true,
+	intersection = true,
+	none = true,
+	only = true,
+	order_by = true,
+	prefetch_related = true,
+	reverse = true,
+	select_for_update = true,
+	select_related = true,
+	union = true,
+	using = true,
+	values = true,
+	values_list = true,
+}
+
+-- Lines searched above the call for the assignment of a variable
+local ASSIGNMENT_SEARCH_LINES = 200
+
+-- Hover requests in flight at once for a method chain
+M.MAX_CONCURRENT_HOVERS = 4
+
+-- Hover answers by buffer, then by method position and the text up to it
+-- false caches a hover without a model; typing the arguments keeps the keys stable
+M.__hover_cache = {}
+
+-- Names imported by each buffer (name → { module, name })
+M.__import_cache = {}
+
+vim.api.nvim_create_autocmd({ "InsertLeave", "BufWritePost", "BufUnload", "LspAttach" }, {
+	group = vim.api.nvim_create_augroup("DjangoHoverCache", { clear = true }),
+	callback = function(ev)
+		M.__hover_cache[ev.buf] = nil
+		M.__import_cache[ev.buf] = nil
+	end,
+})
 
 --- Parse context for Django completions
 --- Must be called within async.run()
 --- @param bufnr number Buffer number
 --- @param line number Line number (0-indexed)
 --- @param col number Column number (0-indexed)
---- @return table|nil context { model_name, method, prefix }
-function M.parse(bufnr, line, col)
+--- @param token table|nil Cancellation token (see async.new_token); no hover is sent once cancelled
+--- @return table|nil context { model_name, app_label, method, prefix }
+function M.parse(bufnr, line, col, token)
 	-- 1. Parse prefix from current line
 	local prefix = M.__parse_prefix(bufnr, line, col)
 	if not prefix then
 		return nil
 	end
 
-	-- 2. Get method and model_name from LSP hover
-	local method, model_name = M.__get_method_info(bufnr, line, col)
+	-- 2. Get method and model_name from the buffer, or from LSP hover
+	local method, model_name, app_label = M.__get_method_info(bufnr, line, col, token)
 	if not method or not model_name then
 		return nil
 	end
 
 	return {
 		model_name = model_name,
+		app_label = app_label,
 		method = method,
 		prefix = prefix,
 	}
@@ -61,8 +111,9 @@ end
 --- @param bufnr number Buffer number
 --- @param line number Line number (0-indexed)
 --- @param col number Column number (0-indexed)
---- @return string|nil method, string|nil model_name
-function M.__get_method_info(bufnr, line, col)
+--- @param token table|nil Cancellation token
+--- @return string|nil method, string|nil model_name, string|nil app_label
+function M.__get_method_info(bufnr, line, col, token)
 	local method_infos = M.__find_all_method_infos(bufnr, line, col)
 	if not method_infos or #method_infos == 0 then
 		return nil, nil
@@ -71,33 +122,390 @@ function M.__get_method_info(bufnr, line, col)
 	-- The last method is the current one (e.g., update, values)
 	local current_method = method_infos[#method_infos]
 
-	-- Try hover on each method from current to previous until we find a model
+	-- No hover round-trip for calls that never get Django completions (e.g., requests.get)
+	if not completion_builder.is_supported_method(current_method.method) then
+		return nil, nil
+	end
+
+	-- Chains on Model.objects (or on a variable assigned from one) need no hover
+	local model_name, app_label = M.__infer_model(bufnr, method_infos)
+	if model_name then
+		return current_method.method, model_name, app_label
+	end
+
+	-- Hover on every method of the chain at once, closest to the cursor first
 	-- Some methods (like update) return non-QuerySet types, so we need to check previous methods
+	local hovers = {}
 	for i = #method_infos, 1, -1 do
-		local info = method_infos[i]
-		local params = {
-			textDocument = vim.lsp.util.make_text_document_params(bufnr),
-			position = { line = info.line, character = info.target_col },
-		}
-
-		local err, result = async.lsp_request(bufnr, "textDocument/hover", params)
-		if not err and result and result.contents then
-			local model_name = M.__extract_model_from_hover(result.contents)
-			if model_name then
-				return current_method.method, model_name
+		table.insert(hovers, function()
+			return M.__hover_model(bufnr, method_infos[i], token)
+		end)
+	end
+
+	local model_names = async.all(hovers, M.MAX_CONCURRENT_HOVERS)
+	for i = 1, #hovers do
+		if model_names[i] then
+			-- Hover only names the class; the buffer's imports tell which app it is from
+			local model_data = ModelData.get_instance()
+			if model_data then
+				app_label = select(2, M.__resolve_model(bufnr, model_names[i], model_data))
 			end
+			return current_method.method, model_names[i], app_label
 		end
 	end
 
 	return nil, nil
 end
 
---- Find all method infos in the chain before cursor position
+--- Infer the model of a call chain from the buffer alone
+--- The chain must start at `Model.objects`, or at a variable assigned from such a chain in
+--- the same scope, and only go through methods that keep the QuerySet's model
+--- @param bufnr number Buffer number
+--- @param method_infos table[] Methods of the chain, first call first
+--- @return string|nil model_name, string|nil app_label
+function M.__infer_model(bufnr, method_infos)
+	for i = 1, #method_infos - 1 do
+		if not QUERYSET_METHODS[method_infos[i].method] then
+			return nil
+		end
+	end
+
+	local receiver = method_infos[1].receiver
+	if not receiver then
+		return nil
+	end
+
+	local expression = receiver
+	if receiver:match("^[%a_][%w_]*$") then
+		expression = M.__find_assignment(bufnr, method_infos[1].line, receiver)
+		if not expression then
+			return nil
+		end
+	end
+
+	local model_data = ModelData.get_instance()
+	if not model_data then
+		return nil
+	end
+
+	-- Annotated assignments: qs: QuerySet[Post] = ...
+	local name = expression:match("^[%w_%.]*QuerySet%[([%w_]+)") or expression:match("^[%w_%.]*Manager%[([%w_]+)")
+	local module
+	if not name then
+		name, module = M.__manager_model(bufnr, expression)
+	end
+	if not name then
+		return nil
+	end
+
+	return M.__resolve_model(bufnr, name, model_data, module)
+end
+
+--- Get the model name of `Model.objects` followed by QuerySet methods only
+--- e.g., "Post.objects" → "Post", "blog.models.Post.objects.filter(a=1).all()" → "Post", "blog.models"
+--- @param bufnr number Buffer number
+--- @param expression string
+--- @return string|nil model_name, string|nil module Module of a dotted model path
+function M.__manager_model(bufnr, expression)
+	local path, rest = expression:match("^([%a_][%w_%.]*)%.objects(.*)$")
+	if not path then
+		return nil
+	end
+
+	-- Every attribute after the manager must be a QuerySet method, including ones in arguments
+	if rest ~= "" and not rest:match("^%s*%.") then
+		return nil
+	end
+	for attribute in rest:gmatch("%.([%a_][%w_]*)") do
+		if not QUERYSET_METHODS[attribute] then
+			return nil
+		end
+	end
+
+	local module, name = path:match("^(.*)%.([%a_][%w_]*)$")
+	if not module then
+		return path, nil
+	end
+
+	-- "models.Post" after `from blog import models`
+	local head, tail = module:match("^([%a_][%w_]*)(.*)$")
+	local imported = M.__get_imports(bufnr)[head]
+	if imported then
+		module = imported.module .. "." .. imported.name .. tail
+	end
+	return name, module
+end
+
+--- Find the value last assigned to a variable above a line, in the same scope
+--- @param bufnr number Buffer number
+--- @param line number Line of the call (0-indexed)
+--- @param variable string
+--- @return string|nil expression The assigned expression (or the annotation of an annotated one)
+function M.__find_assignment(bufnr, line, variable)
+	local start_line = math.max(0, line - ASSIGNMENT_SEARCH_LINES)
+	local lines = vim.api.nvim_buf_get_lines(bufnr, start_line, line + 1, false)
+	local indent = #(lines[#lines] or ""):match("^%s*")
+
+	for i = #lines - 1, 1, -1 do
+		local text = lines[i]
+		local line_indent = #text:match("^%s*")
+
+		local value = text:match("^%s*" .. variable .. "%s*:%s*(.-)%s*$")
+			or text:match("^%s*" .. variable .. "%s*=%s*([^=].-)%s*$")
+		if value and line_indent <= indent then
+			return value
+		end
+
+		-- A def or class less indented than the call starts its scope
+		local starts_scope = text:match("^%s*def%s") or text:match("^%s*async%s+def%s") or text:match("^%s*class%s")
+		if starts_scope and line_indent < indent then
+			return nil
+		end
+	end
+
+	return nil
+end
+
+--- Resolve a name to a model and its app
+--- A name shared by models of several apps is told apart by the module it was accessed or
+--- imported from, then by the package of the buffer's file
+--- @param bufnr number Buffer number
+--- @param name string Name in the buffer (may be an alias) or model name from hover
+--- @param model_data ModelData
+--- @param module string|nil Module of a dotted model path
+--- @return string|nil model_name, string|nil app_label
+function M.__resolve_model(bufnr, name, model_data, module)
+	local imports = M.__get_imports(bufnr)
+	local imported = imports[name]
+	local model_name = imported and imported.name or name
+
+	local candidates = model_data:get_model_candidates(model_name)
+	if #candidates == 0 then
+		return nil, nil
+	end
+	if #candidates == 1 then
+		return model_name, model_data:get_model(candidates[1]).app_label
+	end
+
+	local modules = {}
+	if module or imported then
+		table.insert(modules, module or imported.module)
+	else
+		-- Hover answers with the class name, which the buffer may import under an alias
+		for _, entry in pairs(imports) do
+			if entry.name == model_name then
+				table.insert(modules, entry.module)
+			end
+		end
+	end
+
+	for _, key in ipairs(candidates) do
+		local model = model_data:get_model(key)
+		for _, import_module in ipairs(modules) do
+			if M.__module_matches(model.module, import_module) then
+				return model_name, model.app_label
+			end
+		end
+	end
+
+	-- Models used in their own app (e.g., defined in this file) are not imported
+	local path = vim.api.nvim_buf_get_name(bufnr):gsub("\\", "/")
+	for _, key in ipairs(candidates) do
+		local model = model_data:get_model(key)
+		if M.__module_contains_path(model.module, path) then
+			return model_name, model.app_label
+		end
+	end
+
+	return model_name, nil
+end
+
+--- Check if a file is inside the package of a module ("blog.models" → ".../blog/...")
+--- @param module string
+--- @param path string File path with "/" separators
+--- @return boolean
+function M.__module_contains_path(module, path)
+	local package = module:match("^(.*)%.[^.]+$") or module
+	return path:find("/" .. package:gsub("%.", "/") .. "/", 1, true) ~= nil
+end
+
+--- Check if a model's module is the one it was imported from
+--- "blog.models" matches "blog.models" and "blog.models.post"; relative imports
+--- (".models") match by their tail
+--- @param model_module string
+--- @param import_module string
+--- @return boolean
+function M.__module_matches(model_module, import_module)
+	local tail = import_module:match("^%.+(.*)$")
+	if tail then
+		return tail == "" or ("." .. model_module .. "."):find("." .. tail .. ".", 1, true) ~= nil
+	end
+	return model_module == import_module or vim.startswith(model_module, import_module .. ".")
+end
+
+--- Get the names imported with `from module import ...`, cached per buffer
+--- @param bufnr number Buffer number
+--- @return table<string, table> imports name → { module, name }
+function M.__get_imports(bufnr)
+	local imports = M.__import_cache[bufnr]
+	if imports then
+		return imports
+	end
+
+	imports = {}
+	local text = table.concat(vim.api.nvim_buf_get_lines(bufnr, 0, -1, false), "\n")
+	for module, names in text:gmatch("from%s+([%w_%.]+)%s+import%s+(%b())") do
+		M.__add_imports(imports, module, names:sub(2, -2))
+	end
+	for module, names in text:gmatch("from%s+([%w_%.]+)%s+import%s+([^%(\n][^\n]*)") do
+		M.__add_imports(imports, module, names)
+	end
+
+	M.__import_cache[bufnr] = imports
+	return imports
+end
+
+--- Add the names of one import statement ("Post, Comment as C")
+--- @param imports table
+--- @param module string
+--- @param names string
+function M.__add_imports(imports, module, names)
+	for item in names:gsub("#[^\n]*", ""):gmatch("[^,]+") do
+		local name, alias = item:match("^%s*([%w_]+)%s+as%s+([%w_]+)%s*$")
+		name = name or item:match("^%s*([%w_]+)%s*$")
+		if name then
+			imports[alias or name] = { module = module, name = name }
+		end
+	end
+end
+
+--- Get the model of a method's target from LSP hover, cached per buffer
+--- Must be called within async.run()
+--- @param bufnr number Buffer number
+--- @param info table Method info { line, method, target_col, text } (text identifies the call)
+--- @param token table|nil Cancellation token
+--- @return string|nil model_name
+function M.__hover_model(bufnr, info, token)
+	local key = info.line .. ":" .. info.target_col .. ":" .. info.text
+	local cache = M.__hover_cache[bufnr]
+	if cache and cache[key] ~= nil then
+		return cache[key] or nil
+	end
+
+	local params = {
+		textDocument = vim.lsp.util.make_text_document_params(bufnr),
+		position = { line = info.line, character = info.target_col },
+	}
+
+	local err, result = async.lsp_request(bufnr, "textDocument/hover", params, token)
+	-- Errors (and cancelled requests) are not cached, the server may not be ready yet
+	if err then
+		return nil
+	end
+
+	local model_name = result and result.contents and M.__extract_model_from_hover(result.contents) or nil
+	-- Read again: other hovers of the chain may have created the table meanwhile
+	M.__hover_cache[bufnr] = M.__hover_cache[bufnr] or {}
+	M.__hover_cache[bufnr][key] = model_name or false
+	return model_name
+end
+
+--- Find all method infos in the chain of the call around the cursor
+--- Uses the buffer's tree-sitter tree when the Python parser is available,
+--- and scans the lines above the cursor otherwise
 --- @param bufnr number Buffer number
 --- @param line number Current line number (0-indexed)
 --- @param col number Cursor column (0-indexed)
---- @return table[] Array of { line, method, target_col }
+--- @return table[] Array of { line, method, target_col, text }, first call of the chain first
 function M.__find_all_method_infos(bufnr, line, col)
+	local method_infos = M.__find_method_infos_treesitter(bufnr, line, col)
+	if method_infos then
+		return method_infos
+	end
+	return M.__find_method_infos_regex(bufnr, line, col)
+end
+
+--- Find the method chain of the enclosing call in the syntax tree
+--- The parser only re-parses what changed since the last keystroke, so this does not
+--- depend on the size of the file or the length of the chain's lines
+--- @param bufnr number Buffer number
+--- @param line number Current line number (0-indexed)
+--- @param col number Cursor column (0-indexed)
+--- @return table[]|nil method_infos nil without a parser or an enclosing method call
+function M.__find_method_infos_treesitter(bufnr, line, col)
+	local ok, parser = pcall(vim.treesitter.get_parser, bufnr, "python")
+	if not ok or not parser then
+		return nil
+	end
+
+	local tree = parser:parse()[1]
+	if not tree then
+		return nil
+	end
+
+	-- The character before the cursor: "(" right after opening the call, else the typed text
+	local pos = math.max(col - 1, 0)
+	local node = tree:root():named_descendant_for_range(line, pos, line, pos)
+
+	while node do
+		local node_type = node:type()
+		if node_type == "comment" then
+			return {}
+		end
+
+		-- Calls that are not methods (e.g., Q(...)) take the lookups of the enclosing method
+		if node_type == "argument_list" then
+			local call = node:parent()
+			local target = call and call:type() == "call" and call:field("function")[1]
+			if target and target:type() == "attribute" then
+				return M.__chain_method_infos(bufnr, call)
+			end
+		end
+
+		node = node:parent()
+	end
+
+	return nil
+end
+
+--- Collect the method calls of a call's receiver chain
+--- e.g., Post.objects.filter(...).values( → filter, values
+--- @param bufnr number Buffer number
+--- @param call TSNode Call node
+--- @return table[] method_infos First call of the chain first
+function M.__chain_method_infos(bufnr, call)
+	local method_infos = {}
+
+	while call and call:type() == "call" do
+		local target = call:field("function")[1]
+		if not target or target:type() ~= "attribute" then
+			break
+		end
+
+		local name = target:field("attribute")[1]
+		local name_line, name_col = name:start()
+		local receiver = target:field("object")[1]
+		table.insert(method_infos, 1, {
+			line = name_line,
+			method = vim.treesitter.get_node_text(name, bufnr),
+			target_col = name_col, -- method name position (0-indexed)
+			text = vim.treesitter.get_node_text(target, bufnr),
+			receiver = receiver and vim.treesitter.get_node_text(receiver, bufnr),
+		})
+
+		call = receiver
+	end
+
+	return method_infos
+end
+
+--- Find all method infos in the chain before cursor position by scanning the lines above
+--- Used when the buffer has no Python tree-sitter parser
+--- @param bufnr number Buffer number
+--- @param line number Current line number (0-indexed)
+--- @param col number Cursor column (0-indexed)
+--- @return table[] Array of { line, method, target_col, text } (text: the line up to the call)
+function M.__find_method_infos_regex(bufnr, line, col)
 	-- Search current line and up to 20 lines above
 	local start_line = math.max(0, line - 20)
 	local lines = vim.api.nvim_buf_get_lines(bufnr, start_line, line + 1, false)
@@ -120,6 +528,8 @@ function M.__find_all_method_infos(bufnr, line, col)
 				line = actual_line,
 				method = method_name,
 				target_col = dot_pos, -- method name position (0-indexed)
+				text = line_text:sub(1, end_pos),
+				receiver = line_text:sub(1, dot_pos - 1):match("[%w_%.]+$"),
 			})
 			pos = end_pos + 1
 		end
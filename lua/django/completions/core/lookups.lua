@@ -0,0 +1,232 @@
+--- Lookup catalog for completions
+--- Static, so it ships with the plugin instead of being written into every project cache
+
+local M = {}
+
+-- Lookups available on every field
+M.BASE = { "exact", "isnull", "in" }
+
+local NUMERIC = { "gt", "gte", "lt", "lte", "range" }
+
+local STRING = {
+	"iexact",
+	"contains",
+	"icontains",
+	"startswith",
+	"istartswith",
+	"endswith",
+	"iendswith",
+	"regex",
+	"iregex",
+}
+
+local DATE = {
+	"year",
+	"month",
+	"day",
+	"week",
+	"week_day",
+	"quarter",
+	"iso_year",
+	"iso_week_day",
+}
+
+local TIME = { "hour", "minute", "second" }
+
+--- Concatenate lookup lists
+--- @param ... string[]
+--- @return string[]
+local function concat(...)
+	local result = {}
+	for _, list in ipairs({ ... }) do
+		vim.list_extend(result, list)
+	end
+	return result
+end
+
+-- Field type → type-specific lookups (in addition to BASE)
+M.BY_TYPE = {
+	-- Numeric fields
+	AutoField = NUMERIC,
+	BigAutoField = NUMERIC,
+	SmallAutoField = NUMERIC,
+	IntegerField = NUMERIC,
+	BigIntegerField = NUMERIC,
+	SmallIntegerField = NUMERIC,
+	PositiveIntegerField = NUMERIC,
+	PositiveSmallIntegerField = NUMERIC,
+	PositiveBigIntegerField = NUMERIC,
+	FloatField = NUMERIC,
+	DecimalField = NUMERIC,
+	-- String fields
+	CharField = STRING,
+	TextField = STRING,
+	SlugField = STRING,
+	EmailField = STRING,
+	URLField = STRING,
+	-- Boolean
+	BooleanField = {},
+	-- Date/Time fields
+	DateField = concat(NUMERIC, DATE, { "date" }),
+	DateTimeField = concat(NUMERIC, DATE, TIME, { "date", "time" }),
+	TimeField = concat(NUMERIC, TIME),
+	DurationField = NUMERIC,
+	-- Special fields
+	JSONField = { "contains", "contained_by", "has_key", "has_keys", "has_any_keys" },
+	UUIDField = concat({ "iexact" }, NUMERIC),
+	-- File fields
+	FileField = STRING,
+	ImageField = STRING,
+	FilePathField = STRING,
+	-- Binary
+	BinaryField = {},
+	-- IP fields
+	IPAddressField = STRING,
+	GenericIPAddressField = STRING,
+	-- Relation fields (traversal only)
+	ForeignKey = {},
+	OneToOneField = {},
+	ManyToManyField = {},
+}
+
+-- Lookup name → { description, sql }
+M.METADATA = {
+	exact = {
+		description = "Exact match",
+		sql = "WHERE {field} = {value}",
+	},
+	iexact = {
+		description = "Case-insensitive exact match",
+		sql = "WHERE UPPER({field}) = UPPER({value})",
+	},
+	contains = {
+		description = "Case-sensitive containment test",
+		sql = "WHERE {field} LIKE '%{value}%'",
+	},
+	icontains = {
+		description = "Case-insensitive containment test",
+		sql = "WHERE UPPER({field}) LIKE UPPER('%{value}%')",
+	},
+	startswith = {
+		description = "Case-sensitive starts-with",
+		sql = "WHERE {field} LIKE '{value}%'",
+	},
+	istartswith = {
+		description = "Case-insensitive starts-with",
+		sql = "WHERE UPPER({field}) LIKE UPPER('{value}%')",
+	},
+	endswith = {
+		description = "Case-sensitive ends-with",
+		sql = "WHERE {field} LIKE '%{value}'",
+	},
+	iendswith = {
+		description = "Case-insensitive ends-with",
+		sql = "WHERE UPPER({field}) LIKE UPPER('%{value}')",
+	},
+	gt = {
+		description = "Greater than",
+		sql = "WHERE {field} > {value}",
+	},
+	gte = {
+		description = "Greater than or equal to",
+		sql = "WHERE {field} >= {value}",
+	},
+	lt = {
+		description = "Less than",
+		sql = "WHERE {field} < {value}",
+	},
+	lte = {
+		description = "Less than or equal to",
+		sql = "WHERE {field} <= {value}",
+	},
+	isnull = {
+		description = "Check if field is NULL or not",
+		sql = "WHERE {field} IS NULL",
+	},
+	range = {
+		description = "Range test (inclusive)",
+		sql = "WHERE {field} BETWEEN {start} AND {end}",
+	},
+	["in"] = {
+		description = "Check if value is in list",
+		sql = "WHERE {field} IN ({values})",
+	},
+	regex = {
+		description = "Case-sensitive regular expression match",
+		sql = "WHERE {field} ~ '{pattern}'",
+	},
+	iregex = {
+		description = "Case-insensitive regular expression match",
+		sql = "WHERE {field} ~* '{pattern}'",
+	},
+	year = {
+		description = "Extract year from date/datetime field",
+		sql = "WHERE EXTRACT(YEAR FROM {field}) = {value}",
+	},
+	month = {
+		description = "Extract month from date/datetime field",
+		sql = "WHERE EXTRACT(MONTH FROM {field}) = {value}",
+	},
+	day = {
+		description = "Extract day from date/datetime field",
+		sql = "WHERE EXTRACT(DAY FROM {field}) = {value}",
+	},
+	week = {
+		description = "Extract ISO week number",
+		sql = "WHERE EXTRACT(WEEK FROM {field}) = {value}",
+	},
+	week_day = {
+		description = "Day of week (1=Sunday, 7=Saturday)",
+		sql = "WHERE EXTRACT(DOW FROM {field}) = {value}",
+	},
+	quarter = {
+		description = "Extract quarter (1-4)",
+		sql = "WHERE EXTRACT(QUARTER FROM {field}) = {value}",
+	},
+	hour = {
+		description = "Extract hour from time/datetime field",
+		sql = "WHERE EXTRACT(HOUR FROM {field}) = {value}",
+	},
+	minute = {
+		description = "Extract minute from time/datetime field",
+		sql = "WHERE EXTRACT(MINUTE FROM {field}) = {value}",
+	},
+	second = {
+		description = "Extract second from time/datetime field",
+		sql = "WHERE EXTRACT(SECOND FROM {field}) = {value}",
+	},
+	date = {
+		description = "Cast datetime to date",
+		sql = "WHERE DATE({field}) = {value}",
+	},
+	time = {
+		description = "Extract time from datetime field",
+		sql = "WHERE TIME({field}) = {value}",
+	},
+	iso_year = {
+		description = "Extract ISO year",
+		sql = "WHERE EXTRACT(ISOYEAR FROM {field}) = {value}",
+	},
+	iso_week_day = {
+		description = "ISO day of week (1=Monday, 7=Sunday)",
+		sql = "WHERE EXTRACT(ISODOW FROM {field}) = {value}",
+	},
+	has_key = {
+		description = "Check if JSON has a specific key at top level",
+		sql = "WHERE {field} ? '{key}'",
+	},
+	has_keys = {
+		description = "Check if JSON has all specified keys",
+		sql = "WHERE {field} ?& ARRAY['{keys}']",
+	},
+	has_any_keys = {
+		description = "Check if JSON has any of the specified keys",
+		sql = "WHERE {field} ?| ARRAY['{keys}']",
+	},
+	contained_by = {
+		description = "Check if JSON is contained by another JSON",
+		sql = "WHERE {field} <@ '{json}'",
+	},
+}
+
+return M
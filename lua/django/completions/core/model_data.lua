@@ -9,50 +9,163 @@
 
 ---@class FieldInfo
 ---@field type string
----@field definition string
+---@field type_id number Index into ModelData.types
+---@field definition? string
 ---@field null boolean
 ---@field blank boolean
 ---@field max_length? number
+---@field choices? ChoicesInfo
 ---@field related_model? string
 ---@field related_app? string
----@field traversable? boolean
----@field choices? ChoicesInfo
+---@field related_key? string Model key ("app_label.Model") of the related model
+---@field related_query_name? string
+---@field related_field? string
+---@field reverse_name? string
+---@field traversable boolean
 
 ---@class ModelInfo
+---@field name string
 ---@field app_label string
 ---@field module string
----@field fields table<string, FieldInfo>
 
 ---@class LookupMetadata
 ---@field description string
 ---@field sql string
 
----@class LookupData
----@field base string[]
----@field by_type table<string, string[]>
----@field metadata table<string, LookupMetadata>
-
 ---@class ModelData
----@field models table<string, ModelInfo>
----@field lookups LookupData
+---@field models table<string, table> Model key ("app_label.Model") → { app_label id, module id, field rows }
+---@field strings string[]
+---@field types string[]
+---@field type_lookups number[] Type id → lookup set id (0 = unknown)
+---@field lookup_sets string[][]
+---@field choices ChoicesInfo[]
 
 local ModelData = {}
 ModelData.__index = ModelData
 
 local fetcher = require("django.fetcher")
+local lookups = require("django.completions.core.lookups")
 
 local SCRIPT_NAME = "get_completion_data.py"
 local CACHE_NAME = "completions"
 
 local instance = nil
 
+-- Cache schema written by get_completion_data.py (see SCHEMA_VERSION there)
+ModelData.SCHEMA_VERSION = 4
+
+-- Field row layout: key → { row index, table the id refers to }
+-- Ids are 1-based, 0 or missing means absent
+local ROW = {
+	type = { 1, "types" },
+	definition = { 2, "strings" },
+	max_length = { 4 },
+	choices = { 5, "choices" },
+	related_model = { 6, "strings" },
+	related_app = { 7, "strings" },
+	related_query_name = { 8, "strings" },
+	related_field = { 9, "strings" },
+	reverse_name = { 10, "strings" },
+}
+ModelData.ROW = ROW
+
+local FLAGS_INDEX = 3
+local FLAGS = { null = 1, blank = 2, traversable = 4 }
+
+-- Fields are decoded from their row on access
+local Field = {}
+
+function Field.__index(field, key)
+	local row = rawget(field, "__row")
+
+	if key == "type_id" then
+		return row[1]
+	end
+
+	if key == "related_key" then
+		local data = rawget(field, "__data")
+		local related_model = data.strings[row[ROW.related_model[1]] or 0]
+		local related_app = data.strings[row[ROW.related_app[1]] or 0]
+		if related_model and related_app then
+			return related_app .. "." .. related_model
+		end
+		return related_model and data:resolve_model(related_model)
+	end
+
+	local flag = FLAGS[key]
+	if flag then
+		return math.floor((row[FLAGS_INDEX] or 0) / flag) % 2 == 1
+	end
+
+	local spec = ROW[key]
+	if not spec then
+		return nil
+	end
+
+	local value = row[spec[1]]
+	if not value or value == 0 then
+		return nil
+	end
+
+	if spec[2] then
+		return rawget(field, "__data")[spec[2]][value]
+	end
+	return value
+end
+
 function ModelData.new(data)
 	local self = setmetatable({}, ModelData)
 	self.models = data.models or {}
-	self.lookups = data.lookups or {}
+	self.strings = data.strings or {}
+	self.types = data.types or {}
+	self.type_lookups = data.type_lookups or {}
+	self.lookup_sets = data.lookup_sets or {}
+	self.choices = data.choices or {}
+
+	-- Compiled at load time (see __build_index)
+	self.__by_name = {}
+	self.__field_names = {}
+	self.__type_lookups = {}
+	self.__name_lookups = {}
+	self:__build_index()
+
 	return self
 end
 
+--- Index models that are not indexed yet: name → model keys, sorted field names
+--- Streamed data grows in place, so this is called again when more models arrived
+function ModelData:__build_index()
+	local added = {}
+
+	for key, model in pairs(self.models) do
+		if not self.__field_names[key] then
+			local names = vim.tbl_keys(model[3] or {})
+			table.sort(names)
+			self.__field_names[key] = names
+
+			local name = key:match("[^.]*$")
+			self.__by_name[name] = self.__by_name[name] or {}
+			table.insert(self.__by_name[name], key)
+			added[name] = true
+		end
+	end
+
+	for name in pairs(added) do
+		table.sort(self.__by_name[name])
+	end
+
+	for type_id = #self.__type_lookups + 1, #self.types do
+		self.__type_lookups[type_id] = self:__compile_lookups(type_id)
+	end
+end
+
+--- Check if data uses the current cache schema
+---@param data table|nil
+---@return boolean
+function ModelData.is_current(data)
+	return type(data) == "table" and data.version == ModelData.SCHEMA_VERSION
+end
+
 --- Get singleton instance (loads data if needed)
 --- Must be called within async.run()
 ---@return ModelData|nil
@@ -61,8 +174,16 @@ function ModelData.get_instance()
 		return instance
 	end
 
-	local data = fetcher.get_or_fetch(SCRIPT_NAME, CACHE_NAME, { silent = true })
-	if not data then
+	local fetch_opts = { silent = true, on_progress = ModelData.set_partial }
+	local data = fetcher.get_or_fetch(SCRIPT_NAME, CACHE_NAME, fetch_opts)
+
+	-- Cache written by an older plugin version
+	if data and not ModelData.is_current(data) then
+		data = fetcher.refresh(SCRIPT_NAME, CACHE_NAME, vim.tbl_extend("force", fetch_opts, { force = true }))
+	end
+
+	if not data or not ModelData.is_current(data) then
+		instance = nil
 		return nil
 	end
 
@@ -70,49 +191,177 @@ function ModelData.get_instance()
 	return instance
 end
 
+--- Check if an instance is loaded
+---@return boolean
+function ModelData.is_loaded()
+	return instance ~= nil
+end
+
 --- Clear cached instance
 function ModelData.clear()
 	instance = nil
 end
 
+--- Answer from the models received so far while a full extraction streams
+--- The streamed tables are filled in place, so the instance sees later models too
+---@param data table
+function ModelData.set_partial(data)
+	if not ModelData.is_current(data) then
+		return
+	end
+
+	if not instance then
+		instance = ModelData.new(data)
+	elseif instance.models == data.models then
+		instance:__build_index()
+	end
+end
+
 --- Set singleton instance (for refresh)
 ---@param data table
 function ModelData.set_instance(data)
-	if data then
+	if ModelData.is_current(data) then
 		instance = ModelData.new(data)
 	end
 end
 
---- Get model by name
----@param model_name string
+--- Get the key of a model from its key or name
+--- A name shared by models of several apps resolves to the model of `app_label`,
+--- otherwise to the first key in sorted order
+---@param name string Model key ("app_label.Model") or model name
+---@param app_label string|nil Preferred app when the name is ambiguous
+---@return string|nil model_key
+function ModelData:resolve_model(name, app_label)
+	if self.models[name] then
+		return name
+	end
+
+	local candidates = self.__by_name[name]
+	if not candidates then
+		return nil
+	end
+
+	if app_label then
+		local key = app_label .. "." .. name
+		if self.models[key] then
+			return key
+		end
+	end
+	return candidates[1]
+end
+
+--- Get the keys of all models with a name
+---@param name string
+---@return string[] model_keys (shared, do not modify)
+function ModelData:get_model_candidates(name)
+	return self.__by_name[name] or {}
+end
+
+--- Check if a model exists
+---@param model_key string
+---@return boolean
+function ModelData:has_model(model_key)
+	return self.models[model_key] ~= nil
+end
+
+--- Get model by key
+---@param model_key string
 ---@return ModelInfo|nil
-function ModelData:get_model(model_name)
-	return self.models[model_name]
+function ModelData:get_model(model_key)
+	local model = self.models[model_key]
+	if not model then
+		return nil
+	end
+	return {
+		name = model_key:match("[^.]*$"),
+		app_label = self.strings[model[1]],
+		module = self.strings[model[2]],
+	}
+end
+
+--- Wrap a field row
+---@param row table
+---@return FieldInfo
+function ModelData:__field(row)
+	return setmetatable({ __row = row, __data = self }, Field)
 end
 
 --- Get field from model
----@param model_name string
+---@param model_key string
 ---@param field_name string
 ---@return FieldInfo|nil
-function ModelData:get_field(model_name, field_name)
-	local model = self:get_model(model_name)
-	if not model or not model.fields then
+function ModelData:get_field(model_key, field_name)
+	local model = self.models[model_key]
+	local row = model and model[3][field_name]
+	if not row then
 		return nil
 	end
-	return model.fields[field_name]
+	return self:__field(row)
+end
+
+--- Iterate over the fields of a model, sorted by name
+---@param model_key string
+---@return fun(): string|nil, FieldInfo|nil
+function ModelData:iter_fields(model_key)
+	local model = self.models[model_key]
+	local rows = model and model[3] or {}
+	local names = self.__field_names[model_key] or {}
+	local index = 0
+
+	return function()
+		index = index + 1
+		local name = names[index]
+		if name == nil then
+			return nil
+		end
+		return name, self:__field(rows[name])
+	end
 end
 
 --- Get lookups for field type
----@param field_type string
----@return string[]
+--- A type id returns the lookups registered on the field class;
+--- types without them (and type names) fall back to the plugin's catalog
+---@param field_type number|string Type id or type name
+---@return string[] lookups (shared, do not modify)
 function ModelData:get_lookups_for_type(field_type)
+	if type(field_type) == "number" then
+		local compiled = self.__type_lookups[field_type]
+		if compiled then
+			return compiled
+		end
+		return self:__compile_lookups(field_type)
+	end
+
+	local compiled = self.__name_lookups[field_type]
+	if not compiled then
+		compiled = ModelData.__catalog_lookups(field_type)
+		self.__name_lookups[field_type] = compiled
+	end
+	return compiled
+end
+
+--- Build the lookup list of a type id
+---@param type_id number
+---@return string[]
+function ModelData:__compile_lookups(type_id)
+	local lookup_set = self.lookup_sets[self.type_lookups[type_id] or 0]
+	if lookup_set then
+		return lookup_set
+	end
+	return ModelData.__catalog_lookups(self.types[type_id])
+end
+
+--- Build the lookup list of a type name from the plugin's catalog
+---@param field_type string|nil
+---@return string[]
+function ModelData.__catalog_lookups(field_type)
 	local result = {}
 
-	for _, lookup in ipairs(self.lookups.base or {}) do
+	for _, lookup in ipairs(lookups.BASE) do
 		table.insert(result, lookup)
 	end
 
-	local type_lookups = self.lookups.by_type and self.lookups.by_type[field_type]
+	local type_lookups = lookups.BY_TYPE[field_type]
 	if type_lookups then
 		for _, lookup in ipairs(type_lookups) do
 			table.insert(result, lookup)
@@ -126,10 +375,7 @@ end
 ---@param lookup_name string
 ---@return LookupMetadata|nil
 function ModelData:get_lookup_metadata(lookup_name)
-	if not self.lookups.metadata then
-		return nil
-	end
-	return self.lookups.metadata[lookup_name]
+	return lookups.METADATA[lookup_name]
 end
 
 return ModelData
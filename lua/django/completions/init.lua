@@ -8,22 +8,200 @@ local ModelData = require("django.completions.core.model_data")
 local SCRIPT_NAME = "get_completion_data.py"
 local CACHE_NAME = "completions"
 
+-- Saved files not yet re-extracted (path → true)
+local pending_files = {}
+
 function M.setup()
 	local auto_refresh = config.current.completions.auto_refresh
 	if auto_refresh and auto_refresh.file_watch_patterns then
-		watcher.register("completions", auto_refresh.file_watch_patterns, function()
-			M.refresh({ silent = true })
+		watcher.register("completions", auto_refresh.file_watch_patterns, function(file)
+			M.refresh_files({ file }, { silent = true })
 		end)
 	end
 end
 
 function M.refresh(opts)
+	-- Without loaded data, completions can start from the first streamed models
+	if not ModelData.is_loaded() then
+		opts = vim.tbl_extend("force", opts or {}, { on_progress = ModelData.set_partial })
+	end
+
 	fetcher.refresh_with_callback(SCRIPT_NAME, CACHE_NAME, opts, function(data)
 		-- 성공 시에만 인스턴스 교체
 		if data then
 			ModelData.set_instance(data)
 		end
+		M.__refresh_pending(opts)
+	end)
+end
+
+--- Extract the files saved while a fetch was running
+--- The running fetch may have read them before they were saved
+--- @param opts table|nil
+function M.__refresh_pending(opts)
+	if next(pending_files) ~= nil then
+		M.refresh_files({}, opts)
+	end
+end
+
+--- Re-extract only the apps containing the given files and merge them into the cache
+--- Falls back to a full refresh when there is no cache to merge into
+--- @param files string[] Absolute file paths
+--- @param opts table|nil Options: { silent = boolean }
+function M.refresh_files(files, opts)
+	for _, file in ipairs(files) do
+		pending_files[file] = true
+	end
+
+	-- Keep the files pending; they are extracted when the running fetch ends
+	if fetcher.is_fetching(CACHE_NAME) then
+		return
+	end
+
+	local args = { "--files" }
+	for file in pairs(pending_files) do
+		table.insert(args, file)
+	end
+	pending_files = {}
+
+	-- Merging needs a cache in the current schema, which a loaded instance guarantees
+	if not fetcher.has_cached_data(CACHE_NAME) or not ModelData.is_loaded() then
+		M.refresh(opts)
+		return
+	end
+
+	local fetch_opts = vim.tbl_extend("force", opts or {}, { args = args, merge = M.__merge_partial })
+	fetcher.refresh_with_callback(SCRIPT_NAME, CACHE_NAME, fetch_opts, function(data)
+		if data then
+			ModelData.set_instance(data)
+		end
+		M.__refresh_pending(opts)
 	end)
 end
 
+--- Create an interner that assigns 1-based ids to values
+--- @return table items, fun(value: any): number intern
+local function new_interner()
+	local items, ids = {}, {}
+	return items,
+		function(value)
+			if value == nil then
+				return 0
+			end
+			local id = ids[value]
+			if not id then
+				table.insert(items, value)
+				id = #items
+				ids[value] = id
+			end
+			return id
+		end
+end
+
+--- Merge a partial extraction (see get_completion_data.py --files) into cached data
+--- Both sides have their own string, type and choices tables, so every kept row is
+--- re-interned into fresh tables (which also drops entries nothing refers to anymore)
+--- @param cached table Full completion data
+--- @param partial table Partial completion data
+--- @return table merged
+function M.__merge_partial(cached, partial)
+	local info = partial.partial
+	if not info or not ModelData.is_current(cached) then
+		return partial
+	end
+
+	local changed_apps = {}
+	for _, app_label in ipairs(info.apps or {}) do
+		changed_apps[app_label] = true
+	end
+
+	local merged = { version = ModelData.SCHEMA_VERSION, models = {} }
+	local interners = {}
+	merged.strings, interners.strings = new_interner()
+	merged.choices, interners.choices = new_interner()
+	merged.lookup_sets = {}
+	local lookup_sets = {}
+
+	-- A type is its name plus the lookup set of its field class
+	merged.types, merged.type_lookups = {}, {}
+	local type_ids = {}
+	function interners.types(type_id, source)
+		local name = source.types[type_id]
+		local lookups = source.lookup_sets[source.type_lookups[type_id] or 0]
+		local set_key = lookups and table.concat(lookups, ",") or ""
+		local key = name .. "\0" .. set_key
+
+		if not type_ids[key] then
+			if lookups and not lookup_sets[set_key] then
+				table.insert(merged.lookup_sets, lookups)
+				lookup_sets[set_key] = #merged.lookup_sets
+			end
+			table.insert(merged.types, name)
+			table.insert(merged.type_lookups, lookups and lookup_sets[set_key] or 0)
+			type_ids[key] = #merged.types
+		end
+		return type_ids[key]
+	end
+
+	local function remap_row(row, source)
+		local new_row = {}
+		for i, value in ipairs(row) do
+			new_row[i] = value
+		end
+		for _, spec in pairs(ModelData.ROW) do
+			local index, table_name = spec[1], spec[2]
+			local value = new_row[index]
+			if table_name == "types" then
+				new_row[index] = interners.types(value, source)
+			elseif table_name and value and value ~= 0 then
+				new_row[index] = interners[table_name](source[table_name][value])
+			end
+		end
+		return new_row
+	end
+
+	local function add_model(name, model, source, skip_field)
+		local fields = {}
+		for field_name, row in pairs(model[3] or {}) do
+			if not (skip_field and skip_field(row)) then
+				fields[field_name] = remap_row(row, source)
+			end
+		end
+		merged.models[name] = {
+			interners.strings(source.strings[model[1]]),
+			interners.strings(source.strings[model[2]]),
+			fields,
+		}
+	end
+
+	-- Reverse relations from changed apps are re-sent in reverse_relations
+	local related_app_index = ModelData.ROW.related_app[1]
+	local function is_changed_reverse(row)
+		local type_name = cached.types[row[1]] or ""
+		local related_app = cached.strings[row[related_app_index] or 0]
+		return related_app ~= nil and changed_apps[related_app] and type_name:match("Rel$") ~= nil
+	end
+
+	for name, model in pairs(cached.models or {}) do
+		if not changed_apps[cached.strings[model[1]]] then
+			add_model(name, model, cached, is_changed_reverse)
+		end
+	end
+
+	for name, model in pairs(partial.models or {}) do
+		add_model(name, model, partial)
+	end
+
+	for name, fields in pairs(info.reverse_relations or {}) do
+		local model = merged.models[name]
+		if model then
+			for field_name, row in pairs(fields) do
+				model[3][field_name] = remap_row(row, partial)
+			end
+		end
+	end
+
+	return merged
+end
+
 return M
@@ -27,6 +27,20 @@ M.default = {
 			file_watch_patterns = { "**/models.py", "**/models/*.py" },
 		},
 	},
+	fingerprint = {
+		enabled = true, -- skip automatic refreshes when no source file changed since the last run
+		content_hash = false, -- also store file hashes so saves without changes are detected
+	},
+	stream = {
+		enabled = true, -- let pickers and completions use a first full extraction while it is still running
+		poll_interval = 100, -- ms between reads of the script output
+	},
+	timings = {
+		history = 10, -- phase timings kept per cache for :DjangoTimings (0 disables)
+	},
+	worker = {
+		enabled = false, -- keep one Django process warm between refreshes instead of starting one per run
+	},
 	shell = {
 		command = "shell", -- "shell", "shell_plus", "shell_plus --ipython", etc.
 		position = "right", -- "bottom", "top", "left", "right", "float"
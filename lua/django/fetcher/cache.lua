@@ -31,21 +31,64 @@ function M.__get_temp_path(cache_name)
 	return M.__get_path(cache_name) .. ".tmp"
 end
 
---- Read cached data from file
+--- Split script output `{ data, meta }` into its parts
+--- Data written without the envelope (older caches, merged caches) is returned as is
+--- @param decoded any
+--- @return any data, table|nil meta
+function M.unwrap(decoded)
+	if type(decoded) == "table" and decoded.data ~= nil and type(decoded.meta) == "table" then
+		return decoded.data, decoded.meta
+	end
+	return decoded, nil
+end
+
+--- Read and decode a cache file
 --- @param cache_name string
---- @return table data Empty table if not found or invalid
-function M.read(cache_name)
+--- @return table|nil data, table|nil meta
+function M.__decode(cache_name)
 	local path = M.__get_path(cache_name)
 
 	if vim.fn.filereadable(path) == 1 then
 		local content = vim.fn.readfile(path)
-		local ok, data = pcall(vim.json.decode, table.concat(content, "\n"))
-		if ok and data then
-			return data
+		local ok, decoded = pcall(vim.json.decode, table.concat(content, "\n"))
+		if ok then
+			local data, meta = M.unwrap(decoded)
+			if type(data) == "table" then
+				return data, meta
+			end
 		end
 	end
 
-	return {}
+	return nil, nil
+end
+
+--- Read cached data from file
+--- @param cache_name string
+--- @return table data Empty table if not found or invalid
+function M.read(cache_name)
+	return (M.__decode(cache_name)) or {}
+end
+
+--- Read the script metadata stored with cached data
+--- @param cache_name string
+--- @return table meta Empty table if not found or not stored
+function M.read_meta(cache_name)
+	local _, meta = M.__decode(cache_name)
+	return meta or {}
+end
+
+--- Check if a cache file exists
+--- @param cache_name string
+--- @return boolean
+function M.exists(cache_name)
+	return vim.fn.filereadable(M.__get_path(cache_name)) == 1
+end
+
+--- Replace temp file content with encoded data
+--- @param cache_name string
+--- @param data table
+function M.write_temp(cache_name, data)
+	vim.fn.writefile({ vim.json.encode(data) }, M.__get_temp_path(cache_name))
 end
 
 --- Move temp file to permanent cache file
@@ -63,6 +106,13 @@ function M.discard(cache_name)
 	vim.fn.delete(temp_path)
 end
 
+--- Check if a temp file was written
+--- @param cache_name string
+--- @return boolean
+function M.has_temp(cache_name)
+	return vim.fn.filereadable(M.__get_temp_path(cache_name)) == 1
+end
+
 --- Read temp file content as lines
 --- @param cache_name string
 --- @return string[] lines
@@ -1,6 +1,11 @@
 local M = {}
 
 local cache = require("django.fetcher.cache")
+local config = require("django.config")
+local worker = require("django.fetcher.worker")
+
+-- Timings reported by the last runs of each cache, oldest first
+M.__timings = {}
 
 --- Get plugin's script directory path
 --- @param script_name string
@@ -14,53 +19,136 @@ end
 --- Build shell command to execute Python script
 --- @param script_name string
 --- @param output_path string
+--- @param args string[]|nil Extra script arguments
 --- @return string
-function M.__build_command(script_name, output_path)
+function M.__build_command(script_name, output_path, args)
 	local script_path = M.__get_script_path(script_name)
 	local python_path = require("django.utils").get_python_path()
 	local cwd = vim.fn.getcwd()
 
+	local script_args = {}
+	for _, arg in ipairs(args or {}) do
+		table.insert(script_args, " " .. vim.fn.shellescape(arg))
+	end
+
 	return string.format(
-		"cd %s && %s %s > %s 2>&1",
+		"cd %s && %s %s%s > %s 2>&1",
 		vim.fn.shellescape(cwd),
 		vim.fn.shellescape(python_path),
 		vim.fn.shellescape(script_path),
+		table.concat(script_args),
 		vim.fn.shellescape(output_path)
 	)
 end
 
 --- Execute Python script asynchronously
+--- Uses the warm worker when enabled, falling back to a one-shot process
 --- Must be called within async.run()
 --- @param script_name string
 --- @param cache_name string
---- @return table result { code: number }
-function M.run(script_name, cache_name)
-	local async = require("django.async")
-	local cmd = cache.build_output_command(cache_name, function(output_path)
-		return M.__build_command(script_name, output_path)
-	end)
-
-	return async.system({ "sh", "-c", cmd }, { text = true })
+--- @param args string[]|nil Extra script arguments
+--- @return table result { code: number, elapsed_ms: number }
+function M.run(script_name, cache_name, args)
+	local started = vim.uv.hrtime()
+
+	local result
+	if worker.is_enabled() then
+		result = worker.run(script_name, cache.__get_temp_path(cache_name), args)
+	end
+
+	if not result then
+		local async = require("django.async")
+		local cmd = cache.build_output_command(cache_name, function(output_path)
+			return M.__build_command(script_name, output_path, args)
+		end)
+		result = async.system({ "sh", "-c", cmd }, { text = true })
+	end
+
+	result.elapsed_ms = (vim.uv.hrtime() - started) / 1e6
+	return result
+end
+
+--- Keep the timings a script reported (see PhaseTimer in scripts/django_utils.py)
+--- @param cache_name string
+--- @param timings table { total_ms: number, peak_rss_kb: number|nil, phases: table[] }
+--- @param elapsed_ms number|nil Wall time of the run as seen from the editor
+function M.__record_timings(cache_name, timings, elapsed_ms)
+	local limit = (config.current.timings or {}).history or 0
+	if limit <= 0 then
+		return
+	end
+
+	local history = M.__timings[cache_name] or {}
+	table.insert(history, {
+		time = os.time(),
+		elapsed_ms = elapsed_ms,
+		total_ms = timings.total_ms,
+		peak_rss_kb = timings.peak_rss_kb,
+		phases = timings.phases or {},
+	})
+	while #history > limit do
+		table.remove(history, 1)
+	end
+	M.__timings[cache_name] = history
+end
+
+--- Get the timings of the last runs, oldest first
+--- @param cache_name string
+--- @return table[]
+function M.get_timings(cache_name)
+	return M.__timings[cache_name] or {}
 end
 
 --- Count items in data (handles both arrays and dictionaries)
+--- Versioned data (see get_completion_data.py) is counted by its models
 --- @param data table
 --- @return number
 function M.__count_items(data)
+	if data.version and type(data.models) == "table" then
+		return vim.tbl_count(data.models)
+	end
+
 	if vim.islist(data) then
 		return #data
 	end
 	return vim.tbl_count(data)
 end
 
---- Parse result from temp file
+--- Decode script output from the temp file
+--- Streamed output is taken from its assembler and stored in the temp file the way
+--- output without --stream is, so it can be committed as is
 --- @param cache_name string
---- @return table result { success: boolean, message: string, level: number, data: table|nil }
-function M.parse_result(cache_name)
+--- @param assembler StreamAssembler|nil
+--- @return boolean ok, any decoded
+function M.__decode_output(cache_name, assembler)
+	if assembler then
+		local data, meta = assembler:finish()
+		-- Without the closing meta record the stream is incomplete; a static fallback is not a stream
+		if data and meta then
+			local decoded = { data = data, meta = meta }
+			cache.write_temp(cache_name, decoded)
+			return true, decoded
+		end
+	end
+
 	local content = cache.read_temp_lines(cache_name)
-	local ok, data = pcall(vim.json.decode, table.concat(content, "\n"))
+	return pcall(vim.json.decode, table.concat(content, "\n"))
+end
 
-	if not ok then
+--- Parse result from temp file
+--- @param cache_name string
+--- @param elapsed_ms number|nil Wall time of the run, kept with the reported timings
+--- @param assembler StreamAssembler|nil Records assembled while the script was writing them
+--- @return table result { success: boolean, message: string, level: number, data: table|nil, meta: table|nil }
+function M.parse_result(cache_name, elapsed_ms, assembler)
+	local ok, decoded = M.__decode_output(cache_name, assembler)
+	local data, meta = cache.unwrap(decoded)
+
+	if ok and type(meta) == "table" and type(meta.timings) == "table" then
+		M.__record_timings(cache_name, meta.timings, elapsed_ms)
+	end
+
+	if not ok or type(data) ~= "table" then
 		return {
 			success = false,
 			message = "Failed to parse Django " .. cache_name,
@@ -71,7 +159,9 @@ function M.parse_result(cache_name)
 
 	local item_count = M.__count_items(data)
 
-	if item_count == 0 then
+	-- A partial extraction of an app whose last model was deleted is empty; merging it
+	-- is what removes that app's models
+	if item_count == 0 and type(data.partial) ~= "table" then
 		return {
 			success = false,
 			message = "No Django " .. cache_name .. " found",
@@ -80,11 +170,44 @@ function M.parse_result(cache_name)
 		}
 	end
 
+	if meta and meta.static then
+		return M.__static_result(cache_name, data, meta, item_count)
+	end
+
 	return {
 		success = true,
 		message = string.format("Django %s refreshed successfully (%d items)", cache_name, item_count),
 		level = vim.log.levels.INFO,
 		data = data,
+		meta = meta,
+	}
+end
+
+--- Build the result for data parsed from source files (see scripts/static_models.py)
+--- It never replaces data from a full Django run: setup errors are often temporary
+--- @param cache_name string
+--- @param data table
+--- @param meta table
+--- @param item_count number
+--- @return table result
+function M.__static_result(cache_name, data, meta, item_count)
+	local reason = meta.setup_error and ("django.setup() failed: " .. meta.setup_error) or "static mode"
+
+	if cache.exists(cache_name) and not cache.read_meta(cache_name).static then
+		return {
+			success = false,
+			message = string.format("Keeping cached Django %s, %s", cache_name, reason),
+			level = vim.log.levels.ERROR,
+			data = nil,
+		}
+	end
+
+	return {
+		success = true,
+		message = string.format("Django %s read from source files (%d items), %s", cache_name, item_count, reason),
+		level = vim.log.levels.WARN,
+		data = data,
+		meta = meta,
 	}
 end
 
@@ -0,0 +1,160 @@
+local M = {}
+
+local cache = require("django.fetcher.cache")
+local config = require("django.config")
+
+--- Check if fingerprint checks are enabled
+--- @return boolean
+function M.is_enabled()
+	local fingerprint_config = config.current.fingerprint
+	return fingerprint_config ~= nil and fingerprint_config.enabled == true
+end
+
+--- Get fingerprint file path for a cache name (next to the cache file)
+--- @param cache_name string
+--- @return string
+function M.__get_path(cache_name)
+	local path = cache.__get_path(cache_name):gsub("%.json$", ".fingerprint.json")
+	return path
+end
+
+--- Hash a file's content
+--- @param path string
+--- @param size number
+--- @return string|nil
+function M.__hash_file(path, size)
+	local fd = vim.uv.fs_open(path, "r", 438)
+	if not fd then
+		return nil
+	end
+
+	local content = vim.uv.fs_read(fd, size, 0)
+	vim.uv.fs_close(fd)
+
+	return content and vim.fn.sha256(content) or nil
+end
+
+--- Current time with sub-second resolution, to compare against file mtimes
+--- @return number[] { sec, nsec }
+function M.now()
+	local time = vim.uv.clock_gettime("realtime")
+	return { time.sec, time.nsec }
+end
+
+--- Check if a file mtime is strictly after a time returned by M.now()
+--- @param mtime table { sec: number, nsec: number }
+--- @param time number[] { sec, nsec }
+--- @return boolean
+function M.__is_after(mtime, time)
+	if mtime.sec ~= time[1] then
+		return mtime.sec > time[1]
+	end
+	return mtime.nsec > time[2]
+end
+
+--- Read the stored fingerprint
+--- @param cache_name string
+--- @return table|nil fingerprint { python: string, files: table<string, { mtime: number[], size: number, hash?: string }> }
+function M.read(cache_name)
+	local path = M.__get_path(cache_name)
+	if vim.fn.filereadable(path) == 0 then
+		return nil
+	end
+
+	local ok, data = pcall(vim.json.decode, table.concat(vim.fn.readfile(path), "\n"))
+	if not ok or type(data) ~= "table" or type(data.files) ~= "table" then
+		return nil
+	end
+
+	return data
+end
+
+--- Delete the stored fingerprint
+--- @param cache_name string
+function M.discard(cache_name)
+	vim.fn.delete(M.__get_path(cache_name))
+end
+
+--- Record the source files a cache was built from
+--- Files modified after `started_at` may not be reflected in the data, so no fingerprint is kept
+--- @param cache_name string
+--- @param sources string[]|nil Source file paths reported by the script
+--- @param started_at number[] Time the script was started (see M.now)
+--- @param partial boolean|nil Update entries of the existing fingerprint instead of replacing it
+function M.write(cache_name, sources, started_at, partial)
+	if not M.is_enabled() or type(sources) ~= "table" or vim.tbl_isempty(sources) then
+		M.discard(cache_name)
+		return
+	end
+
+	local files = {}
+	if partial then
+		local existing = M.read(cache_name)
+		if not existing then
+			-- Nothing vouches for the rest of the cache
+			return
+		end
+		files = existing.files
+	end
+
+	local content_hash = config.current.fingerprint.content_hash == true
+
+	for _, path in ipairs(sources) do
+		local stat = vim.uv.fs_stat(path)
+		if stat then
+			if M.__is_after(stat.mtime, started_at) then
+				M.discard(cache_name)
+				return
+			end
+
+			files[path] = {
+				mtime = { stat.mtime.sec, stat.mtime.nsec },
+				size = stat.size,
+				hash = content_hash and M.__hash_file(path, stat.size) or nil,
+			}
+		end
+	end
+
+	local fingerprint = {
+		python = require("django.utils").get_python_path(),
+		files = files,
+	}
+	vim.fn.writefile({ vim.json.encode(fingerprint) }, M.__get_path(cache_name))
+end
+
+--- Check if no source file changed since the cache was built
+--- @param cache_name string
+--- @return boolean
+function M.is_fresh(cache_name)
+	if not M.is_enabled() or not cache.exists(cache_name) then
+		return false
+	end
+
+	local fingerprint = M.read(cache_name)
+	if not fingerprint or vim.tbl_isempty(fingerprint.files) then
+		return false
+	end
+
+	if fingerprint.python ~= require("django.utils").get_python_path() then
+		return false
+	end
+
+	for path, entry in pairs(fingerprint.files) do
+		local stat = vim.uv.fs_stat(path)
+		if not stat or stat.size ~= entry.size then
+			return false
+		end
+
+		local mtime_changed = stat.mtime.sec ~= entry.mtime[1] or stat.mtime.nsec ~= entry.mtime[2]
+		if mtime_changed then
+			-- Saved without changes: same content under a new mtime
+			if type(entry.hash) ~= "string" or M.__hash_file(path, stat.size) ~= entry.hash then
+				return false
+			end
+		end
+	end
+
+	return true
+end
+
+return M
@@ -2,22 +2,31 @@ local M = {}
 
 local cache = require("django.fetcher.cache")
 local executor = require("django.fetcher.executor")
+local fingerprint = require("django.fetcher.fingerprint")
 local state = require("django.fetcher.state")
+local stream = require("django.fetcher.stream")
+
+-- Temp file that collects the combined script's own errors
+local COMBINED_LOG_NAME = "combined"
 
 --- Refresh data from script (async, must be called within async.run())
+--- Skipped when no source file changed since the last run, unless `opts.force` is set
 --- @param script_name string Script filename
 --- @param cache_name string Cache identifier
---- @param opts table|nil Options: { delay = number, silent = boolean }
---- @return table|nil data
+--- `opts.on_progress(data)` receives the data assembled so far while a full run streams its output
+--- @param opts table|nil Options: { delay = number, silent = boolean, force = boolean, args = string[], merge = function, on_progress = function }
+--- @return table|nil data nil on failure or when the cache is already up to date
 function M.refresh(script_name, cache_name, opts)
 	return M.__fetch(script_name, cache_name, opts)
 end
 
 --- Refresh data from script with callback
+--- `opts.args` are passed to the script; `opts.merge(cached, fetched)` combines a partial
+--- result with the existing cache before it is committed
 --- @param script_name string Script filename
 --- @param cache_name string Cache identifier
---- @param opts table|nil Options: { delay = number, silent = boolean }
---- @param callback function|nil Callback that receives data
+--- @param opts table|nil Options: { delay = number, silent = boolean, force = boolean, args = string[], merge = function, on_progress = function }
+--- @param callback function|nil Callback that receives data (nil when nothing was refreshed)
 function M.refresh_with_callback(script_name, cache_name, opts, callback)
 	local async = require("django.async")
 	async.run(function()
@@ -28,10 +37,77 @@ function M.refresh_with_callback(script_name, cache_name, opts, callback)
 	end)
 end
 
+--- Refresh several caches from a single script run (async, must be called within async.run())
+--- The script receives `--<flag> <temp path>` for each output and writes each cache separately
+--- @param script_name string Script filename
+--- @param outputs table<string, string> Script output flag → cache identifier
+--- @param opts table|nil Options: { silent = boolean }
+--- @return table<string, table> data Refreshed data by cache identifier
+function M.refresh_combined(script_name, outputs, opts)
+	opts = opts or {}
+	local silent = opts.silent or false
+
+	local flags = {}
+	for flag, cache_name in pairs(outputs) do
+		if state.is_fetching(cache_name) then
+			if not silent then
+				vim.notify("Django " .. cache_name .. " refresh already in progress", vim.log.levels.DEBUG)
+			end
+		else
+			table.insert(flags, flag)
+		end
+	end
+
+	if #flags == 0 then
+		return {}
+	end
+	table.sort(flags)
+
+	local args = {}
+	for _, flag in ipairs(flags) do
+		local cache_name = outputs[flag]
+		state.cancel_pending_timer(cache_name)
+		state.set_fetching(cache_name, true)
+		cache.discard(cache_name)
+		vim.list_extend(args, { "--" .. flag, cache.__get_temp_path(cache_name) })
+	end
+
+	if not silent then
+		vim.notify("Fetching Django data...", vim.log.levels.INFO)
+	end
+
+	local started_at = fingerprint.now()
+	local result = executor.run(script_name, COMBINED_LOG_NAME, args)
+
+	local refreshed = {}
+	for _, flag in ipairs(flags) do
+		local cache_name = outputs[flag]
+		state.set_fetching(cache_name, false)
+
+		if cache.has_temp(cache_name) then
+			local result_obj = executor.parse_result(cache_name, result.elapsed_ms)
+			if result_obj.success then
+				refreshed[cache_name] = result_obj.data
+			end
+			M.__finish(cache_name, result_obj, silent, started_at)
+		end
+	end
+
+	if result.code ~= 0 then
+		local error_obj = executor.parse_error(COMBINED_LOG_NAME)
+		if not silent then
+			vim.notify(error_obj.message, error_obj.level)
+		end
+	end
+	cache.discard(COMBINED_LOG_NAME)
+
+	return refreshed
+end
+
 --- Get cached data or fetch from script (async, must be called within async.run())
 --- @param script_name string Script filename
 --- @param cache_name string Cache identifier
---- @param opts table|nil Options: { delay = number, silent = boolean }
+--- @param opts table|nil Options: { delay = number, silent = boolean, on_progress = function }
 --- @return table|nil data
 function M.get_or_fetch(script_name, cache_name, opts)
 	local data = M.get_cached_data(cache_name)
@@ -40,7 +116,28 @@ function M.get_or_fetch(script_name, cache_name, opts)
 		return data
 	end
 
-	return M.__fetch(script_name, cache_name, opts)
+	return M.__fetch(script_name, cache_name, vim.tbl_extend("force", opts or {}, { force = true }))
+end
+
+--- Check if a cache file exists without reading it
+--- @param cache_name string Cache identifier
+--- @return boolean
+function M.has_cached_data(cache_name)
+	return cache.exists(cache_name)
+end
+
+--- Get the phase timings of the last script runs for a cache, oldest first
+--- @param cache_name string Cache identifier
+--- @return table[] timings { time, elapsed_ms, total_ms, peak_rss_kb, phases: { name, ms, count, peak_rss_kb }[] }
+function M.get_timings(cache_name)
+	return executor.get_timings(cache_name)
+end
+
+--- Check if a cache is currently being fetched
+--- @param cache_name string Cache identifier
+--- @return boolean
+function M.is_fetching(cache_name)
+	return state.is_fetching(cache_name)
 end
 
 --- Get cached data (synchronous)
@@ -78,28 +175,74 @@ function M.__fetch(script_name, cache_name, opts)
 		return cache.read(cache_name)
 	end
 
+	-- Skip the run when none of the files the cache was built from changed
+	if not opts.force and fingerprint.is_fresh(cache_name) then
+		if not silent then
+			vim.notify("Django " .. cache_name .. " is up to date", vim.log.levels.INFO)
+		end
+		return nil
+	end
+
 	state.set_fetching(cache_name, true)
 
 	if not silent then
 		vim.notify("Fetching Django " .. cache_name .. "...", vim.log.levels.INFO)
 	end
 
+	-- Follow streamed records so callers can use a full run's data before it finishes
+	local args = opts.args
+	local assembler, tail
+	if opts.on_progress and not opts.merge and stream.is_enabled() then
+		assembler = stream.new_assembler()
+		cache.discard(cache_name)
+		tail = stream.tail(cache.__get_temp_path(cache_name), assembler, opts.on_progress)
+		args = vim.list_extend({ "--stream" }, opts.args or {})
+	end
+
 	-- Execute script
-	local result = executor.run(script_name, cache_name)
+	local started_at = fingerprint.now()
+	local result = executor.run(script_name, cache_name, args)
 
-	state.set_fetching(cache_name, false)
+	if tail then
+		tail.stop()
+	end
 
 	-- Process result
 	local result_obj
 	if result.code ~= 0 then
 		result_obj = executor.parse_error(cache_name)
 	else
-		result_obj = executor.parse_result(cache_name)
+		result_obj = executor.parse_result(cache_name, result.elapsed_ms, assembler)
+	end
+
+	-- Static results are always complete
+	local is_static = result_obj.meta and result_obj.meta.static
+	if result_obj.success and opts.merge and not is_static then
+		result_obj.data = opts.merge(cache.read(cache_name), result_obj.data)
+		cache.write_temp(cache_name, result_obj.data)
 	end
 
-	-- Handle success/failure
+	state.set_fetching(cache_name, false)
+
+	M.__finish(cache_name, result_obj, silent, started_at, opts.merge ~= nil)
+
+	return result_obj.data
+end
+
+--- Commit or discard a fetched temp file and report the result
+--- @param cache_name string Cache identifier
+--- @param result_obj table Parsed result
+--- @param silent boolean
+--- @param started_at number[] Time the script was started (see fingerprint.now)
+--- @param partial boolean|nil The result was merged into the existing cache
+function M.__finish(cache_name, result_obj, silent, started_at, partial)
 	if result_obj.success then
 		cache.commit(cache_name)
+
+		-- Data parsed from source files is not fingerprinted, so the next refresh retries Django
+		local meta = result_obj.meta or {}
+		local sources = not meta.static and meta.sources or nil
+		fingerprint.write(cache_name, sources, started_at, partial)
 		vim.api.nvim_exec_autocmds("User", {
 			pattern = "DjangoDataRefreshed",
 			data = { cache_name = cache_name },
@@ -111,8 +254,6 @@ function M.__fetch(script_name, cache_name, opts)
 	if not silent then
 		vim.notify(result_obj.message, result_obj.level)
 	end
-
-	return result_obj.data
 end
 
 return M
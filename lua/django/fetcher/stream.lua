@@ -0,0 +1,135 @@
+local M = {}
+
+local config = require("django.config")
+
+--- Check if streaming output is enabled
+--- @return boolean
+function M.is_enabled()
+	local stream_config = config.current.stream
+	return stream_config ~= nil and stream_config.enabled == true
+end
+
+--- Assembles the NDJSON records of a script run with --stream (see RecordStream in
+--- scripts/django_utils.py) into the data the script writes without it
+--- @class StreamAssembler
+--- @field data table|nil Data assembled so far, nil until the header record arrived
+--- @field meta table|nil Set by the last record of a complete run
+--- @field count number Items received
+local Assembler = {}
+Assembler.__index = Assembler
+
+--- @return StreamAssembler
+function M.new_assembler()
+	return setmetatable({ data = nil, meta = nil, count = 0, __buffer = "", __items = nil }, Assembler)
+end
+
+--- Add a chunk of output; complete lines are decoded, the rest is kept for the next chunk
+--- Lines that are not records (e.g. warnings printed by the project) are skipped
+--- @param chunk string
+--- @return number added Items added by this chunk
+function Assembler:feed(chunk)
+	local buffer = self.__buffer .. chunk
+	local count = self.count
+	local start = 1
+
+	while true do
+		local newline = buffer:find("\n", start, true)
+		if not newline then
+			break
+		end
+		self:__add_line(buffer:sub(start, newline - 1))
+		start = newline + 1
+	end
+
+	self.__buffer = buffer:sub(start)
+	return self.count - count
+end
+
+--- Decode the last line when the output did not end with a newline
+--- @return table|nil data, table|nil meta nil data when the output was not a stream
+function Assembler:finish()
+	if self.__buffer ~= "" then
+		self:__add_line(self.__buffer)
+		self.__buffer = ""
+	end
+	return self.data, self.meta
+end
+
+--- @param line string
+function Assembler:__add_line(line)
+	local ok, record = pcall(vim.json.decode, line)
+	if not ok or type(record) ~= "table" then
+		return
+	end
+
+	if record.stream then
+		self.data = record.data
+		self.__items = record.items ~= "" and self.data[record.items] or self.data
+	elseif record.meta then
+		self.meta = record.meta
+	elseif record.item ~= nil and self.data then
+		for table_name, entries in pairs(record.append or {}) do
+			vim.list_extend(self.data[table_name], entries)
+		end
+
+		if record.key then
+			self.__items[record.key] = record.item
+		else
+			table.insert(self.__items, record.item)
+		end
+		self.count = self.count + 1
+	end
+end
+
+--- Follow an output file while the script writes it
+--- `on_items(data)` is called (on the main loop) whenever new items were assembled
+--- @param path string
+--- @param assembler StreamAssembler
+--- @param on_items fun(data: table)
+--- @return table tail { stop: fun() } stop() reads what is left and stops polling
+function M.tail(path, assembler, on_items)
+	local offset = 0
+	local timer = vim.uv.new_timer()
+
+	local function poll()
+		local fd = vim.uv.fs_open(path, "r", 438)
+		if not fd then
+			return 0
+		end
+
+		local added = 0
+		while true do
+			local chunk = vim.uv.fs_read(fd, 65536, offset)
+			if not chunk or chunk == "" then
+				break
+			end
+			offset = offset + #chunk
+			added = added + assembler:feed(chunk)
+		end
+		vim.uv.fs_close(fd)
+
+		return added
+	end
+
+	timer:start(
+		0,
+		config.current.stream.poll_interval or 100,
+		vim.schedule_wrap(function()
+			if not timer:is_closing() and poll() > 0 then
+				on_items(assembler.data)
+			end
+		end)
+	)
+
+	return {
+		stop = function()
+			if not timer:is_closing() then
+				timer:stop()
+				timer:close()
+			end
+			poll()
+		end,
+	}
+end
+
+return M
@@ -0,0 +1,174 @@
+local M = {}
+
+local config = require("django.config")
+
+local WORKER_SCRIPT = "worker.py"
+
+local current = nil
+local next_id = 0
+
+--- Check if worker mode is enabled
+--- @return boolean
+function M.is_enabled()
+	local worker_config = config.current.worker
+	return worker_config ~= nil and worker_config.enabled == true
+end
+
+--- Run a script inside the warm worker (async, must be called within async.run())
+--- Returns nil when the worker is unavailable so the caller can fall back to a one-shot run
+--- @param script_name string Script filename
+--- @param output_path string File that receives the script output
+--- @param args string[]|nil Extra script arguments
+--- @return table|nil result { code: number }
+function M.run(script_name, output_path, args)
+	return M.__request({ script = script_name, output = output_path, args = args or {} }, true)
+end
+
+--- Stop the worker process if running
+function M.stop()
+	if current and current.handle then
+		pcall(current.handle.kill, current.handle, "sigterm")
+	end
+	current = nil
+end
+
+--- Send a request and wait for its response
+--- @param request table { script, output, args }
+--- @param allow_restart boolean Retry once in a fresh worker if this one asks for a restart
+--- @return table|nil result
+function M.__request(request, allow_restart)
+	local co = coroutine.running()
+	if not co then
+		error("worker.run must be called within a coroutine")
+	end
+
+	local worker = M.__ensure()
+	if not worker then
+		return nil
+	end
+
+	next_id = next_id + 1
+	local id = next_id
+	local payload = vim.json.encode(vim.tbl_extend("force", request, { id = id })) .. "\n"
+
+	worker.pending[id] = co
+	if not pcall(worker.handle.write, worker.handle, payload) then
+		worker.pending[id] = nil
+		M.stop()
+		return nil
+	end
+
+	local response = coroutine.yield()
+
+	if response and response.restart then
+		M.stop()
+		if allow_restart then
+			return M.__request(request, false)
+		end
+		return nil
+	end
+
+	if not response then
+		return nil
+	end
+
+	return { code = response.code }
+end
+
+--- Get the running worker for the current project, starting one if needed
+--- @return table|nil worker
+function M.__ensure()
+	local cwd = vim.fn.getcwd()
+	local python_path = require("django.utils").get_python_path()
+
+	if current and (current.cwd ~= cwd or current.python_path ~= python_path) then
+		M.stop()
+	end
+
+	if not current then
+		current = M.__start(cwd, python_path)
+	end
+
+	return current
+end
+
+--- Spawn the worker process
+--- @param cwd string
+--- @param python_path string
+--- @return table|nil worker
+function M.__start(cwd, python_path)
+	local executor = require("django.fetcher.executor")
+	local worker = {
+		cwd = cwd,
+		python_path = python_path,
+		pending = {},
+		buffer = "",
+	}
+
+	local ok, handle = pcall(vim.system, { python_path, executor.__get_script_path(WORKER_SCRIPT) }, {
+		cwd = cwd,
+		stdin = true,
+		text = true,
+		stdout = function(_, data)
+			if data then
+				vim.schedule(function()
+					M.__on_stdout(worker, data)
+				end)
+			end
+		end,
+	}, function()
+		vim.schedule(function()
+			M.__on_exit(worker)
+		end)
+	end)
+
+	if not ok then
+		return nil
+	end
+
+	worker.handle = handle
+	return worker
+end
+
+--- Handle a chunk of protocol output
+--- @param worker table
+--- @param data string
+function M.__on_stdout(worker, data)
+	worker.buffer = worker.buffer .. data
+
+	while true do
+		local newline = worker.buffer:find("\n", 1, true)
+		if not newline then
+			break
+		end
+
+		local line = worker.buffer:sub(1, newline - 1)
+		worker.buffer = worker.buffer:sub(newline + 1)
+
+		local ok, response = pcall(vim.json.decode, line)
+		if ok and type(response) == "table" and response.id then
+			local co = worker.pending[response.id]
+			worker.pending[response.id] = nil
+			if co then
+				coroutine.resume(co, response)
+			end
+		end
+	end
+end
+
+--- Fail all pending requests when the worker exits
+--- @param worker table
+function M.__on_exit(worker)
+	if current == worker then
+		current = nil
+	end
+
+	local pending = worker.pending
+	worker.pending = {}
+
+	for _, co in pairs(pending) do
+		coroutine.resume(co, nil)
+	end
+end
+
+return M
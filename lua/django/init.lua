@@ -2,6 +2,14 @@ local M = {}
 
 local config = require("django.config")
 
+-- One Python run fills all three caches (flag → cache name)
+local COMBINED_SCRIPT_NAME = "get_all_data.py"
+local COMBINED_OUTPUTS = {
+	views = "DjangoViews",
+	models = "DjangoModels",
+	completions = "completions",
+}
+
 function M.setup(opts)
 	config.setup(opts)
 
@@ -14,9 +22,57 @@ function M.setup(opts)
 end
 
 function M.refresh_all()
-	require("django.pickers.views").refresh()
-	require("django.pickers.models").refresh()
-	require("django.completions").refresh()
+	local async = require("django.async")
+	local fetcher = require("django.fetcher")
+
+	async.run(function()
+		local data = fetcher.refresh_combined(COMBINED_SCRIPT_NAME, COMBINED_OUTPUTS)
+		if data.completions then
+			require("django.completions.core.model_data").set_instance(data.completions)
+		end
+	end)
+end
+
+--- Show where the last script runs spent their time
+--- "startup" is the part of the run outside the script's phases (interpreter start, imports, I/O)
+function M.show_timings()
+	local executor = require("django.fetcher.executor")
+
+	local cache_names = vim.tbl_keys(executor.__timings)
+	table.sort(cache_names)
+
+	local lines = {}
+	for _, cache_name in ipairs(cache_names) do
+		table.insert(lines, "Django " .. cache_name .. ":")
+
+		for _, run in ipairs(executor.get_timings(cache_name)) do
+			local header = string.format("  %s  %.1f ms", os.date("%H:%M:%S", run.time), run.elapsed_ms or run.total_ms)
+			if run.peak_rss_kb then
+				header = header .. string.format(", peak RSS %.1f MiB", run.peak_rss_kb / 1024)
+			end
+			table.insert(lines, header)
+
+			local phases = {}
+			if run.elapsed_ms then
+				table.insert(phases, string.format("startup %.1f ms", math.max(run.elapsed_ms - run.total_ms, 0)))
+			end
+			for _, phase in ipairs(run.phases) do
+				local text = string.format("%s %.1f ms", phase.name, phase.ms)
+				if phase.count > 1 then
+					text = text .. string.format(" (%dx)", phase.count)
+				end
+				table.insert(phases, text)
+			end
+			table.insert(lines, "    " .. table.concat(phases, ", "))
+		end
+	end
+
+	if #lines == 0 then
+		vim.notify("No Django script timings recorded yet", vim.log.levels.INFO)
+		return
+	end
+
+	vim.notify(table.concat(lines, "\n"), vim.log.levels.INFO)
 end
 
 function M.clear_all_cache()
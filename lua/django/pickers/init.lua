@@ -3,6 +3,9 @@ local fetcher = require("django.fetcher")
 
 local active_pickers = {}
 
+-- Data of a first refresh that is still streaming, by cache name
+local streaming_data = {}
+
 local function find_item_index_by_key(list, item_key)
 	if not item_key or not list or not list.count or not list.get then
 		return nil
@@ -65,12 +68,13 @@ function M.create_picker(config)
 	local get_on_picker_open = config.on_picker_open
 	local get_transform = config.transform
 	local get_filter = config.filter
+	local on_items = config.on_items
 
 	local function show_picker()
 		local picker_instance = require("snacks").picker.pick({
 			prompt = prompt,
 			finder = function()
-				local items = fetcher.get_cached_data(cache_name)
+				local items = streaming_data[cache_name] or fetcher.get_cached_data(cache_name)
 				for _, item in ipairs(items) do
 					item.text = prepare_text(item)
 					if get_item_key then
@@ -80,6 +84,9 @@ function M.create_picker(config)
 						end
 					end
 				end
+				if on_items then
+					on_items(items)
+				end
 				return items
 			end,
 			preview = "file",
@@ -88,7 +95,7 @@ function M.create_picker(config)
 			filter = get_filter,
 			actions = {
 				refresh_data = function()
-					fetcher.refresh_with_callback(script_name, cache_name, nil)
+					fetcher.refresh_with_callback(script_name, cache_name, { force = true })
 				end,
 			},
 			win = {
@@ -127,9 +134,21 @@ function M.create_picker(config)
 		-- Check if cache exists
 		local cached_data = fetcher.get_cached_data(cache_name)
 		if not cached_data or vim.tbl_isempty(cached_data) then
-			-- No cache, refresh first then show picker
-			fetcher.refresh_with_callback(script_name, cache_name, nil, function(data)
-				if data and not vim.tbl_isempty(data) then
+			-- No cache: show the picker with the first streamed items, or once the refresh is done
+			local shown = false
+			local function on_progress(data)
+				streaming_data[cache_name] = data
+				if not shown then
+					shown = true
+					show_picker()
+				else
+					refresh_picker(active_pickers[cache_name])
+				end
+			end
+
+			fetcher.refresh_with_callback(script_name, cache_name, { on_progress = on_progress }, function(data)
+				streaming_data[cache_name] = nil
+				if data and not vim.tbl_isempty(data) and not shown then
 					show_picker()
 				end
 			end)
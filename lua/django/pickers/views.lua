@@ -192,9 +192,8 @@ function M.__static_path(pattern)
 	return "/" .. table.concat(segments, "/") .. "/"
 end
 
-function M.__matches_pattern(pattern, query)
+function M.__matches_pattern(pattern, query_segments)
 	local pattern_segments = M.__split_segments(pattern)
-	local query_segments = M.__split_segments(query)
 
 	if #pattern_segments ~= #query_segments then
 		return false
@@ -214,14 +213,70 @@ function M.__matches_pattern(pattern, query)
 	return true
 end
 
-function M.__matches_concrete_path(pattern, query)
-	local normalized_query = M.__normalize_query_path(query)
-	if not normalized_query then
-		return false
+--- Normalized pattern, precomputed by get_views.py (computed for caches written without it)
+function M.__endpoint_normalized(endpoint)
+	return endpoint.normalized or M.__normalize_pattern(endpoint.pattern)
+end
+
+--- Canonical pattern variants, precomputed by get_views.py (computed for caches written without it)
+function M.__endpoint_variants(endpoint)
+	return endpoint.variants or M.__pattern_variants(endpoint.pattern)
+end
+
+--- Build a segment trie over the pattern variants of all endpoints
+--- Static segments are keyed by name, dynamic ones share a single wildcard child
+function M.__build_route_trie(items)
+	local root = { children = {} }
+
+	for _, item in ipairs(items) do
+		for _, variant in ipairs(M.__endpoint_variants(item)) do
+			local node = root
+			for _, segment in ipairs(M.__split_segments(variant)) do
+				if M.__is_dynamic_segment(segment) then
+					node.wildcard = node.wildcard or { children = {} }
+					node = node.wildcard
+				else
+					node.children[segment] = node.children[segment] or { children = {} }
+					node = node.children[segment]
+				end
+			end
+			node.variants = node.variants or {}
+			node.variants[variant] = true
+		end
+	end
+
+	return root
+end
+
+--- Collect the variants in the trie that match a concrete path
+function M.__match_route_trie(root, query_segments)
+	local matched = {}
+
+	local function visit(node, index)
+		if index > #query_segments then
+			for variant in pairs(node.variants or {}) do
+				matched[variant] = true
+			end
+			return
+		end
+
+		local segment = query_segments[index]
+		local child = node.children[segment]
+		if child then
+			visit(child, index + 1)
+		end
+		if node.wildcard and segment ~= "" then
+			visit(node.wildcard, index + 1)
+		end
 	end
 
-	for _, candidate in ipairs(M.__pattern_variants(pattern)) do
-		if M.__matches_pattern(candidate, normalized_query) then
+	visit(root, 1)
+	return matched
+end
+
+function M.__matches_concrete_path(variants, query_segments)
+	for _, candidate in ipairs(variants) do
+		if M.__matches_pattern(candidate, query_segments) then
 			return true
 		end
 	end
@@ -229,13 +284,54 @@ function M.__matches_concrete_path(pattern, query)
 	return false
 end
 
+-- Built from the items of the last finder run
+local route_trie = nil
+
+function M.__set_items(items)
+	for _, item in ipairs(items) do
+		item.variants = M.__endpoint_variants(item)
+	end
+	route_trie = M.__build_route_trie(items)
+	M.__parse_query(nil)
+end
+
+-- The query is the same for every item of a filter pass
+local last_query, last_query_path, last_query_segments, last_query_matches
+
+--- Get the normalized path and segments of a query, or nil if it is not a path
+--- Also returns the variants matching it, when the route trie is built
+function M.__parse_query(query)
+	if query ~= last_query then
+		last_query = query
+		last_query_path = query and M.__normalize_query_path(query) or nil
+		last_query_segments = last_query_path and M.__split_segments(last_query_path) or nil
+		last_query_matches = route_trie and last_query_segments and M.__match_route_trie(route_trie, last_query_segments)
+			or nil
+	end
+	return last_query_path, last_query_segments, last_query_matches
+end
+
+--- Check if any variant of an endpoint matches the query
+function M.__matches_query(item, query_segments, matches)
+	if not matches then
+		return M.__matches_concrete_path(M.__endpoint_variants(item), query_segments)
+	end
+
+	for _, variant in ipairs(M.__endpoint_variants(item)) do
+		if matches[variant] then
+			return true
+		end
+	end
+	return false
+end
+
 function M.__build_search_text(endpoint)
 	local values = {}
 	local seen = {}
 	local view_display = endpoint.view_display or endpoint.view_name or endpoint.view or ""
 
 	M.__append_unique(values, seen, endpoint.pattern)
-	M.__append_unique(values, seen, M.__normalize_pattern(endpoint.pattern))
+	M.__append_unique(values, seen, M.__endpoint_normalized(endpoint))
 	M.__append_unique(values, seen, endpoint.name)
 	M.__append_unique(values, seen, endpoint.view_name)
 	M.__append_unique(values, seen, endpoint.view)
@@ -243,7 +339,7 @@ function M.__build_search_text(endpoint)
 	M.__append_unique(values, seen, endpoint.method)
 	M.__append_unique(values, seen, endpoint.action)
 
-	for _, candidate in ipairs(M.__pattern_variants(endpoint.pattern)) do
+	for _, candidate in ipairs(M.__endpoint_variants(endpoint)) do
 		M.__append_unique(values, seen, candidate)
 		M.__append_unique(values, seen, M.__static_path(candidate))
 	end
@@ -253,13 +349,17 @@ end
 
 function M.__transform_item(item, ctx)
 	local query = ctx and ctx.filter and ctx.filter.pattern or ""
-	if query == "" or not M.__matches_concrete_path(item.pattern, query) then
+	if query == "" then
+		return item
+	end
+
+	local normalized_query, query_segments, matches = M.__parse_query(query)
+	if not normalized_query or not M.__matches_query(item, query_segments, matches) then
 		return item
 	end
 
 	local values = {}
 	local seen = {}
-	local normalized_query = M.__normalize_query_path(query)
 
 	M.__append_unique(values, seen, query)
 	M.__append_unique(values, seen, normalized_query)
@@ -306,6 +406,9 @@ M.show = picker.create_picker({
 		local action = endpoint.action or endpoint.method or ""
 		return table.concat({ endpoint.pattern or "", endpoint.view or "", action, endpoint.name or "" }, "|")
 	end,
+	on_items = function(items)
+		M.__set_items(items)
+	end,
 	refresh_desc = "Refresh views",
 	on_picker_open = function()
 		return config.current.views.auto_refresh.on_picker_open
@@ -0,0 +1,102 @@
+local M = {}
+
+local SCRIPT_NAME = "resolve_url.py"
+-- Only the temp file is used, resolutions are not cached
+local CACHE_NAME = "resolve"
+
+--- Resolve a URL path with Django's resolver (see scripts/resolve_url.py)
+--- Must be called within async.run()
+--- @param path string URL path or full URL
+--- @param method string|nil HTTP method, selects the handler line (default: get)
+--- @return table|nil match, string|nil error
+function M.resolve(path, method)
+	local cache = require("django.fetcher.cache")
+	local executor = require("django.fetcher.executor")
+
+	local args = { path }
+	if method then
+		vim.list_extend(args, { "--method", method:lower() })
+	end
+
+	local result = executor.run(SCRIPT_NAME, CACHE_NAME, args)
+	local lines = cache.read_temp_lines(CACHE_NAME)
+	cache.discard(CACHE_NAME)
+
+	if result.code ~= 0 then
+		return nil, M.__error_message(lines)
+	end
+
+	local ok, decoded = pcall(vim.json.decode, table.concat(lines, "\n"))
+	local data = ok and cache.unwrap(decoded) or nil
+	if type(data) ~= "table" or not data.view then
+		return nil, "Failed to parse Django URL resolution"
+	end
+
+	return data, nil
+end
+
+--- Get the error a script reported, falling back to its whole output
+--- @param lines string[]
+--- @return string
+function M.__error_message(lines)
+	for i = #lines, 1, -1 do
+		local ok, decoded = pcall(vim.json.decode, lines[i])
+		if ok and type(decoded) == "table" and decoded.error then
+			return decoded.error
+		end
+	end
+	return table.concat(lines, "\n")
+end
+
+--- Format the captured arguments of a match
+--- @param match table
+--- @return string
+function M.__format_arguments(match)
+	local parts = {}
+	for _, value in ipairs(match.args or {}) do
+		table.insert(parts, tostring(value))
+	end
+
+	local names = vim.tbl_keys(match.kwargs or {})
+	table.sort(names)
+	for _, name in ipairs(names) do
+		table.insert(parts, name .. "=" .. tostring(match.kwargs[name]))
+	end
+
+	return table.concat(parts, ", ")
+end
+
+--- Resolve a path and jump to the view handling it
+--- @param path string
+--- @param method string|nil
+function M.jump(path, method)
+	local async = require("django.async")
+
+	async.run(function()
+		local match, err = M.resolve(path, method)
+		if not match then
+			vim.notify("Django resolve " .. path .. ": " .. err, vim.log.levels.ERROR)
+			return
+		end
+
+		local message = string.format("%s → %s", match.path, match.view)
+		if type(match.method) == "string" then
+			message = message .. "." .. match.method:upper()
+		end
+		local arguments = M.__format_arguments(match)
+		if arguments ~= "" then
+			message = message .. "(" .. arguments .. ")"
+		end
+		if type(match.view_name) == "string" and match.view_name ~= "" then
+			message = message .. " [" .. match.view_name .. "]"
+		end
+		vim.notify(message, vim.log.levels.INFO)
+
+		if type(match.file) == "string" and vim.fn.filereadable(match.file) == 1 then
+			vim.cmd.edit(vim.fn.fnameescape(match.file))
+			pcall(vim.api.nvim_win_set_cursor, 0, { math.max(tonumber(match.line) or 1, 1), 0 })
+		end
+	end)
+end
+
+return M
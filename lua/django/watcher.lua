@@ -6,7 +6,7 @@ local registry = {}
 
 --- @param feature_name string
 --- @param patterns string[]
---- @param callback function
+--- @param callback function Receives the absolute path of the saved file
 function M.register(feature_name, patterns, callback)
 	registry[feature_name] = {
 		patterns = patterns,
@@ -21,11 +21,11 @@ function M.setup()
 		vim.api.nvim_create_autocmd("BufWritePost", {
 			group = augroup,
 			pattern = feature.patterns,
-			callback = function()
+			callback = function(args)
 				if not utils.is_django_project() then
 					return
 				end
-				feature.callback()
+				feature.callback(vim.api.nvim_buf_get_name(args.buf))
 			end,
 		})
 	end
@@ -8,7 +8,7 @@ vim.api.nvim_create_user_command("DjangoViews", function()
 end, {})
 
 vim.api.nvim_create_user_command("DjangoViewsRefresh", function()
-	require("django.pickers.views").refresh()
+	require("django.pickers.views").refresh({ force = true })
 end, {})
 
 vim.api.nvim_create_user_command("DjangoModels", function()
@@ -16,11 +16,11 @@ vim.api.nvim_create_user_command("DjangoModels", function()
 end, {})
 
 vim.api.nvim_create_user_command("DjangoModelsRefresh", function()
-	require("django.pickers.models").refresh()
+	require("django.pickers.models").refresh({ force = true })
 end, {})
 
 vim.api.nvim_create_user_command("DjangoCompletionsRefresh", function()
-	require("django.completions").refresh()
+	require("django.completions").refresh({ force = true })
 end, {})
 
 vim.api.nvim_create_user_command("DjangoRefreshAll", function()
@@ -31,6 +31,14 @@ vim.api.nvim_create_user_command("DjangoClearAllCache", function()
 	require("django").clear_all_cache()
 end, {})
 
+vim.api.nvim_create_user_command("DjangoResolve", function(opts)
+	require("django.resolve").jump(opts.fargs[1], opts.fargs[2])
+end, { nargs = "+" })
+
+vim.api.nvim_create_user_command("DjangoTimings", function()
+	require("django").show_timings()
+end, {})
+
 vim.api.nvim_create_user_command("DjangoShell", function()
 	require("django.shell").toggle()
 end, {})
@@ -1,7 +1,85 @@
+import ast
+import contextlib
+import glob
 import inspect
+import json
 import os
 import re
 import sys
+import time
+import tokenize
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def get_peak_rss_kb():
+    """Return the peak resident set size of this process in KiB, or None."""
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class PhaseTimer:
+    """Record monotonic wall time and peak RSS per extraction phase.
+
+    Time spent in a nested phase is not counted in its parent, so the phases
+    add up to the total. A phase entered repeatedly (e.g. once per model)
+    accumulates. Peak RSS is the process high-water mark when the phase ended.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.__stack = []
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        entry = self.phases.setdefault(
+            name, {"ms": 0.0, "count": 0, "peak_rss_kb": None}
+        )
+        start = time.perf_counter()
+        self.__stack.append(0.0)
+        try:
+            yield
+        finally:
+            nested = self.__stack.pop()
+            elapsed = time.perf_counter() - start
+            if self.__stack:
+                self.__stack[-1] += elapsed
+
+            entry["ms"] += (elapsed - nested) * 1000
+            entry["count"] += 1
+            entry["peak_rss_kb"] = get_peak_rss_kb()
+
+    def as_dict(self):
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "peak_rss_kb": get_peak_rss_kb(),
+            "phases": [
+                {
+                    "name": name,
+                    "ms": round(entry["ms"], 3),
+                    "count": entry["count"],
+                    "peak_rss_kb": entry["peak_rss_kb"],
+                }
+                for name, entry in self.phases.items()
+            ],
+        }
+
+
+# Shared by the scripts of one run; main() resets it (the worker reuses modules)
+timer = PhaseTimer()
 
 
 def find_settings_module() -> str:
@@ -21,6 +99,11 @@ def find_settings_module() -> str:
 
 def setup_django():
     import django  # pyright: ignore[reportMissingImports]
+    from django.apps import apps  # pyright: ignore[reportMissingImports]
+
+    # Already configured in this process (e.g. when running inside worker.py)
+    if apps.ready:
+        return
 
     manage_py_dir = os.getcwd()
     sys.path.insert(0, manage_py_dir)
@@ -33,10 +116,231 @@ def setup_django():
     django.setup()
 
 
+# Parsed source files of the current run: path -> {qualname: entry}, see get_source_index()
+_source_indexes = {}
+
+
+def clear_source_indexes():
+    """Forget parsed source files so a new run sees edited files."""
+    _source_indexes.clear()
+
+
+def get_decorator_name(node):
+    """Return the dotted name of a decorator, e.g. "action" or "decorators.action"."""
+    if isinstance(node, ast.Call):
+        node = node.func
+
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+
+    return ".".join(reversed(parts))
+
+
+def get_source_index(file_path):
+    """Parse a source file once and index its classes and functions by qualified name.
+
+    Every entry holds the line inspect reports for the object (the first
+    decorator line). Class entries also hold their methods in source order:
+    {name: {"line": def line, "decorators"}}. Unreadable files give an empty index.
+    """
+    if file_path in _source_indexes:
+        return _source_indexes[file_path]
+
+    index = {}
+
+    def first_line(node):
+        return min([node.lineno] + [d.lineno for d in node.decorator_list])
+
+    def visit(nodes, prefix):
+        for node in nodes:
+            if isinstance(node, ast.ClassDef):
+                qualname = prefix + node.name
+                methods = {}
+                for item in node.body:
+                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        methods[item.name] = {
+                            "line": item.lineno,
+                            "decorators": [
+                                get_decorator_name(d) for d in item.decorator_list
+                            ],
+                        }
+
+                index.setdefault(qualname, {"line": first_line(node), "methods": methods})
+                visit(node.body, qualname + ".")
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                qualname = prefix + node.name
+                index.setdefault(qualname, {"line": first_line(node)})
+                visit(node.body, qualname + ".<locals>.")
+            elif not isinstance(node, ast.expr):
+                # Definitions under if/try/with blocks
+                visit(ast.iter_child_nodes(node), prefix)
+
+    try:
+        with timer.phase("inspect"):
+            with tokenize.open(file_path) as f:
+                tree = ast.parse(f.read(), filename=file_path)
+            visit(tree.body, "")
+    except (OSError, SyntaxError, ValueError):
+        pass
+
+    _source_indexes[file_path] = index
+    return index
+
+
 def get_source_location(obj):
+    """Return (file, line) of a class or function, or (None, 0) without source.
+
+    Functions carry their first line; classes are looked up in the file's
+    source index. Objects it cannot place (e.g. created with type()) fall back
+    to inspect, which parses the file again.
+    """
     try:
         file_path = inspect.getfile(obj)
-        line_number = inspect.getsourcelines(obj)[1]
+    except TypeError:
+        return None, 0
+
+    code = getattr(getattr(obj, "__func__", obj), "__code__", None)
+    if code is not None and os.path.isfile(file_path):
+        return file_path, code.co_firstlineno
+
+    info = get_source_index(file_path).get(getattr(obj, "__qualname__", None))
+    if info:
+        return file_path, info["line"]
+
+    try:
+        with timer.phase("inspect"):
+            line_number = inspect.getsourcelines(obj)[1]
         return file_path, line_number
     except (TypeError, OSError):
         return None, 0
+
+
+def get_module_file(module_name):
+    module = sys.modules.get(module_name)
+    path = getattr(module, "__file__", None)
+    return os.path.abspath(path) if path else None
+
+
+def get_urlconf_modules():
+    """Return loaded URLconf modules, parents before their includes."""
+    from django.urls import get_resolver  # pyright: ignore[reportMissingImports]
+    from django.urls.resolvers import (  # pyright: ignore[reportMissingImports]
+        URLResolver,  # pyright: ignore[reportUnknownVariableType]
+    )
+
+    modules = []
+
+    def visit(resolver):
+        module = resolver.urlconf_module
+        if hasattr(module, "__name__") and module not in modules:
+            modules.append(module)
+
+        for pattern in resolver.url_patterns:
+            if isinstance(pattern, URLResolver):
+                visit(pattern)
+
+    visit(get_resolver())
+    return modules
+
+
+def get_model_sources(models):
+    return {get_module_file(model.__module__) for model in models}
+
+
+def get_settings_sources():
+    """Return manage.py and the settings module files (including split settings)."""
+    sources = set()
+    if os.path.exists("manage.py"):
+        sources.add(os.path.abspath("manage.py"))
+
+    try:
+        from django.conf import settings  # pyright: ignore[reportMissingImports]
+
+        settings_module = settings.SETTINGS_MODULE
+    except Exception:
+        # Django is missing or the settings cannot be loaded (static extraction)
+        return sources
+
+    package = settings_module.rpartition(".")[0]
+    for name in list(sys.modules):
+        if name == settings_module or (
+            package.endswith("settings") and name.startswith(package + ".")
+        ):
+            sources.add(get_module_file(name))
+
+    return sources
+
+
+def build_output(data, sources, **meta):
+    """Wrap script data with the source files it was built from.
+
+    The editor fingerprints these files and skips the next run when none of
+    them changed. The plugin scripts are included so updating the plugin
+    invalidates old caches. Extra keyword arguments are added to "meta".
+    """
+    sources = set(sources) | get_settings_sources()
+    sources.update(glob.glob(os.path.join(script_dir, "*.py")))
+    sources.discard(None)
+
+    return {"data": data, "meta": {**meta, "sources": sorted(sources)}}
+
+
+def build_static_output(data, sources, setup_error=None):
+    """Wrap data extracted without django.setup() (see static_models.py)."""
+    meta = {"static": True}
+    if setup_error is not None:
+        meta["setup_error"] = f"{type(setup_error).__name__}: {setup_error}"
+    return build_output(data, sources, **meta)
+
+
+def dumps_output(output, **json_kwargs):
+    """Encode a build_output() result with the run's timings added to "meta".
+
+    The data is encoded first so that JSON encoding shows up in the timings.
+    """
+    with timer.phase("encode"):
+        data = json.dumps(output["data"], **json_kwargs)
+
+    meta = dict(output["meta"], timings=timer.as_dict())
+    return '{"data": %s, "meta": %s}' % (data, json.dumps(meta, **json_kwargs))
+
+
+class RecordStream:
+    """Write script output as NDJSON records while it is produced (--stream).
+
+        {"stream": 1, "data": {...}, "items": "models"}    header: data without items
+        {"item": ..., "key": "Post", "append": {...}}       one per model or endpoint
+        {"meta": {...}}                                     last line
+
+    "items" names the table of data the items go into ("" for data itself, a
+    list); "key" is set when that table is keyed by name. "append" extends
+    tables of data before the item is added. Every record is flushed so a
+    reader tailing the output sees it right away.
+    """
+
+    def __init__(self, data, items="", **json_kwargs):
+        self.json_kwargs = dict(json_kwargs, separators=(",", ":"))
+        self.sources = set()
+        self.__write({"stream": 1, "data": data, "items": items})
+
+    def __write(self, record):
+        with timer.phase("encode"):
+            sys.stdout.write(json.dumps(record, **self.json_kwargs) + "\n")
+            sys.stdout.flush()
+
+    def item(self, value, key=None, append=None):
+        record = {"item": value}
+        if key is not None:
+            record["key"] = key
+        if append:
+            record["append"] = append
+        self.__write(record)
+
+    def close(self, **meta):
+        """Write the meta record, with the sources collected in self.sources."""
+        output = build_output(None, self.sources, **meta)
+        self.__write({"meta": dict(output["meta"], timings=timer.as_dict())})
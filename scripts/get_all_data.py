@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Extract views, models and completion data from a single Django setup.
+
+Each requested result is written to its own file:
+
+    get_all_data.py --views PATH --models PATH --completions PATH
+
+A part that fails is reported on stderr and its file is not written, so the
+other parts can still be used. When django.setup() fails, models and
+completions are parsed from the source files instead (see static_models.py).
+"""
+
+import argparse
+import json
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, script_dir)
+
+from django_utils import (  # noqa: E402
+    build_output,
+    build_static_output,
+    clear_source_indexes,
+    dumps_output,
+    get_model_sources,
+    setup_django,
+    timer,
+)
+from get_completion_data import (  # noqa: E402
+    DjangoJSONEncoder,
+    build_completion_data,
+    clear_field_caches,
+    get_model_completion_data,
+)
+from get_models import get_model_info, model_sort_key  # noqa: E402
+from get_views import get_view_sources, get_views  # noqa: E402
+from static_models import StaticModelIndex  # noqa: E402
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--views", help="output path for views data")
+    parser.add_argument("--models", help="output path for models data")
+    parser.add_argument("--completions", help="output path for completion data")
+    return parser.parse_args(argv)
+
+
+def collect_models(want_models, want_completions):
+    """Walk the app registry once for both the models list and completion data."""
+    from django.apps import apps  # pyright: ignore[reportMissingImports]
+
+    clear_field_caches()
+    clear_source_indexes()
+    models = []
+    completion_models = {}
+
+    for model in apps.get_models():
+        if want_models:
+            model_info = get_model_info(model)
+            if model_info:
+                models.append(model_info)
+
+        if want_completions:
+            completion_models[model._meta.label] = get_model_completion_data(model)
+
+    models.sort(key=model_sort_key)
+    with timer.phase("intern"):
+        return models, build_completion_data(completion_models)
+
+
+def report_error(part, e):
+    error_data = {"part": part, "error": str(e), "type": type(e).__name__}
+    print(json.dumps(error_data), file=sys.stderr)
+
+
+def write_output(path, output, compact=False):
+    """Write a build_output() result; each file carries the timings of the run so far."""
+    if compact:
+        content = dumps_output(output, separators=(",", ":"), cls=DjangoJSONEncoder)
+    else:
+        content = dumps_output(output, indent=2, cls=DjangoJSONEncoder)
+
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def write_static_outputs(args, setup_error):
+    """Write models and completions parsed from source files; views need Django."""
+    if not (args.models or args.completions):
+        return
+
+    try:
+        with timer.phase("static"):
+            index = StaticModelIndex(os.getcwd())
+            models = index.get_models() if args.models else None
+            completion_models = index.get_completion_models() if args.completions else None
+        if args.models:
+            write_output(
+                args.models,
+                build_static_output(models, index.sources, setup_error),
+            )
+        if args.completions:
+            with timer.phase("intern"):
+                completion_data = build_completion_data(completion_models)
+            write_output(
+                args.completions,
+                build_static_output(completion_data, index.sources, setup_error),
+                compact=True,
+            )
+    except Exception as e:
+        report_error("static", e)
+
+
+def main():
+    timer.reset()
+    args = parse_args()
+
+    try:
+        with timer.phase("setup"):
+            setup_django()
+    except Exception as e:
+        write_static_outputs(args, e)
+        report_error("setup", e)
+        sys.exit(1)
+
+    failed = False
+
+    if args.models or args.completions:
+        try:
+            from django.apps import apps  # pyright: ignore[reportMissingImports]
+
+            with timer.phase("models"):
+                models, completion_data = collect_models(
+                    bool(args.models), bool(args.completions)
+                )
+                sources = get_model_sources(apps.get_models())
+            if args.models:
+                write_output(args.models, build_output(models, sources))
+            if args.completions:
+                write_output(
+                    args.completions,
+                    build_output(completion_data, sources),
+                    compact=True,
+                )
+        except Exception as e:
+            report_error("models", e)
+            failed = True
+
+    if args.views:
+        try:
+            with timer.phase("views"):
+                endpoints = get_views()
+            write_output(args.views, build_output(endpoints, get_view_sources(endpoints)))
+        except Exception as e:
+            report_error("views", e)
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
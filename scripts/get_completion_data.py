@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
-"""Extract Django model fields, relations, and lookup data for completions."""
+"""Extract Django model fields and relations for completions."""
 
+import argparse
 import json
 import os
 import sys
@@ -8,218 +9,79 @@ import sys
 script_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, script_dir)
 
-from django_utils import setup_django  # noqa: E402
+from django_utils import (  # noqa: E402
+    RecordStream,
+    build_output,
+    build_static_output,
+    dumps_output,
+    get_model_sources,
+    get_module_file,
+    setup_django,
+    timer,
+)
+from static_models import StaticModelIndex  # noqa: E402
 
 # =============================================================================
-# Lookup data
+# Cache schema
 # =============================================================================
 
-_BASE_LOOKUPS = ["exact", "isnull", "in"]
+# The schema interns repeated strings and stores each field as a row of ids:
+#
+#   {
+#     "version": 4,
+#     "strings": [...],              # 1-based ids, 0 = absent
+#     "types": [...],                # field type names
+#     "type_lookups": [...],         # lookup set id of each type (0 = unknown)
+#     "lookup_sets": [[...], ...],   # lookup names registered on a field class
+#     "choices": [{class, type, values}, ...],
+#     "models": {"blog.Post": [app_label, module, {"title": row, ...}], ...}
+#   }
+#
+# Models are keyed by their label ("app_label.Model") so that models with the
+# same name in different apps are kept apart.
+#
+# Lookup descriptions ship with the plugin (lua/django/completions/core/lookups.lua),
+# which also has the lookups of known types for data without lookup sets.
+SCHEMA_VERSION = 4
+
+# Field row layout, trailing absent values are dropped
+_ROW_KEYS = [
+    ("type", "types"),
+    ("definition", "strings"),
+    ("flags", None),
+    ("max_length", None),
+    ("choices", "choices"),
+    ("related_model", "strings"),
+    ("related_app", "strings"),
+    ("related_query_name", "strings"),
+    ("related_field", "strings"),
+    ("reverse_name", "strings"),
+]
 
-_NUMERIC_LOOKUPS = ["gt", "gte", "lt", "lte", "range"]
+_FIELD_FLAGS = {"null": 1, "blank": 2, "traversable": 4}
 
-_STRING_LOOKUPS = [
-    "iexact",
-    "contains",
-    "icontains",
-    "startswith",
-    "istartswith",
-    "endswith",
-    "iendswith",
-    "regex",
-    "iregex",
-]
+# Offered first, in this order, when a field class has them
+_LEADING_LOOKUPS = ["exact", "isnull", "in"]
 
-_DATE_LOOKUPS = [
-    "year",
-    "month",
-    "day",
-    "week",
-    "week_day",
-    "quarter",
-    "iso_year",
-    "iso_week_day",
-]
 
-_TIME_LOOKUPS = ["hour", "minute", "second"]
-
-_DATETIME_LOOKUPS = _DATE_LOOKUPS + _TIME_LOOKUPS
-
-_LOOKUP_BY_TYPE = {
-    # Numeric fields
-    "AutoField": _NUMERIC_LOOKUPS,
-    "BigAutoField": _NUMERIC_LOOKUPS,
-    "SmallAutoField": _NUMERIC_LOOKUPS,
-    "IntegerField": _NUMERIC_LOOKUPS,
-    "BigIntegerField": _NUMERIC_LOOKUPS,
-    "SmallIntegerField": _NUMERIC_LOOKUPS,
-    "PositiveIntegerField": _NUMERIC_LOOKUPS,
-    "PositiveSmallIntegerField": _NUMERIC_LOOKUPS,
-    "PositiveBigIntegerField": _NUMERIC_LOOKUPS,
-    "FloatField": _NUMERIC_LOOKUPS,
-    "DecimalField": _NUMERIC_LOOKUPS,
-    # String fields
-    "CharField": _STRING_LOOKUPS,
-    "TextField": _STRING_LOOKUPS,
-    "SlugField": _STRING_LOOKUPS,
-    "EmailField": _STRING_LOOKUPS,
-    "URLField": _STRING_LOOKUPS,
-    # Boolean
-    "BooleanField": [],
-    # Date/Time fields
-    "DateField": _NUMERIC_LOOKUPS + _DATE_LOOKUPS + ["date"],
-    "DateTimeField": _NUMERIC_LOOKUPS + _DATETIME_LOOKUPS + ["date", "time"],
-    "TimeField": _NUMERIC_LOOKUPS + _TIME_LOOKUPS,
-    "DurationField": _NUMERIC_LOOKUPS,
-    # Special fields
-    "JSONField": ["contains", "contained_by", "has_key", "has_keys", "has_any_keys"],
-    "UUIDField": ["iexact"] + _NUMERIC_LOOKUPS,
-    # File fields
-    "FileField": _STRING_LOOKUPS,
-    "ImageField": _STRING_LOOKUPS,
-    "FilePathField": _STRING_LOOKUPS,
-    # Binary
-    "BinaryField": [],
-    # IP fields
-    "IPAddressField": _STRING_LOOKUPS,
-    "GenericIPAddressField": _STRING_LOOKUPS,
-    # Relation fields (traversal only)
-    "ForeignKey": [],
-    "OneToOneField": [],
-    "ManyToManyField": [],
-}
-
-_LOOKUP_METADATA = {
-    "exact": {"description": "Exact match", "sql": "WHERE {field} = {value}"},
-    "iexact": {
-        "description": "Case-insensitive exact match",
-        "sql": "WHERE UPPER({field}) = UPPER({value})",
-    },
-    "contains": {
-        "description": "Case-sensitive containment test",
-        "sql": "WHERE {field} LIKE '%{value}%'",
-    },
-    "icontains": {
-        "description": "Case-insensitive containment test",
-        "sql": "WHERE UPPER({field}) LIKE UPPER('%{value}%')",
-    },
-    "startswith": {
-        "description": "Case-sensitive starts-with",
-        "sql": "WHERE {field} LIKE '{value}%'",
-    },
-    "istartswith": {
-        "description": "Case-insensitive starts-with",
-        "sql": "WHERE UPPER({field}) LIKE UPPER('{value}%')",
-    },
-    "endswith": {
-        "description": "Case-sensitive ends-with",
-        "sql": "WHERE {field} LIKE '%{value}'",
-    },
-    "iendswith": {
-        "description": "Case-insensitive ends-with",
-        "sql": "WHERE UPPER({field}) LIKE UPPER('%{value}')",
-    },
-    "gt": {"description": "Greater than", "sql": "WHERE {field} > {value}"},
-    "gte": {
-        "description": "Greater than or equal to",
-        "sql": "WHERE {field} >= {value}",
-    },
-    "lt": {"description": "Less than", "sql": "WHERE {field} < {value}"},
-    "lte": {
-        "description": "Less than or equal to",
-        "sql": "WHERE {field} <= {value}",
-    },
-    "isnull": {
-        "description": "Check if field is NULL or not",
-        "sql": "WHERE {field} IS NULL",
-    },
-    "range": {
-        "description": "Range test (inclusive)",
-        "sql": "WHERE {field} BETWEEN {start} AND {end}",
-    },
-    "in": {
-        "description": "Check if value is in list",
-        "sql": "WHERE {field} IN ({values})",
-    },
-    "regex": {
-        "description": "Case-sensitive regular expression match",
-        "sql": "WHERE {field} ~ '{pattern}'",
-    },
-    "iregex": {
-        "description": "Case-insensitive regular expression match",
-        "sql": "WHERE {field} ~* '{pattern}'",
-    },
-    # Date/Time transforms
-    "year": {
-        "description": "Extract year from date/datetime field",
-        "sql": "WHERE EXTRACT(YEAR FROM {field}) = {value}",
-    },
-    "month": {
-        "description": "Extract month from date/datetime field",
-        "sql": "WHERE EXTRACT(MONTH FROM {field}) = {value}",
-    },
-    "day": {
-        "description": "Extract day from date/datetime field",
-        "sql": "WHERE EXTRACT(DAY FROM {field}) = {value}",
-    },
-    "week": {
-        "description": "Extract ISO week number",
-        "sql": "WHERE EXTRACT(WEEK FROM {field}) = {value}",
-    },
-    "week_day": {
-        "description": "Day of week (1=Sunday, 7=Saturday)",
-        "sql": "WHERE EXTRACT(DOW FROM {field}) = {value}",
-    },
-    "quarter": {
-        "description": "Extract quarter (1-4)",
-        "sql": "WHERE EXTRACT(QUARTER FROM {field}) = {value}",
-    },
-    "hour": {
-        "description": "Extract hour from time/datetime field",
-        "sql": "WHERE EXTRACT(HOUR FROM {field}) = {value}",
-    },
-    "minute": {
-        "description": "Extract minute from time/datetime field",
-        "sql": "WHERE EXTRACT(MINUTE FROM {field}) = {value}",
-    },
-    "second": {
-        "description": "Extract second from time/datetime field",
-        "sql": "WHERE EXTRACT(SECOND FROM {field}) = {value}",
-    },
-    "date": {
-        "description": "Cast datetime to date",
-        "sql": "WHERE DATE({field}) = {value}",
-    },
-    "time": {
-        "description": "Extract time from datetime field",
-        "sql": "WHERE TIME({field}) = {value}",
-    },
-    "iso_year": {
-        "description": "Extract ISO year",
-        "sql": "WHERE EXTRACT(ISOYEAR FROM {field}) = {value}",
-    },
-    "iso_week_day": {
-        "description": "ISO day of week (1=Monday, 7=Sunday)",
-        "sql": "WHERE EXTRACT(ISODOW FROM {field}) = {value}",
-    },
-    # JSON lookups
-    "has_key": {
-        "description": "Check if JSON has a specific key at top level",
-        "sql": "WHERE {field} ? '{key}'",
-    },
-    "has_keys": {
-        "description": "Check if JSON has all specified keys",
-        "sql": "WHERE {field} ?& ARRAY['{keys}']",
-    },
-    "has_any_keys": {
-        "description": "Check if JSON has any of the specified keys",
-        "sql": "WHERE {field} ?| ARRAY['{keys}']",
-    },
-    "contained_by": {
-        "description": "Check if JSON is contained by another JSON",
-        "sql": "WHERE {field} <@ '{json}'",
-    },
-}
+class _Interner:
+    """Assign 1-based ids to values, reusing the id of an equal value."""
+
+    def __init__(self, key=None):
+        self.key = key or (lambda value: value)
+        self.items = []
+        self.ids = {}
+
+    def __call__(self, value):
+        if value is None:
+            return 0
+
+        key = self.key(value)
+        if key not in self.ids:
+            self.items.append(value)
+            self.ids[key] = len(self.items)
+        return self.ids[key]
+
 
 # =============================================================================
 # Model metadata extraction
@@ -244,8 +106,52 @@ class DjangoJSONEncoder(json.JSONEncoder):
             return super().default(obj)
 
 
+# Per-run caches, see clear_field_caches()
+_field_definitions = {}
+_choices_classes = {}
+_choices_indexes = {}
+_class_lookups = {}
+
+
+def clear_field_caches():
+    """Forget memoized field data so a new extraction sees reloaded modules."""
+    _field_definitions.clear()
+    _choices_classes.clear()
+    _choices_indexes.clear()
+    _class_lookups.clear()
+
+
+def _get_field_lookups(field):
+    """Return the lookups and transforms registered on a field's class.
+
+    Computed once per class, so custom fields and custom registered lookups
+    are covered without per-field cost.
+    """
+    field_class = type(field)
+    if field_class not in _class_lookups:
+        try:
+            names = list(field_class.get_lookups())
+        except Exception:
+            names = None
+
+        if names is not None:
+            leading = [name for name in _LEADING_LOOKUPS if name in names]
+            names = tuple(leading + [name for name in names if name not in leading])
+
+        _class_lookups[field_class] = names
+
+    return _class_lookups[field_class]
+
+
 def _get_field_definition(field):
     """Return field definition as string. e.g. title = models.CharField(max_length=200)"""
+    if field not in _field_definitions:
+        with timer.phase("definitions"):
+            _field_definitions[field] = _build_field_definition(field)
+    return _field_definitions[field]
+
+
+def _build_field_definition(field):
     field_name = field.name
     field_class = field.__class__.__name__
     params = []
@@ -308,37 +214,79 @@ def _get_field_definition(field):
     return f"{field_name} = models.{field_class}({', '.join(params)})"
 
 
-def _find_choices_class(field):
-    """Find the Choices class used by a field."""
-    if not hasattr(field, "choices") or not field.choices:
+def _choices_key(choices):
+    """Return a hashable key for a choices list, or None if it has none."""
+
+    def freeze(value):
+        if isinstance(value, (list, tuple)):
+            return tuple(freeze(item) for item in value)
+        if isinstance(value, Promise):
+            return str(value)
+        return value
+
+    from django.utils.functional import Promise
+
+    key = freeze(choices)
+    try:
+        hash(key)
+    except TypeError:
         return None
+    return key
 
-    model_class = field.model
 
-    search_spaces = [
-        model_class,
-        sys.modules.get(model_class.__module__),
-    ]
+def _get_choices_index(space):
+    """Index the Choices classes defined on a model class or module by their choices."""
+    if space in _choices_indexes:
+        return _choices_indexes[space]
+
+    from django.db import models
+
+    index = {}
+    for attr_name in dir(space):
+        try:
+            attr = getattr(space, attr_name, None)
+            if not isinstance(attr, type) or not issubclass(attr, models.Choices):
+                continue
 
-    for space in search_spaces:
-        if space is None:
+            key = _choices_key(getattr(attr, "choices", None))
+            if key is not None:
+                # dir() is sorted, so the first name wins as before
+                index.setdefault(key, attr)
+        except (TypeError, AttributeError):
             continue
 
-        for attr_name in dir(space):
-            try:
-                attr = getattr(space, attr_name, None)
-                if attr is None:
-                    continue
+    _choices_indexes[space] = index
+    return index
+
 
-                from django.db import models
+def _find_choices_class(field):
+    """Find the Choices class used by a field."""
+    if not hasattr(field, "choices") or not field.choices:
+        return None
+
+    if field in _choices_classes:
+        return _choices_classes[field]
+
+    model_class = field.model
+    key = _choices_key(field.choices)
+    choices_class = None
 
-                if isinstance(attr, type) and issubclass(attr, models.Choices):
-                    if hasattr(attr, "choices") and field.choices == attr.choices:
-                        return attr
-            except (TypeError, AttributeError):
+    if key is not None:
+        search_spaces = [
+            model_class,
+            sys.modules.get(model_class.__module__),
+        ]
+
+        for space in search_spaces:
+            if space is None:
                 continue
 
-    return None
+            choices_class = _get_choices_index(space).get(key)
+            if choices_class:
+                break
+
+    _choices_classes[field] = choices_class
+    return choices_class
 
 
 def _get_choices_info(field):
@@ -377,6 +325,10 @@ def _get_field_metadata(field):
         "definition": _get_field_definition(field),
     }
 
+    lookups = _get_field_lookups(field)
+    if lookups is not None:
+        metadata["lookups"] = lookups
+
     if hasattr(field, "max_length") and field.max_length:
         metadata["max_length"] = field.max_length
 
@@ -438,9 +390,8 @@ def _get_reverse_relation_metadata(field):
     return metadata
 
 
-def get_completion_data():
-    """Return all Django model fields and relations with lookup data."""
-    from django.apps import apps
+def get_model_completion_data(model):
+    """Return fields and relations of a single model."""
     from django.db.models.fields.related import (
         ForeignKey,
         ManyToManyField,
@@ -452,64 +403,337 @@ def get_completion_data():
         OneToOneRel,
     )
 
+    fields = {}
+
+    for field in model._meta.get_fields():
+        field_name = field.name
+
+        is_concrete = getattr(field, "concrete", False)
+        is_m2m = getattr(field, "many_to_many", False)
+        is_relation_field = isinstance(
+            field, (ForeignKey, OneToOneField, ManyToManyField)
+        )
+
+        if (is_concrete and not is_m2m) or is_relation_field:
+            fields[field_name] = _get_field_metadata(field)
+
+            # Add _id field for ForeignKey and OneToOneField
+            if isinstance(field, (ForeignKey, OneToOneField)):
+                id_field_name = field_name + "_id"
+                # Get the actual column type from the target field's pk
+                related_pk = field.related_model._meta.pk
+                pk_type = (
+                    related_pk.__class__.__name__ if related_pk else "IntegerField"
+                )
+                fields[id_field_name] = {
+                    "type": pk_type,
+                    "definition": f"{id_field_name} = models.{pk_type}()  # → {field.related_model.__name__}.pk",
+                    "null": field.null,
+                    "blank": field.blank,
+                }
+                if related_pk is not None:
+                    lookups = _get_field_lookups(related_pk)
+                    if lookups is not None:
+                        fields[id_field_name]["lookups"] = lookups
+        elif isinstance(field, (ManyToOneRel, ManyToManyRel, OneToOneRel)):
+            fields[field_name] = _get_reverse_relation_metadata(field)
+
+    return {
+        "app_label": model._meta.app_label,
+        "module": model.__module__,
+        "fields": fields,
+    }
+
+
+class _CompletionEncoder:
+    """Encode per-model data in the cache schema, interning values as it goes."""
+
+    def __init__(self):
+        self.interners = {
+            "strings": _Interner(),
+            # (type name, lookups): classes sharing a name may register different lookups
+            "types": _Interner(),
+            "choices": _Interner(
+                key=lambda value: json.dumps(value, sort_keys=True, cls=DjangoJSONEncoder)
+            ),
+        }
+        self.lookup_sets = _Interner()
+        self.type_lookups = []
+        self.taken = {}
+
+    def encode_field(self, field):
+        values = dict(field)
+        values["type"] = (field["type"], field.get("lookups"))
+        values["flags"] = sum(
+            bit for key, bit in _FIELD_FLAGS.items() if field.get(key)
+        )
+
+        row = []
+        for key, table in _ROW_KEYS:
+            value = values.get(key)
+            row.append(self.interners[table](value) if table else value or 0)
+
+        while len(row) > 1 and not row[-1]:
+            row.pop()
+        return row
+
+    def encode_fields(self, fields):
+        return {name: self.encode_field(field) for name, field in fields.items()}
+
+    def encode_model(self, model):
+        strings = self.interners["strings"]
+        return [
+            strings(model["app_label"]),
+            strings(model["module"]),
+            self.encode_fields(model["fields"]),
+        ]
+
+    def __table_sources(self):
+        """Return {table: (interned entries, conversion of an entry or None)}."""
+        types = self.interners["types"].items
+        for _, lookups in types[len(self.type_lookups) :]:
+            self.type_lookups.append(self.lookup_sets(lookups))
+
+        return {
+            "strings": (self.interners["strings"].items, None),
+            "types": (types, lambda entry: entry[0]),
+            "type_lookups": (self.type_lookups, None),
+            "lookup_sets": (self.lookup_sets.items, list),
+            "choices": (self.interners["choices"].items, None),
+        }
+
+    def tables(self):
+        """Return the interned tables."""
+        return {
+            table: [convert(entry) for entry in items] if convert else list(items)
+            for table, (items, convert) in self.__table_sources().items()
+        }
+
+    def take_appended(self):
+        """Return the table entries interned since the previous call.
+
+        Only the new entries are sliced and converted, so streaming stays linear.
+        """
+        appended = {}
+        for table, (items, convert) in self.__table_sources().items():
+            start = self.taken.get(table, 0)
+            if len(items) > start:
+                new_items = items[start:]
+                appended[table] = [convert(entry) for entry in new_items] if convert else new_items
+                self.taken[table] = len(items)
+        return appended
+
+
+def build_completion_data(models_data, partial=None):
+    """Encode per-model data (and partial extraction info) in the cache schema."""
+    encoder = _CompletionEncoder()
+    models = {name: encoder.encode_model(model) for name, model in models_data.items()}
+
+    result = {"version": SCHEMA_VERSION, "models": models}
+
+    if partial is not None:
+        result["partial"] = {
+            "apps": partial["apps"],
+            "reverse_relations": {
+                name: encoder.encode_fields(fields)
+                for name, fields in partial["reverse_relations"].items()
+            },
+        }
+
+    result.update(encoder.tables())
+    return result
+
+
+def get_completion_data():
+    """Return all Django model fields and relations with lookup data."""
+    from django.apps import apps
+
+    clear_field_caches()
     models_data = {}
 
     for model in apps.get_models():
-        app_label = model._meta.app_label
-        model_name = model.__name__
+        models_data[model._meta.label] = get_model_completion_data(model)
 
-        fields = {}
+    with timer.phase("intern"):
+        return build_completion_data(models_data)
 
-        for field in model._meta.get_fields():
-            field_name = field.name
 
-            is_concrete = getattr(field, "concrete", False)
-            is_m2m = getattr(field, "many_to_many", False)
-            is_relation_field = isinstance(
-                field, (ForeignKey, OneToOneField, ManyToManyField)
-            )
+def stream_completion_data():
+    """Write each model as a record as soon as it is encoded (see RecordStream).
 
-            if (is_concrete and not is_m2m) or is_relation_field:
-                fields[field_name] = _get_field_metadata(field)
-
-                # Add _id field for ForeignKey and OneToOneField
-                if isinstance(field, (ForeignKey, OneToOneField)):
-                    id_field_name = field_name + "_id"
-                    # Get the actual column type from the target field's pk
-                    related_pk = field.related_model._meta.pk
-                    pk_type = (
-                        related_pk.__class__.__name__ if related_pk else "IntegerField"
-                    )
-                    fields[id_field_name] = {
-                        "type": pk_type,
-                        "definition": f"{id_field_name} = models.{pk_type}()  # → {field.related_model.__name__}.pk",
-                        "null": field.null,
-                        "blank": field.blank,
-                    }
-            elif isinstance(field, (ManyToOneRel, ManyToManyRel, OneToOneRel)):
-                fields[field_name] = _get_reverse_relation_metadata(field)
-
-        models_data[model_name] = {
-            "app_label": app_label,
-            "module": model.__module__,
-            "fields": fields,
-        }
+    Values interned for a model are sent with it in "append", so the reader
+    can decode every model it has received.
+    """
+    from django.apps import apps
 
-    return {
-        "models": models_data,
-        "lookups": {
-            "base": _BASE_LOOKUPS,
-            "by_type": _LOOKUP_BY_TYPE,
-            "metadata": _LOOKUP_METADATA,
-        },
-    }
+    clear_field_caches()
+    encoder = _CompletionEncoder()
+    stream = RecordStream(
+        dict(encoder.tables(), version=SCHEMA_VERSION, models={}),
+        items="models",
+        cls=DjangoJSONEncoder,
+    )
+
+    for model in apps.get_models():
+        encoded = encoder.encode_model(get_model_completion_data(model))
+        stream.item(encoded, key=model._meta.label, append=encoder.take_appended())
+        stream.sources.add(get_module_file(model.__module__))
+
+    return stream
+
+
+def _get_app_labels_for_files(files):
+    """Map source file paths to the labels of the apps that contain them."""
+    from django.apps import apps
+
+    # Longest path first so nested apps win over their parents
+    app_configs = sorted(
+        apps.get_app_configs(), key=lambda config: len(config.path), reverse=True
+    )
+
+    labels = set()
+    for path in files:
+        real_path = os.path.realpath(path)
+        for app_config in app_configs:
+            app_path = os.path.join(os.path.realpath(app_config.path), "")
+            if real_path.startswith(app_path):
+                labels.add(app_config.label)
+                break
+
+    return labels
+
+
+def get_partial_completion_data(app_labels):
+    """Return completion data and the extracted models for the given apps only.
+
+    Reverse relations live on the target model, so forward relations from the
+    changed apps into other apps are returned separately in
+    "partial.reverse_relations" for the caller to patch into its cache.
+    """
+    from django.apps import apps
+    from django.db.models.fields.related import (
+        ForeignKey,
+        ManyToManyField,
+        OneToOneField,
+    )
+
+    clear_field_caches()
+    models_data = {}
+    reverse_relations = {}
+    models = []
+
+    for app_label in sorted(app_labels):
+        try:
+            app_config = apps.get_app_config(app_label)
+        except LookupError:
+            continue
+
+        for model in app_config.get_models():
+            models.append(model)
+            models_data[model._meta.label] = get_model_completion_data(model)
+
+            for field in model._meta.get_fields():
+                if not isinstance(field, (ForeignKey, OneToOneField, ManyToManyField)):
+                    continue
+
+                rel = field.remote_field
+                target = field.related_model
+                if target._meta.app_label in app_labels:
+                    continue
+
+                # related_name="+" (and symmetrical self M2M) hide the reverse side
+                if (rel.related_name or "").endswith("+"):
+                    continue
+
+                reverse_relations.setdefault(target._meta.label, {})[rel.name] = (
+                    _get_reverse_relation_metadata(rel)
+                )
+
+    with timer.phase("intern"):
+        result = build_completion_data(
+            models_data,
+            partial={"apps": sorted(app_labels), "reverse_relations": reverse_relations},
+        )
+    return result, models
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--apps", nargs="*", default=[], help="only extract models of these app labels"
+    )
+    parser.add_argument(
+        "--files",
+        nargs="*",
+        default=[],
+        help="only extract models of the apps containing these files",
+    )
+    parser.add_argument(
+        "--static",
+        action="store_true",
+        help="parse model files instead of running django.setup()",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="write one NDJSON record per model while extracting (full runs only)",
+    )
+    return parser.parse_args(argv)
+
+
+def get_static_completion_data(setup_error=None):
+    """Return the full completion data output built from the model source files."""
+    with timer.phase("static"):
+        index = StaticModelIndex(os.getcwd())
+        models_data = index.get_completion_models()
+    with timer.phase("intern"):
+        result = build_completion_data(models_data)
+    return build_static_output(result, index.sources, setup_error)
 
 
 def main():
+    timer.reset()
+    args = parse_args()
+
+    # Static data is always complete: --apps/--files are ignored
+    if args.static:
+        print(
+            dumps_output(
+                get_static_completion_data(), separators=(",", ":"), cls=DjangoJSONEncoder
+            )
+        )
+        return
+
+    try:
+        with timer.phase("setup"):
+            setup_django()
+    except Exception as e:
+        print(
+            dumps_output(
+                get_static_completion_data(e), separators=(",", ":"), cls=DjangoJSONEncoder
+            )
+        )
+        return
+
     try:
-        setup_django()
-        result = get_completion_data()
-        print(json.dumps(result, indent=2, cls=DjangoJSONEncoder))
+        from django.apps import apps
+
+        if args.stream and not (args.apps or args.files):
+            with timer.phase("models"):
+                stream = stream_completion_data()
+            stream.close()
+            return
+
+        with timer.phase("models"):
+            if args.apps or args.files:
+                app_labels = set(args.apps) | _get_app_labels_for_files(args.files)
+                result, models = get_partial_completion_data(app_labels)
+            else:
+                result = get_completion_data()
+                models = apps.get_models()
+
+        output = build_output(result, get_model_sources(models))
+        print(dumps_output(output, separators=(",", ":"), cls=DjangoJSONEncoder))
 
     except Exception as e:
         import traceback
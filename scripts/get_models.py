@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import argparse
 import json
 import os
 import sys
@@ -7,9 +8,17 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, script_dir)
 
 from django_utils import (  # pyright: ignore[reportMissingImports]  # noqa: E402
+    RecordStream,
+    build_output,
+    build_static_output,
+    clear_source_indexes,
+    dumps_output,
+    get_model_sources,
     get_source_location,
     setup_django,
+    timer,
 )
+from static_models import StaticModelIndex  # noqa: E402
 
 
 def get_model_info(model):
@@ -31,21 +40,89 @@ def get_model_info(model):
     }
 
 
+def model_sort_key(model_info):
+    return (model_info["app_label"], model_info["name"])
+
+
+def iter_models():
+    """Yield model info in model_sort_key() order without building the list first."""
+    from django.apps import apps  # pyright: ignore[reportMissingImports]
+
+    clear_source_indexes()
+    for model in sorted(
+        apps.get_models(), key=lambda model: (model._meta.app_label, model.__name__)
+    ):
+        model_info = get_model_info(model)
+        if model_info:
+            yield model_info
+
+
+def get_models():
+    return list(iter_models())
+
+
+def stream_models():
+    """Write each model as a record as soon as it is extracted (see RecordStream)."""
+    from django.apps import apps  # pyright: ignore[reportMissingImports]
+
+    stream = RecordStream([])
+    for model_info in iter_models():
+        stream.item(model_info)
+    stream.sources.update(get_model_sources(apps.get_models()))
+    return stream
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--static",
+        action="store_true",
+        help="parse model files instead of running django.setup()",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="write one NDJSON record per model while extracting",
+    )
+    return parser.parse_args(argv)
+
+
+def print_static_models(setup_error=None):
+    with timer.phase("static"):
+        index = StaticModelIndex(os.getcwd())
+        models = index.get_models()
+    output = build_static_output(models, index.sources, setup_error)
+    print(dumps_output(output, indent=2))
+
+
 def main():
+    timer.reset()
+    args = parse_args()
+    if args.static:
+        print_static_models()
+        return
+
     try:
-        setup_django()
+        with timer.phase("setup"):
+            setup_django()
+    except Exception as e:
+        # Settings that need env vars, secrets or a database: fall back to the source files
+        print_static_models(e)
+        return
 
+    try:
         from django.apps import apps  # pyright: ignore[reportMissingImports]
 
-        models = []
-        for model in apps.get_models():
-            model_info = get_model_info(model)
-            if model_info:
-                models.append(model_info)
-
-        models.sort(key=lambda x: (x["app_label"], x["name"]))
+        if args.stream:
+            with timer.phase("models"):
+                stream = stream_models()
+            stream.close()
+            return
 
-        print(json.dumps(models, indent=2))
+        with timer.phase("models"):
+            models = get_models()
+            sources = get_model_sources(apps.get_models())
+        print(dumps_output(build_output(models, sources), indent=2))
 
     except Exception as e:
         error_data = {"error": str(e), "type": type(e).__name__}
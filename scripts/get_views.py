@@ -1,72 +1,88 @@
 #!/usr/bin/env python3
+import argparse
 import inspect
 import json
 import os
+import re
 import sys
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, script_dir)
 
 from django_utils import (  # pyright: ignore[reportMissingImports]  # noqa: E402
+    RecordStream,
+    build_output,
+    clear_source_indexes,
+    dumps_output,
+    get_module_file,
+    get_source_index,
     get_source_location,
+    get_urlconf_modules,
     setup_django,
+    timer,
 )
 
 
-def get_method_line_numbers(view_class):
-    method_lines = {}
-    try:
-        source_lines, source_start_line = inspect.getsourcelines(view_class)
-
-        http_methods = ["get", "post", "put", "patch", "delete", "head", "options"]
+HTTP_METHODS = ["get", "post", "put", "patch", "delete", "head", "options"]
 
-        for line_idx, line in enumerate(source_lines):
-            stripped = line.strip()
-            if stripped.startswith("def ") and "(" in stripped:
-                method_name = stripped.split("(")[0].replace("def ", "")
+STANDARD_ACTIONS = [
+    "list",
+    "create",
+    "retrieve",
+    "update",
+    "partial_update",
+    "destroy",
+]
 
-                if method_name in http_methods:
-                    method_lines[method_name] = source_start_line + line_idx
 
-    except Exception:
-        pass
+# DRF format_suffix_patterns() twin suffixes: "\.(?P<format>[a-z0-9]+)/?$", "<drf_format_suffix:format>";
+# with allowed=[...] the group nests one level: "\.(?P<format>(json|html))/?$"
+FORMAT_SUFFIX = re.compile(
+    r"(?:\\?\.)?(?:\(\?P<format>(?:[^()]|\([^()]*\))*\)|<\w+:format>)(?:/\?|/)?\$?$"
+)
+TRAILING_ANCHOR = re.compile(r"/?\$?$")
 
-    return method_lines
+NAMED_GROUP = re.compile(r"\(\?P<([A-Za-z0-9_]+)>[^)]*\)")
+CONVERTER = re.compile(r"<[A-Za-z0-9_]+:([A-Za-z0-9_]+)>")
+PARAMETER = re.compile(r"<[A-Za-z0-9_]+>")
+OPTIONAL_GROUP = re.compile(r"^(.*?)\(\?:([^()]+)\)\?(.*)$", re.DOTALL)
+REPEATED_SLASHES = re.compile(r"//+")
 
 
-def get_action_line_numbers(view_class):
-    action_lines = {}
+def get_class_info(view_class):
+    """Return (file, class line, methods) of a view class from its file's index."""
     try:
-        source_lines, source_start_line = inspect.getsourcelines(view_class)
+        file_path = inspect.getfile(view_class)
+    except TypeError:
+        return None, 0, {}
 
-        standard_actions = [
-            "list",
-            "create",
-            "retrieve",
-            "update",
-            "partial_update",
-            "destroy",
-        ]
+    info = get_source_index(file_path).get(view_class.__qualname__)
+    if info:
+        return file_path, info["line"], info.get("methods", {})
 
-        prev_def_idx = 0
+    file_path, class_line = get_source_location(view_class)
+    return file_path, class_line, {}
 
-        for line_idx, line in enumerate(source_lines):
-            stripped = line.strip()
-            if stripped.startswith("def ") and "(" in stripped:
-                method_name = stripped.split("(")[0].replace("def ", "")
 
-                is_standard_action = method_name in standard_actions
-                has_action_decorator = any(
-                    "@action" in source_lines[i] for i in range(prev_def_idx, line_idx)
-                )
+def get_method_line_numbers(methods):
+    return {
+        name: method["line"]
+        for name, method in methods.items()
+        if name in HTTP_METHODS
+    }
 
-                if is_standard_action or has_action_decorator:
-                    action_lines[method_name] = source_start_line + line_idx
 
-                prev_def_idx = line_idx + 1
+def get_action_line_numbers(methods):
+    action_lines = {}
+
+    for name, method in methods.items():
+        is_standard_action = name in STANDARD_ACTIONS
+        has_action_decorator = any(
+            decorator.split(".")[-1] == "action" for decorator in method["decorators"]
+        )
 
-    except Exception:
-        pass
+        if is_standard_action or has_action_decorator:
+            action_lines[name] = method["line"]
 
     return action_lines
 
@@ -74,12 +90,12 @@ def get_action_line_numbers(view_class):
 def handle_viewset(url_pattern, full_pattern, view_class, callback):
     endpoints = []
 
-    file_path, class_line = get_source_location(view_class)
+    file_path, class_line, methods = get_class_info(view_class)
     if not file_path:
         return endpoints
 
     actions = getattr(callback, "actions", {})
-    action_line_numbers = get_action_line_numbers(view_class)
+    action_line_numbers = get_action_line_numbers(methods)
 
     for http_method, action_name in actions.items():
         line_number = action_line_numbers.get(action_name, class_line)
@@ -105,11 +121,11 @@ def handle_viewset(url_pattern, full_pattern, view_class, callback):
 def handle_apiview(url_pattern, full_pattern, view_class):
     endpoints = []
 
-    file_path, class_line = get_source_location(view_class)
+    file_path, class_line, methods = get_class_info(view_class)
     if not file_path:
         return endpoints
 
-    method_line_numbers = get_method_line_numbers(view_class)
+    method_line_numbers = get_method_line_numbers(methods)
 
     if method_line_numbers:
         for method_name, line_number in method_line_numbers.items():
@@ -147,11 +163,11 @@ def handle_django_view(url_pattern, full_pattern, view_class):
     """Handle Django's built-in Class-Based Views (View, ListView, DetailView, etc.)"""
     endpoints = []
 
-    file_path, class_line = get_source_location(view_class)
+    file_path, class_line, methods = get_class_info(view_class)
     if not file_path:
         return endpoints
 
-    method_line_numbers = get_method_line_numbers(view_class)
+    method_line_numbers = get_method_line_numbers(methods)
 
     if method_line_numbers:
         for method_name, line_number in method_line_numbers.items():
@@ -235,9 +251,7 @@ def extract_api_info(url_pattern, prefix):
         return handle_function_view(url_pattern, full_pattern, unwrapped_callback)
 
 
-def scan_urls(url_patterns, prefix=""):
-    endpoints = []
-
+def iter_urls(url_patterns, prefix=""):
     from django.urls.resolvers import (  # pyright: ignore[reportMissingImports, reportUnknownVariableType]
         URLPattern,  # pyright: ignore[reportUnknownVariableType]
         URLResolver,  # pyright: ignore[reportUnknownVariableType]
@@ -246,29 +260,207 @@ def scan_urls(url_patterns, prefix=""):
     for pattern in url_patterns:
         if isinstance(pattern, URLResolver):
             new_prefix = prefix + str(pattern.pattern)
-            endpoints.extend(scan_urls(pattern.url_patterns, new_prefix))
+            yield from iter_urls(pattern.url_patterns, new_prefix)
         elif isinstance(pattern, URLPattern):
             try:
                 api_endpoints = extract_api_info(pattern, prefix)
-                endpoints.extend(api_endpoints)
             except Exception:
-                pass
+                continue
+            yield from api_endpoints
 
-    return endpoints
 
+def scan_urls(url_patterns, prefix=""):
+    return list(iter_urls(url_patterns, prefix))
+
+
+def normalize_pattern(pattern):
+    """Return a URL pattern as a path: "^posts/(?P<pk>[^/.]+)/$" -> "/posts/<pk>/"."""
+    if not pattern:
+        return None
+
+    normalized = NAMED_GROUP.sub(r"<\1>", pattern)
+    normalized = CONVERTER.sub(r"<\1>", normalized)
+    normalized = normalized.replace("^", "").replace("$", "").replace("\\/", "/")
+    normalized = REPEATED_SLASHES.sub("/", normalized)
+
+    if not normalized.startswith("/"):
+        normalized = "/" + normalized
+    return normalized
+
+
+def replace_balanced_groups(value, replacement):
+    """Replace every balanced "(...)" group, leaving unbalanced parentheses as they are."""
+    result = []
+    index = 0
+
+    while index < len(value):
+        if value[index] == "(":
+            depth = 0
+            for end in range(index, len(value)):
+                if value[end] == "(":
+                    depth += 1
+                elif value[end] == ")":
+                    depth -= 1
+                    if depth == 0:
+                        result.append(replacement)
+                        index = end + 1
+                        break
+            if depth == 0:
+                continue
+
+        result.append(value[index])
+        index += 1
+
+    return "".join(result)
+
+
+def expand_optional_groups(pattern):
+    """Return the pattern with each "(?:...)?" group left out and filled in."""
+    results = []
+    seen = set()
+
+    def visit(value):
+        if not value or value in seen:
+            return
+        seen.add(value)
+
+        match = OPTIONAL_GROUP.match(value)
+        if match:
+            before, inner, after = match.groups()
+            visit(before + after)
+            visit(before + inner + after)
+            return
+
+        results.append(value)
+
+    visit(pattern)
+    return results
+
+
+def canonicalize_pattern(pattern):
+    """Return a normalized pattern with every parameter as "<param>" and a trailing slash."""
+    normalized = normalize_pattern(pattern)
+    if not normalized:
+        return None
+
+    normalized = replace_balanced_groups(normalized.replace("(?:", "("), "<param>")
+    normalized = PARAMETER.sub("<param>", normalized)
+    normalized = REPEATED_SLASHES.sub("/", normalized)
+
+    if not normalized.startswith("/"):
+        normalized = "/" + normalized
+    if len(normalized) > 1 and not normalized.endswith("/"):
+        normalized += "/"
+    return normalized
+
+
+def get_pattern_variants(normalized):
+    """Return the canonical forms of a normalized pattern, used to match concrete paths."""
+    variants = []
+    for candidate in expand_optional_groups(normalized) or [normalized]:
+        variant = canonicalize_pattern(candidate)
+        if variant and variant not in variants:
+            variants.append(variant)
+    return variants
+
+
+def prune_endpoints(endpoints):
+    """Drop format-suffix twins and duplicate rows; add "normalized" and "variants".
+
+    DRF adds each route's format-suffix twin right after it, so a twin is
+    dropped when its route was seen. A twin without one is kept and
+    normalized without the suffix.
+    """
+    seen_rows = set()
+    seen_routes = set()
+
+    for endpoint in endpoints:
+        pattern = endpoint["pattern"]
+        row = (pattern, endpoint["view"], endpoint.get("method"))
+        if row in seen_rows:
+            continue
+        seen_rows.add(row)
+
+        route = FORMAT_SUFFIX.sub("", pattern)
+        route_key = (
+            TRAILING_ANCHOR.sub("", route),
+            endpoint["view"],
+            endpoint.get("method"),
+            endpoint.get("action"),
+        )
+        if route != pattern and route_key in seen_routes:
+            continue
+        seen_routes.add(route_key)
 
-def main():
-    try:
-        setup_django()
+        normalized = normalize_pattern(route)
+        if normalized:
+            endpoint["normalized"] = normalized
+            endpoint["variants"] = get_pattern_variants(normalized)
+        yield endpoint
 
-        from django.urls import (  # pyright: ignore[reportMissingImports]
-            get_resolver,  # pyright: ignore[reportMissingImports, reportUnknownVariableType]
-        )
 
-        resolver = get_resolver()
-        endpoints = scan_urls(resolver.url_patterns)
+def iter_views():
+    from django.urls import (  # pyright: ignore[reportMissingImports]
+        get_resolver,  # pyright: ignore[reportMissingImports, reportUnknownVariableType]
+    )
+
+    clear_source_indexes()
+    resolver = get_resolver()
+    return prune_endpoints(iter_urls(resolver.url_patterns))
+
+
+def get_views():
+    return list(iter_views())
+
+
+def get_urlconf_sources():
+    return {get_module_file(module.__name__) for module in get_urlconf_modules()}
+
 
-        print(json.dumps(endpoints, indent=2))
+def get_view_sources(endpoints):
+    """Return the URLconf files and the files of every resolved view."""
+    sources = {endpoint["file"] for endpoint in endpoints}
+    sources.update(get_urlconf_sources())
+    return sources
+
+
+def stream_views():
+    """Write each endpoint as a record as soon as it is resolved (see RecordStream)."""
+    stream = RecordStream([])
+    for endpoint in iter_views():
+        stream.item(endpoint)
+        stream.sources.add(endpoint["file"])
+    stream.sources.update(get_urlconf_sources())
+    return stream
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="write one NDJSON record per endpoint while resolving",
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    timer.reset()
+    args = parse_args()
+    try:
+        with timer.phase("setup"):
+            setup_django()
+
+        if args.stream:
+            with timer.phase("views"):
+                stream = stream_views()
+            stream.close()
+            return
+
+        with timer.phase("views"):
+            endpoints = get_views()
+            sources = get_view_sources(endpoints)
+        print(dumps_output(build_output(endpoints, sources), indent=2))
 
     except Exception as e:
         error_data = {"error": str(e), "type": type(e).__name__}
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Resolve a URL path with Django's own resolver.
+
+    resolve_url.py /blog/posts/3/ [--method post]
+
+Prints the matching view, the line of the handler serving the method and the
+captured arguments. Unlike the views picker, which matches paths against the
+cached patterns, this handles regex and custom path converters exactly.
+"""
+
+import argparse
+import inspect
+import json
+import os
+import sys
+from urllib.parse import urlsplit
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, script_dir)
+
+from django_utils import (  # pyright: ignore[reportMissingImports]  # noqa: E402
+    clear_source_indexes,
+    dumps_output,
+    get_source_location,
+    setup_django,
+    timer,
+)
+from get_views import (  # noqa: E402
+    get_action_line_numbers,
+    get_class_info,
+    get_method_line_numbers,
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="URL path or full URL to resolve")
+    parser.add_argument("--method", default="get", help="HTTP method (default: get)")
+    return parser.parse_args(argv)
+
+
+def normalize_path(path):
+    """Strip scheme, host, query and fragment; the resolver expects a leading slash."""
+    path = urlsplit(path.strip()).path or "/"
+    if not path.startswith("/"):
+        path = "/" + path
+    return path
+
+
+def get_handlers(callback):
+    """Return (view, file, class or function line, {method: handler line})."""
+    view_class = getattr(callback, "cls", None) or getattr(callback, "view_class", None)
+
+    if view_class is None:
+        function = inspect.unwrap(callback)
+        file_path, line_number = get_source_location(function)
+        return f"{function.__module__}.{function.__name__}", file_path, line_number, {}
+
+    view = f"{view_class.__module__}.{view_class.__name__}"
+    file_path, class_line, methods = get_class_info(view_class)
+
+    # DRF ViewSets map methods to actions in as_view()
+    actions = getattr(callback, "actions", None)
+    if actions:
+        action_lines = get_action_line_numbers(methods)
+        handlers = {
+            method: action_lines[action]
+            for method, action in actions.items()
+            if action in action_lines
+        }
+    else:
+        handlers = get_method_line_numbers(methods)
+
+    return view, file_path, class_line, handlers
+
+
+def resolve_path(path, method="get"):
+    from django.urls import Resolver404, resolve  # pyright: ignore[reportMissingImports]
+
+    clear_source_indexes()
+    path = normalize_path(path)
+    try:
+        match = resolve(path)
+    except Resolver404:
+        # The exception carries every pattern tried, far too long to report
+        raise LookupError(f"No URL pattern matches {path}") from None
+
+    view, file_path, view_line, handlers = get_handlers(match.func)
+    method = method.lower()
+
+    return {
+        "path": path,
+        "route": getattr(match, "route", None),
+        "url_name": match.url_name or "",
+        "view_name": match.view_name,
+        "view": view,
+        "file": file_path,
+        "line": handlers.get(method, view_line),
+        "method": method if method in handlers else None,
+        "handlers": handlers,
+        "args": list(match.args),
+        "kwargs": match.kwargs,
+    }
+
+
+def main():
+    timer.reset()
+    args = parse_args()
+    try:
+        with timer.phase("setup"):
+            setup_django()
+
+        with timer.phase("resolve"):
+            result = resolve_path(args.path, args.method)
+        # Converters may return any object (int, UUID, model instances)
+        print(dumps_output({"data": result, "meta": {}}, indent=2, default=str))
+
+    except Exception as e:
+        error_data = {"error": str(e), "type": type(e).__name__}
+        print(json.dumps(error_data), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
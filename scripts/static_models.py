@@ -0,0 +1,798 @@
+#!/usr/bin/env python3
+"""Extract models from source files with ast, without running django.setup().
+
+Used when the project cannot be set up (settings that need env vars, secrets
+or a database) or when a script is run with --static. The output has the same
+structure as get_models.py and get_completion_data.py but is approximate:
+
+- only models in models.py and models/*.py under the project root are found
+- field types are the class names used in the source
+- relations to models outside the project (e.g. auth.User) have no reverse side
+"""
+
+import ast
+import os
+import sys
+import tokenize
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, script_dir)
+
+from django_utils import find_settings_module  # noqa: E402
+
+EXCLUDED_DIRS = {
+    ".git",
+    ".hg",
+    ".mypy_cache",
+    ".nox",
+    ".tox",
+    ".venv",
+    "__pycache__",
+    "build",
+    "dist",
+    "env",
+    "migrations",
+    "node_modules",
+    "site-packages",
+    "venv",
+}
+
+RELATION_FIELDS = {
+    "ForeignKey": "ManyToOneRel",
+    "OneToOneField": "OneToOneRel",
+    "ManyToManyField": "ManyToManyRel",
+}
+
+CHOICES_BASES = {"Choices", "TextChoices", "IntegerChoices"}
+
+# max_length that Django fields set when none is given
+DEFAULT_MAX_LENGTH = {
+    "EmailField": 254,
+    "FileField": 100,
+    "FilePathField": 100,
+    "GenericIPAddressField": 39,
+    "IPAddressField": 15,
+    "ImageField": 100,
+    "SlugField": 50,
+    "URLField": 200,
+    "UUIDField": 32,
+}
+
+# Primary key type of models outside the project (Django's own apps use AutoField)
+EXTERNAL_PK_TYPE = "AutoField"
+
+
+def get_dotted_name(node):
+    """Return "models.CharField" for models.CharField, None for other expressions."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def get_string(node):
+    """Return a string literal, also when wrapped in a gettext call like _("...")."""
+    if isinstance(node, ast.Call) and len(node.args) == 1:
+        node = node.args[0]
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def get_literal(node, default=None):
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return default
+
+
+def iter_model_files(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            name
+            for name in dirnames
+            if name not in EXCLUDED_DIRS and not name.startswith(".")
+        )
+
+        if os.path.basename(dirpath) == "models":
+            for filename in sorted(filenames):
+                if filename.endswith(".py"):
+                    yield os.path.join(dirpath, filename)
+        elif "models.py" in filenames:
+            yield os.path.join(dirpath, "models.py")
+
+
+def get_module_name(root, path):
+    module = os.path.splitext(os.path.relpath(path, root))[0].replace(os.sep, ".")
+    if module.endswith(".__init__"):
+        module = module[: -len(".__init__")]
+    return module
+
+
+def resolve_relative_import(module, node):
+    """Return the absolute module of a `from ... import` statement."""
+    if not node.level:
+        return node.module or ""
+
+    package = module.split(".")
+    # A module's own name is not part of its package (models/__init__ is handled by the caller)
+    package = package[: len(package) - node.level]
+    if node.module:
+        package.append(node.module)
+    return ".".join(package)
+
+
+class SourceModule:
+    """A parsed models file: its classes and the names it imports."""
+
+    def __init__(self, root, path):
+        self.path = path
+        self.module = get_module_name(root, path)
+        self.is_package = os.path.basename(path) == "__init__.py"
+
+        parts = self.module.split(".")
+        if "models" in parts:
+            self.app_module = ".".join(parts[: parts.index("models")])
+        else:
+            self.app_module = self.module
+        self.app_label = self.app_module.rpartition(".")[2]
+        self.app_dir = os.path.join(root, *self.app_module.split("."))
+
+        with tokenize.open(path) as f:
+            self.text = f.read()
+        self.tree = ast.parse(self.text, filename=path)
+
+        self.imports = {}
+        self.classes = {}
+
+        import_module = self.module if not self.is_package else self.module + ".__init__"
+        for node in self.tree.body:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    self.imports[alias.asname or alias.name.split(".")[0]] = (
+                        alias.name if alias.asname else alias.name.split(".")[0]
+                    )
+            elif isinstance(node, ast.ImportFrom):
+                source = resolve_relative_import(import_module, node)
+                for alias in node.names:
+                    if alias.name != "*":
+                        self.imports[alias.asname or alias.name] = f"{source}.{alias.name}"
+            elif isinstance(node, ast.ClassDef):
+                self.classes[node.name] = node
+
+    def resolve(self, name):
+        """Return the dotted path a name refers to in this module."""
+        head, _, rest = name.partition(".")
+        if head in self.classes:
+            target = f"{self.module}.{head}"
+        elif head in self.imports:
+            target = self.imports[head]
+        else:
+            return name
+        return f"{target}.{rest}" if rest else target
+
+
+class StaticModel:
+    def __init__(self, source, node):
+        self.source = source
+        self.node = node
+        self.name = node.name
+        self.module = source.module
+        self.meta = {}
+        self.choices = {}
+        self.field_nodes = []
+        self.fields = None
+        # "<fk>_id" entries, which Django does not count as separate fields
+        self.attnames = set()
+
+        for item in node.body:
+            if isinstance(item, ast.ClassDef) and item.name == "Meta":
+                for stmt in item.body:
+                    if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1:
+                        target = stmt.targets[0]
+                        if isinstance(target, ast.Name):
+                            self.meta[target.id] = get_literal(stmt.value)
+            elif isinstance(item, ast.ClassDef):
+                self.choices[item.name] = item
+            elif isinstance(item, (ast.Assign, ast.AnnAssign)):
+                targets = item.targets if isinstance(item, ast.Assign) else [item.target]
+                if (
+                    len(targets) == 1
+                    and isinstance(targets[0], ast.Name)
+                    and isinstance(item.value, ast.Call)
+                ):
+                    self.field_nodes.append((targets[0].id, item))
+
+        self.app_label = self.meta.get("app_label") or source.app_label
+        self.abstract = self.meta.get("abstract") is True
+        self.proxy = self.meta.get("proxy") is True
+
+    @property
+    def label(self):
+        return f"{self.app_label}.{self.name}"
+
+    @property
+    def model_name(self):
+        return self.name.lower()
+
+
+class StaticModelIndex:
+    """Parse every models file under a project root once."""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.sources = set()
+        self.modules = []
+        self.classes = {}
+        self.models = {}
+        self.by_name = {}
+
+        for path in iter_model_files(self.root):
+            try:
+                source = SourceModule(self.root, path)
+            except (OSError, SyntaxError, ValueError):
+                continue
+            self.sources.add(path)
+            self.modules.append(source)
+            for name, node in source.classes.items():
+                self.classes[f"{source.module}.{name}"] = (source, node)
+
+        settings = self.__read_settings()
+        self.default_auto_field = (
+            settings.get("DEFAULT_AUTO_FIELD") or "AutoField"
+        ).rpartition(".")[2]
+        self.auth_user_model = settings.get("AUTH_USER_MODEL") or "auth.User"
+
+        self.app_auto_fields = {}
+        for key, (source, node) in self.classes.items():
+            if self.__is_model(key, set()):
+                model = StaticModel(source, node)
+                self.models[key] = model
+                self.by_name.setdefault(model.name, []).append(model)
+
+        self.attname_targets = []
+        for model in self.models.values():
+            self.__build_fields(model)
+        self.__set_attname_types()
+        self.__add_reverse_relations()
+
+    # -------------------------------------------------------------------------
+    # Settings
+    # -------------------------------------------------------------------------
+
+    def __read_settings(self):
+        """Read string settings from the settings module, following star imports."""
+        try:
+            settings_module = os.environ.get("DJANGO_SETTINGS_MODULE") or find_settings_module()
+        except Exception:
+            return {}
+
+        values = {}
+        seen = set()
+
+        def visit(module):
+            if module in seen:
+                return
+            seen.add(module)
+
+            base = os.path.join(self.root, *module.split("."))
+            for path in (base + ".py", os.path.join(base, "__init__.py")):
+                if os.path.exists(path):
+                    break
+            else:
+                return
+
+            try:
+                with tokenize.open(path) as f:
+                    tree = ast.parse(f.read(), filename=path)
+            except (OSError, SyntaxError, ValueError):
+                return
+            self.sources.add(path)
+
+            for node in tree.body:
+                if isinstance(node, ast.ImportFrom) and any(
+                    alias.name == "*" for alias in node.names
+                ):
+                    is_package = path.endswith("__init__.py")
+                    visit(
+                        resolve_relative_import(
+                            module + ".__init__" if is_package else module, node
+                        )
+                    )
+                elif isinstance(node, ast.Assign):
+                    for target in node.targets:
+                        value = get_string(node.value)
+                        if isinstance(target, ast.Name) and value is not None:
+                            values[target.id] = value
+
+        visit(settings_module)
+        return values
+
+    def __get_auto_field(self, model):
+        """Return the implicit primary key type: AppConfig.default_auto_field or the setting."""
+        app_dir = model.source.app_dir
+        if app_dir not in self.app_auto_fields:
+            value = None
+            try:
+                with tokenize.open(os.path.join(app_dir, "apps.py")) as f:
+                    tree = ast.parse(f.read())
+                for node in ast.walk(tree):
+                    if (
+                        isinstance(node, ast.Assign)
+                        and any(
+                            isinstance(target, ast.Name)
+                            and target.id == "default_auto_field"
+                            for target in node.targets
+                        )
+                    ):
+                        value = get_string(node.value)
+            except (OSError, SyntaxError, ValueError):
+                pass
+            self.app_auto_fields[app_dir] = value.rpartition(".")[2] if value else None
+
+        return self.app_auto_fields[app_dir] or self.default_auto_field
+
+    # -------------------------------------------------------------------------
+    # Class resolution
+    # -------------------------------------------------------------------------
+
+    def __lookup_class(self, dotted):
+        """Find a parsed class by dotted path, also through package re-exports."""
+        if dotted in self.classes:
+            return dotted
+
+        module, _, name = dotted.rpartition(".")
+        candidates = [
+            key
+            for key in self.classes
+            if key.rpartition(".")[2] == name
+            and (key.startswith(module + ".") or not module)
+        ]
+        return candidates[0] if len(candidates) == 1 else None
+
+    def __is_model(self, key, seen):
+        if key in seen:
+            return False
+        seen.add(key)
+
+        source, node = self.classes[key]
+        for base in node.bases:
+            name = get_dotted_name(base)
+            if not name:
+                continue
+
+            resolved = source.resolve(name)
+            if resolved.rpartition(".")[2] == "Model" and resolved.startswith("django."):
+                return True
+
+            base_key = self.__lookup_class(resolved)
+            if base_key:
+                if self.__is_model(base_key, seen):
+                    return True
+            elif name.endswith("Model"):
+                # Third-party abstract bases (e.g. TimeStampedModel)
+                return True
+
+        return False
+
+    def __get_bases(self, model):
+        bases = []
+        for base in model.node.bases:
+            name = get_dotted_name(base)
+            base_key = name and self.__lookup_class(model.source.resolve(name))
+            if base_key in self.models:
+                bases.append(self.models[base_key])
+        return bases
+
+    def resolve_model(self, model, node):
+        """Resolve a relation target (class, "self", "app.Model" or "Model")."""
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            reference = node.value
+        else:
+            name = get_dotted_name(node)
+            if not name:
+                return None, None
+            if name.endswith("AUTH_USER_MODEL"):
+                reference = self.auth_user_model
+            else:
+                resolved = model.source.resolve(name)
+                key = self.__lookup_class(resolved)
+                if key in self.models:
+                    target = self.models[key]
+                    return target, target.label
+
+                # Imported from an app outside the project, e.g. django.contrib.auth.models.User
+                parts = resolved.split(".")
+                app_label = model.app_label
+                if "models" in parts[:-1]:
+                    app_label = parts[parts.index("models") - 1] or app_label
+                return None, f"{app_label}.{parts[-1]}"
+
+        if reference == "self":
+            return model, model.label
+
+        app_label, _, name = reference.rpartition(".")
+        app_label = app_label or model.app_label
+        candidates = self.by_name.get(name, [])
+        for candidate in candidates:
+            if candidate.app_label == app_label and not candidate.abstract:
+                return candidate, candidate.label
+        return None, f"{app_label}.{name}"
+
+    # -------------------------------------------------------------------------
+    # Fields
+    # -------------------------------------------------------------------------
+
+    def __build_fields(self, model):
+        if model.fields is not None:
+            return model.fields
+
+        model.fields = {}
+        model.forward = []
+        model.pk_type = None
+
+        for base in reversed(self.__get_bases(model)):
+            self.__build_fields(base)
+
+            if base.abstract:
+                self.__add_abstract_fields(model, base)
+            else:
+                model.fields.update(base.fields)
+                model.attnames.update(base.attnames)
+                model.forward.extend(base.forward)
+                if model.proxy:
+                    model.pk_type = base.pk_type
+                else:
+                    self.__add_parent_link(model, base)
+
+        for name, item in model.field_nodes:
+            self.__add_field(model, name, item, model)
+
+        if model.pk_type is None:
+            model.pk_type = self.__get_auto_field(model)
+            if not model.abstract and "id" not in model.fields:
+                model.fields["id"] = {
+                    "type": model.pk_type,
+                    "definition": f"id = models.{model.pk_type}(primary_key=True, verbose_name='ID')",
+                    "null": False,
+                    "blank": True,
+                }
+
+        return model.fields
+
+    def __add_abstract_fields(self, model, base):
+        """Copy the fields of an abstract base, with %(class)s and %(app_label)s per model."""
+        for parent in reversed(self.__get_bases(base)):
+            if parent.abstract:
+                self.__add_abstract_fields(model, parent)
+
+        for name, item in base.field_nodes:
+            self.__add_field(model, name, item, base)
+
+    def __add_parent_link(self, model, parent):
+        name = f"{parent.model_name}_ptr"
+        model.fields[name] = {
+            "type": "OneToOneField",
+            "definition": (
+                f"{name} = models.OneToOneField({parent.name}, "
+                "on_delete=models.CASCADE, parent_link=True, primary_key=True)"
+            ),
+            "null": False,
+            "blank": False,
+            "related_model": parent.name,
+            "related_app": parent.app_label,
+            "traversable": True,
+            "related_query_name": model.model_name,
+        }
+        model.fields[name + "_id"] = {
+            "type": "OneToOneField",
+            "definition": f"{name}_id = models.OneToOneField()  # → {parent.name}.pk",
+            "null": False,
+            "blank": False,
+        }
+        model.attnames.add(name + "_id")
+        model.pk_type = "OneToOneField"
+        model.forward.append((model, name, "OneToOneField", parent, None))
+
+    def __add_field(self, model, name, item, owner):
+        call = item.value
+        class_name = get_dotted_name(call.func)
+        if not class_name:
+            return
+
+        field_type = class_name.rpartition(".")[2]
+        if not (field_type.endswith("Field") or field_type in RELATION_FIELDS):
+            return
+
+        kwargs = {kw.arg: kw.value for kw in call.keywords if kw.arg}
+        definition = ast.get_source_segment(owner.source.text, item) or f"{name} = ..."
+
+        # auto_now and auto_now_add make a field blank
+        blank = any(
+            get_literal(kwargs.get(key), False) is True
+            for key in ("blank", "auto_now", "auto_now_add")
+        )
+
+        metadata = {
+            "type": field_type,
+            "definition": " ".join(definition.split()),
+            "null": get_literal(kwargs.get("null"), False) is True,
+            "blank": blank,
+        }
+
+        max_length = get_literal(kwargs.get("max_length"), DEFAULT_MAX_LENGTH.get(field_type))
+        if isinstance(max_length, int) and max_length:
+            metadata["max_length"] = max_length
+
+        if "choices" in kwargs:
+            choices = self.__get_choices(owner, kwargs["choices"])
+            if choices:
+                metadata["choices"] = choices
+
+        if get_literal(kwargs.get("primary_key")) is True:
+            model.pk_type = field_type
+
+        if field_type in RELATION_FIELDS:
+            target_node = call.args[0] if call.args else kwargs.get("to")
+            if target_node is None:
+                return
+
+            target, label = self.resolve_model(owner, target_node)
+            if owner is not model and isinstance(target_node, ast.Constant):
+                if target_node.value == "self":
+                    target, label = model, model.label
+
+            related_app, _, related_model = label.rpartition(".")
+            related_name = self.__format_name(get_string(kwargs.get("related_name")), model)
+            query_name = self.__format_name(
+                get_string(kwargs.get("related_query_name")), model
+            )
+
+            metadata["related_model"] = related_model
+            metadata["related_app"] = related_app
+            metadata["traversable"] = True
+            metadata["related_query_name"] = query_name or related_name or model.model_name
+
+            reverse = {
+                "related_name": related_name,
+                "query_name": metadata["related_query_name"],
+                "definition": metadata["definition"],
+                "symmetrical": get_literal(kwargs.get("symmetrical"), True),
+            }
+            model.forward.append((model, name, field_type, target, reverse))
+
+            if field_type != "ManyToManyField":
+                # Typed once every primary key is known, see __set_attname_types()
+                model.fields[name + "_id"] = {
+                    "type": None,
+                    "definition": f"{name}_id",
+                    "null": metadata["null"],
+                    "blank": metadata["blank"],
+                }
+                model.attnames.add(name + "_id")
+                self.attname_targets.append((model.fields[name + "_id"], target, related_model))
+
+        model.fields[name] = metadata
+
+    def __set_attname_types(self):
+        for field, target, related_model in self.attname_targets:
+            pk_type = target.pk_type if target is not None else EXTERNAL_PK_TYPE
+            field["type"] = pk_type
+            field["definition"] = (
+                f"{field['definition']} = models.{pk_type}()  # → {related_model}.pk"
+            )
+
+    def __format_name(self, name, model):
+        if not name:
+            return name
+        return name % {"class": model.model_name, "app_label": model.app_label.lower()}
+
+    def __get_choices(self, owner, node):
+        """Return choices info for `choices=Status.choices` or a literal list."""
+        if isinstance(node, ast.Attribute) and node.attr == "choices":
+            class_node = self.__find_choices_class(owner, get_dotted_name(node.value))
+            if class_node is None:
+                return None
+            return self.__get_choices_class_info(owner, class_node)
+
+        if isinstance(node, (ast.List, ast.Tuple)):
+            values = []
+            for element in node.elts:
+                if isinstance(element, (ast.Tuple, ast.List)) and len(element.elts) == 2:
+                    value = get_literal(element.elts[0])
+                    label = get_string(element.elts[1])
+                    if value is not None:
+                        values.append({"value": value, "label": label or str(value)})
+            return {"values": values} if values else None
+
+        return None
+
+    def __find_choices_class(self, owner, name):
+        """Find a Choices class by name, including classes nested in models (Post.Status)."""
+        if not name:
+            return None
+
+        head, *nested = name.split(".")
+        if head in owner.choices:
+            node = owner.choices[head]
+        else:
+            key = self.__lookup_class(owner.source.resolve(head))
+            if not key:
+                return None
+            node = self.classes[key][1]
+
+        for part in nested:
+            node = next(
+                (
+                    item
+                    for item in node.body
+                    if isinstance(item, ast.ClassDef) and item.name == part
+                ),
+                None,
+            )
+            if node is None:
+                return None
+
+        return node
+
+    def __get_choices_class_info(self, owner, class_node):
+        base_names = {
+            (get_dotted_name(base) or "").rpartition(".")[2] for base in class_node.bases
+        }
+        choices_type = next(
+            (name for name in ("TextChoices", "IntegerChoices") if name in base_names), None
+        )
+        if not base_names & CHOICES_BASES:
+            return None
+
+        values = []
+        for stmt in class_node.body:
+            if not (
+                isinstance(stmt, ast.Assign)
+                and len(stmt.targets) == 1
+                and isinstance(stmt.targets[0], ast.Name)
+            ):
+                continue
+
+            member = stmt.targets[0].id
+            if member.startswith("_"):
+                continue
+
+            label = member.replace("_", " ").title()
+            value_node = stmt.value
+            if isinstance(value_node, ast.Tuple) and len(value_node.elts) == 2:
+                label = get_string(value_node.elts[1]) or label
+                value_node = value_node.elts[0]
+
+            value = get_literal(value_node)
+            if value is not None:
+                values.append({"value": value, "label": label})
+
+        info: dict = {"values": values, "class": class_node.name}
+        if choices_type:
+            info["type"] = choices_type
+        return info
+
+    def __add_reverse_relations(self):
+        for model in self.models.values():
+            if model.abstract or model.proxy:
+                continue
+
+            for source, name, field_type, target, reverse in model.forward:
+                if source is not model or target is None or target.abstract:
+                    continue
+
+                if reverse is None:
+                    # Parent link of multi-table inheritance
+                    target.fields.setdefault(
+                        model.model_name,
+                        {
+                            "type": "OneToOneRel",
+                            "related_model": model.name,
+                            "related_app": model.app_label,
+                            "related_field": name,
+                            "reverse_name": model.model_name,
+                            "traversable": True,
+                            "definition": model.fields[name]["definition"],
+                        },
+                    )
+                    continue
+
+                related_name = reverse["related_name"]
+                if related_name and related_name.endswith("+"):
+                    continue
+                if (
+                    field_type == "ManyToManyField"
+                    and target is model
+                    and reverse["symmetrical"] is not False
+                ):
+                    continue
+
+                if related_name:
+                    reverse_name = related_name
+                elif field_type == "OneToOneField":
+                    reverse_name = model.model_name
+                else:
+                    reverse_name = f"{model.model_name}_set"
+
+                target.fields.setdefault(
+                    reverse["query_name"],
+                    {
+                        "type": RELATION_FIELDS[field_type],
+                        "related_model": model.name,
+                        "related_app": model.app_label,
+                        "related_field": name,
+                        "reverse_name": reverse_name,
+                        "traversable": True,
+                        "definition": reverse["definition"],
+                    },
+                )
+
+        inherited = set()
+        for model in self.models.values():
+            self.__inherit_reverse_relations(model, inherited)
+
+    def __inherit_reverse_relations(self, model, done):
+        """Add the reverse relations of concrete parents (multi-table and proxy)."""
+        if model in done:
+            return
+        done.add(model)
+
+        for base in self.__get_bases(model):
+            if base.abstract:
+                continue
+            self.__inherit_reverse_relations(base, done)
+            for name, field in base.fields.items():
+                model.fields.setdefault(name, field)
+
+    # -------------------------------------------------------------------------
+    # Output
+    # -------------------------------------------------------------------------
+
+    def __concrete_models(self):
+        return [model for model in self.models.values() if not model.abstract]
+
+    def get_models(self):
+        """Return the models list in the get_models.py format."""
+        models = []
+        for model in self.__concrete_models():
+            table_model = model
+            while table_model.proxy:
+                parents = [base for base in self.__get_bases(table_model) if not base.abstract]
+                if not parents:
+                    break
+                table_model = parents[0]
+
+            line = min([model.node.lineno] + [d.lineno for d in model.node.decorator_list])
+            field_count = len(model.fields) - len(model.attnames)
+            models.append(
+                {
+                    "name": model.name,
+                    "app_label": model.app_label,
+                    "db_table": table_model.meta.get("db_table")
+                    or f"{table_model.app_label}_{table_model.model_name}",
+                    "field_count": field_count,
+                    "file": model.source.path,
+                    "line": line,
+                    "pos": [line, 0],
+                    "module": model.module,
+                }
+            )
+
+        models.sort(key=lambda info: (info["app_label"], info["name"]))
+        return models
+
+    def get_completion_models(self):
+        """Return per-model completion data in the get_completion_data.py format."""
+        return {
+            model.label: {
+                "app_label": model.app_label,
+                "module": model.module,
+                "fields": model.fields,
+            }
+            for model in self.__concrete_models()
+        }
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Long-lived Django process that runs the extraction scripts on request.
+
+Protocol: one JSON request per line on stdin, one JSON response per line on stdout.
+
+    -> {"id": 1, "script": "get_models.py", "args": [], "output": "/path/to/file.tmp"}
+    <- {"id": 1, "code": 0}
+
+The script's stdout and stderr are written to "output", the same as the
+one-shot `python script.py > output 2>&1` invocation, so the caller can read
+the result exactly as before.
+
+Project modules edited since the previous request are reloaded before the
+script runs. Models and settings cannot be reloaded safely; in that case the
+worker answers {"id": ..., "restart": true} and exits.
+"""
+
+import contextlib
+import importlib
+import json
+import linecache
+import os
+import sys
+import traceback
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, script_dir)
+
+from django_utils import get_urlconf_modules  # noqa: E402
+
+
+class ModuleWatcher:
+    """Track modification times of the project modules loaded in this process."""
+
+    def __init__(self, root):
+        self.root = os.path.join(os.path.abspath(root), "")
+        self.excluded = tuple(
+            os.path.join(os.path.abspath(path), "")
+            for path in {sys.prefix, sys.base_prefix, script_dir}
+        )
+        self.mtimes = {}
+
+    def __iter_project_modules(self):
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, "__file__", None)
+            if not path:
+                continue
+
+            path = os.path.abspath(path)
+            if not path.startswith(self.root) or path.startswith(self.excluded):
+                continue
+
+            yield name, path
+
+    def snapshot(self):
+        self.mtimes = {}
+        for name, path in self.__iter_project_modules():
+            try:
+                self.mtimes[name] = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+
+    def track_new(self):
+        """Record modules imported since the last snapshot, keeping known mtimes."""
+        for name, path in self.__iter_project_modules():
+            if name in self.mtimes:
+                continue
+            try:
+                self.mtimes[name] = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+
+    def changed(self):
+        changed = []
+        for name, path in self.__iter_project_modules():
+            if name not in self.mtimes:
+                continue
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime != self.mtimes[name]:
+                changed.append(name)
+        return changed
+
+
+def reload_modules(changed):
+    """Reload edited modules in place.
+
+    Returns False when a change cannot be applied without a fresh process.
+    """
+    from django.apps import apps  # pyright: ignore[reportMissingImports]
+    from django.conf import settings  # pyright: ignore[reportMissingImports]
+    from django.urls import clear_url_caches  # pyright: ignore[reportMissingImports]
+
+    model_modules = {model.__module__ for model in apps.get_models()}
+    for name in changed:
+        if name in model_modules or name == settings.SETTINGS_MODULE:
+            return False
+
+    try:
+        urlconf_modules = [module.__name__ for module in get_urlconf_modules()]
+
+        for name in changed:
+            if name not in urlconf_modules:
+                importlib.reload(sys.modules[name])
+
+        # Re-run every URLconf so routers and include() pick up reloaded views
+        for name in reversed(urlconf_modules):
+            importlib.reload(sys.modules[name])
+    except Exception:
+        return False
+
+    clear_url_caches()
+    return True
+
+
+def run_script(script_name, args, output_path):
+    """Run a script's main() in this process, like `python script args > output 2>&1`."""
+    module = importlib.import_module(os.path.splitext(script_name)[0])
+    sys.argv = [os.path.join(script_dir, script_name)] + list(args)
+
+    with open(output_path, "w") as output:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            try:
+                module.main()
+            except SystemExit as e:
+                if e.code is None:
+                    return 0
+                return e.code if isinstance(e.code, int) else 1
+            except Exception:
+                traceback.print_exc()
+                return 1
+
+    return 0
+
+
+def is_django_ready():
+    try:
+        from django.apps import apps  # pyright: ignore[reportMissingImports]
+    except ImportError:
+        return False
+    return apps.ready
+
+
+def main():
+    # Keep fd 1 for the protocol; anything else printing to stdout goes to stderr
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    def respond(response):
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+
+    watcher = ModuleWatcher(os.getcwd())
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        request = json.loads(line)
+        request_id = request.get("id")
+
+        changed = watcher.changed()
+        if changed and not reload_modules(changed):
+            respond({"id": request_id, "restart": True})
+            return
+        # Before the run, so files saved while it runs are reloaded by the next request
+        watcher.snapshot()
+
+        linecache.checkcache()
+        code = run_script(request["script"], request.get("args", []), request["output"])
+        respond({"id": request_id, "code": code})
+
+        # A failed django.setup() cannot be retried in the same process
+        if not is_django_ready():
+            return
+
+        watcher.track_new()
+
+
+if __name__ == "__main__":
+    main()